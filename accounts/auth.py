@@ -0,0 +1,18 @@
+"""
+Authentication helpers for async views
+
+Django 4.2 resolves ``request.user`` lazily with synchronous session and user
+queries, which must not run on the event loop (``request.auser()`` only
+arrives in Django 5.0).
+"""
+from asgiref.sync import sync_to_async
+
+
+def _load_user(request):
+    request.user.is_authenticated  # evaluates the lazy object
+    return request.user
+
+
+async def aget_user(request):
+    """``request.user``, loaded in a worker thread; afterwards it is safe to use on the event loop"""
+    return await sync_to_async(_load_user)(request)
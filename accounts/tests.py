@@ -0,0 +1,38 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from monitoring.testing import QueryBudgetTestMixin, create_appointments, create_employee, create_services
+
+from .models import User
+
+
+class AccountPageQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    """Account pages show more rows than their budget, so an N+1 query fails the test"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create_user('customer', password='secret', role='customer')
+        cls.manager = create_employee('manager', 'MGR1', employee_type='super')
+        employees = [create_employee(f'employee{i}', f'EMP{i}', supervisor=cls.manager).user for i in range(4)]
+        create_appointments(
+            [cls.customer], create_services(3), [employees[i % 4] if i % 3 == 0 else None for i in range(12)]
+        )
+
+    def test_dashboard_within_budget(self):
+        self.client.force_login(self.customer)
+        response = self.assertWithinQueryBudget(reverse('accounts:dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['upcoming_appointments']), 8)
+
+    def test_appointment_history_within_budget(self):
+        self.client.force_login(self.customer)
+        response = self.assertWithinQueryBudget(reverse('accounts:appointment_history'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['appointments']), 12)
+
+    def test_assign_task_within_budget(self):
+        self.client.force_login(self.manager.user)
+        response = self.assertWithinQueryBudget(reverse('accounts:assign_task'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['available_employees']), 4)
+        self.assertEqual(len(response.context['unassigned_appointments']), 8)
@@ -7,9 +7,11 @@ from django.views.generic import TemplateView
 from django.urls import reverse_lazy
 from django.contrib.auth.views import LoginView
 from django.utils import timezone
+from django.db.models import Count, Q
 from .forms import CustomUserCreationForm, CustomAuthenticationForm
 from .models import User, Employee, TaskAssignment
 from appointments.models import Appointment
+from monitoring.budgets import query_budget
 
 
 class CustomLoginView(LoginView):
@@ -55,6 +57,7 @@ def register_view(request):
     return render(request, 'accounts/register.html', {'form': form})
 
 
+@query_budget(6)
 @login_required
 def dashboard_view(request):
     """Customer dashboard view"""
@@ -68,12 +71,12 @@ def dashboard_view(request):
     # Customer dashboard
     recent_appointments = Appointment.objects.filter(
         customer=user
-    ).order_by('-created_at')[:5]
+    ).select_related('selected_service').order_by('-created_at')[:5]
     
     upcoming_appointments = Appointment.objects.filter(
         customer=user,
         status='booked'
-    ).order_by('slot_date', 'slot_time')
+    ).select_related('selected_service').order_by('slot_date', 'slot_time')
     
     context = {
         'recent_appointments': recent_appointments,
@@ -281,6 +284,7 @@ def profile_view(request):
     return render(request, 'accounts/profile.html', {})
 
 
+@query_budget(4)
 @login_required
 def appointment_history_view(request):
     """View appointment history for customers"""
@@ -290,13 +294,14 @@ def appointment_history_view(request):
     
     appointments = Appointment.objects.filter(
         customer=request.user
-    ).order_by('-created_at')
+    ).select_related('selected_service', 'assigned_employee').order_by('-created_at')
     
     return render(request, 'accounts/appointment_history.html', {
         'appointments': appointments
     })
 
 
+@query_budget(7)
 @login_required
 def assign_task_view(request):
     """Super employee assigns tasks to regular employees"""
@@ -347,11 +352,18 @@ def assign_task_view(request):
         return redirect('accounts:employee_dashboard')
     
     # GET request - show assignment form
-    available_employees = Employee.objects.filter(is_active=True).exclude(id=employee.id)
+    available_employees = Employee.objects.filter(is_active=True).exclude(id=employee.id).select_related(
+        'user'
+    ).annotate(
+        pending_tasks_count=Count(
+            'user__assigned_work',
+            filter=Q(user__assigned_work__status__in=['assigned', 'in_progress', 'on_hold'])
+        )
+    )
     unassigned_appointments = Appointment.objects.filter(
         assigned_employee__isnull=True,
         status='booked'
-    ).order_by('slot_date', 'slot_time')
+    ).select_related('customer', 'selected_service').order_by('slot_date', 'slot_time')
     
     context = {
         'employee': employee,
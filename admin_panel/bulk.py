@@ -0,0 +1,147 @@
+"""
+Bulk operations for the admin panel
+
+Blocking dependencies are computed for the whole selection with one grouped
+query, and every action runs in a single transaction, so the number of
+queries for checks and updates does not grow with the number of selected
+objects. update() skips model signals, so its effects on the search index
+and the cached catalog are applied explicitly; deletions go through
+QuerySet.delete(), which cascades and sends the delete signals itself.
+"""
+from django.db import transaction
+from django.db.models import Count
+
+from accounts.models import Employee, User
+from appointments.models import Appointment
+from appointments.notifications import ACTIVE_STATUSES
+from search.backends import get_search_backend
+from search.indexes import SEARCH_INDEXES
+from services.catalog import invalidate_catalog
+from services.models import Service, ServiceCategory
+
+
+class BulkResult:
+    """
+    Outcome of a bulk action
+
+    Attributes:
+        count: Number of objects changed
+        names: Display names of the changed objects (deletions only)
+        blocked: "name (n dependants)" strings when the action was refused
+    """
+
+    def __init__(self, count=0, names=None, blocked=None):
+        self.count = count
+        self.names = names or []
+        self.blocked = blocked or []
+
+    @property
+    def ok(self):
+        return not self.blocked
+
+
+def _grouped_counts(queryset, field):
+    """{field value: row count} for ``queryset`` in one GROUP BY query"""
+    rows = queryset.order_by().values(field).annotate(total=Count('pk')).values_list(field, 'total')
+    return dict(rows)
+
+
+def service_appointment_counts(service_ids):
+    """Appointments per service, for every selected service that has any"""
+    return _grouped_counts(Appointment.objects.filter(selected_service__in=service_ids), 'selected_service')
+
+
+def category_service_counts(category_ids):
+    """Services per category, for every selected category that has any"""
+    return _grouped_counts(Service.objects.filter(category__in=category_ids), 'category')
+
+
+def employee_active_appointment_counts(employee_ids):
+    """Active (booked, assigned, in progress or on hold) appointments per employee"""
+    appointments = Appointment.objects.filter(
+        assigned_employee__employee_profile__in=employee_ids, status__in=ACTIVE_STATUSES
+    )
+    return _grouped_counts(appointments, 'assigned_employee__employee_profile')
+
+
+def _blocked(objects, counts, label, noun):
+    return [f'{label(obj)} ({counts[obj.pk]} {noun})' for obj in objects if obj.pk in counts]
+
+
+def _reindex(index_name, pks, fields):
+    """update() bypasses the search signals: re-index the rows if an indexed field changed"""
+    index = SEARCH_INDEXES[index_name]
+    if index.source_fields(index.model_label) & set(fields):
+        get_search_backend().index_objects(index, pks)
+
+
+@transaction.atomic
+def update_services(service_ids, **fields):
+    """Apply ``fields`` to the selected services"""
+    count = Service.objects.filter(id__in=service_ids).update(**fields)
+    _reindex('services', service_ids, fields)
+    invalidate_catalog()
+    return BulkResult(count=count)
+
+
+@transaction.atomic
+def delete_services(service_ids):
+    """Delete the selected services unless any of them has appointments"""
+    services = list(Service.objects.select_for_update().filter(id__in=service_ids).only('id', 'name'))
+    counts = service_appointment_counts(service_ids)
+    if counts:
+        return BulkResult(blocked=_blocked(services, counts, lambda service: service.name, 'appointments'))
+
+    # Cascades to the prices; the delete signals update the search index
+    # and the cached pricing and catalog data
+    Service.objects.filter(id__in=service_ids).delete()
+    return BulkResult(count=len(services), names=[service.name for service in services])
+
+
+@transaction.atomic
+def update_categories(category_ids, **fields):
+    """Apply ``fields`` to the selected categories"""
+    count = ServiceCategory.objects.filter(id__in=category_ids).update(**fields)
+    invalidate_catalog()
+    return BulkResult(count=count)
+
+
+@transaction.atomic
+def delete_categories(category_ids):
+    """Delete the selected categories unless any of them still has services"""
+    categories = list(ServiceCategory.objects.select_for_update().filter(id__in=category_ids).only('id', 'name'))
+    counts = category_service_counts(category_ids)
+    if counts:
+        return BulkResult(blocked=_blocked(categories, counts, lambda category: category.name, 'services'))
+
+    ServiceCategory.objects.filter(id__in=category_ids).delete()
+    return BulkResult(count=len(categories), names=[category.name for category in categories])
+
+
+@transaction.atomic
+def update_employees(employee_ids, **fields):
+    """Apply ``fields`` to the selected employees"""
+    count = Employee.objects.filter(id__in=employee_ids).update(**fields)
+    _reindex('employees', employee_ids, fields)
+    return BulkResult(count=count)
+
+
+@transaction.atomic
+def set_employees_active(employee_ids, is_active):
+    """
+    (De)activate the selected employees and their user accounts
+
+    Deactivation is refused while any of them has active appointments.
+    """
+    employees = Employee.objects.filter(id__in=employee_ids)
+    if not is_active:
+        counts = employee_active_appointment_counts(employee_ids)
+        if counts:
+            blocked_employees = employees.filter(id__in=counts).select_related('user')
+            return BulkResult(blocked=_blocked(
+                blocked_employees, counts, lambda employee: employee.user.get_full_name(), 'appointments'
+            ))
+
+    count = employees.update(is_active=is_active)
+    User.objects.filter(employee_profile__in=employee_ids).update(is_active=is_active)
+    return BulkResult(count=count)
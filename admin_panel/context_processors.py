@@ -1,112 +1,47 @@
-from django.urls import reverse, NoReverseMatch
+from django.urls import NoReverseMatch
+from django.utils.functional import SimpleLazyObject
+
+from .navigation import admin_panel_urls, page_actions
+
+
+def _is_super_admin(request):
+    return request.user.is_authenticated and request.user.is_superuser
 
 
 def admin_panel_context(request):
     """
     Context processor to provide admin panel URLs and utilities
     throughout the application templates.
-    """
-    context = {}
     
-    # Only add admin panel context for authenticated super users
-    if request.user.is_authenticated and request.user.is_superuser:
+    Both values are lazy: a render that never reads them does not even load
+    the user, and the URLs are reversed once per process.
+    """
+    def urls():
+        if not _is_super_admin(request):
+            return {}
         try:
-            context.update({
-                'admin_panel_urls': {
-                    'dashboard': reverse('admin_panel:dashboard'),
-                    'service_list': reverse('admin_panel:service_list'),
-                    'service_create': reverse('admin_panel:service_create'),
-                    'category_list': reverse('admin_panel:category_list'),
-                    'employee_list': reverse('admin_panel:employee_list'),
-                    'employee_create': reverse('admin_panel:employee_create'),
-                    'pricing_matrix': reverse('admin_panel:pricing_matrix'),
-                    'settings_list': reverse('admin_panel:settings_list'),
-                    'logs': reverse('admin_panel:logs'),
-                },
-                'is_super_admin': True,
-            })
+            return admin_panel_urls()
         except NoReverseMatch:
             # Handle case where admin panel URLs are not available
-            context['is_super_admin'] = False
-    else:
-        context['is_super_admin'] = False
+            return {}
     
-    return context
+    return {
+        'admin_panel_urls': SimpleLazyObject(urls),
+        'is_super_admin': SimpleLazyObject(lambda: _is_super_admin(request)),
+    }
 
 
 def admin_quick_actions(request):
     """
-    Context processor to provide quick admin actions based on current page.
+    Context processor to provide quick admin actions based on current page
+    (lazy, looked up in the static tables of admin_panel.navigation).
     """
-    context = {'admin_quick_actions': []}
-    
-    if not (request.user.is_authenticated and request.user.is_superuser):
-        return context
-    
-    # Determine quick actions based on current URL
-    current_url = request.resolver_match
-    if current_url:
-        url_name = current_url.url_name
-        namespace = current_url.namespace
-        
+    def actions():
+        if not _is_super_admin(request):
+            return []
         try:
-            if namespace == 'services':
-                if url_name == 'service_list':
-                    context['admin_quick_actions'] = [
-                        {
-                            'name': 'Manage Services',
-                            'url': reverse('admin_panel:service_list'),
-                            'icon': 'fas fa-cogs',
-                            'class': 'btn-outline-primary'
-                        },
-                        {
-                            'name': 'Add Service',
-                            'url': reverse('admin_panel:service_create'),
-                            'icon': 'fas fa-plus',
-                            'class': 'btn-outline-success'
-                        },
-                        {
-                            'name': 'Categories',
-                            'url': reverse('admin_panel:category_list'),
-                            'icon': 'fas fa-tags',
-                            'class': 'btn-outline-info'
-                        }
-                    ]
-                elif url_name == 'service_detail':
-                    service_id = current_url.kwargs.get('pk')
-                    if service_id:
-                        context['admin_quick_actions'] = [
-                            {
-                                'name': 'Edit Service',
-                                'url': reverse('admin_panel:service_update', args=[service_id]),
-                                'icon': 'fas fa-edit',
-                                'class': 'btn-outline-warning'
-                            },
-                            {
-                                'name': 'Manage Pricing',
-                                'url': f"{reverse('admin_panel:pricing_matrix')}?service={service_id}",
-                                'icon': 'fas fa-dollar-sign',
-                                'class': 'btn-outline-info'
-                            }
-                        ]
-            
-            elif namespace == 'accounts':
-                if url_name in ['employee_dashboard', 'admin_dashboard']:
-                    context['admin_quick_actions'] = [
-                        {
-                            'name': 'Admin Panel',
-                            'url': reverse('admin_panel:dashboard'),
-                            'icon': 'fas fa-cogs',
-                            'class': 'btn-outline-primary'
-                        },
-                        {
-                            'name': 'Manage Employees',
-                            'url': reverse('admin_panel:employee_list'),
-                            'icon': 'fas fa-users',
-                            'class': 'btn-outline-info'
-                        }
-                    ]
+            return list(page_actions(request.resolver_match))
         except NoReverseMatch:
-            pass
+            return []
     
-    return context
\ No newline at end of file
+    return {'admin_quick_actions': SimpleLazyObject(actions)}
@@ -0,0 +1,112 @@
+"""
+Streaming CSV/NDJSON exports for appointments and admin logs
+
+Rows are pulled from the database with ``.values().iterator(chunk_size=...)``
+and serialized one at a time, so an export of any size runs in constant
+memory whether it is written to an HTTP response or to a file.
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+# (column name, values() lookup) pairs for each export
+APPOINTMENT_EXPORT_FIELDS = [
+    ('id', 'id'),
+    ('slot_date', 'slot_date'),
+    ('slot_time', 'slot_time'),
+    ('status', 'status'),
+    ('priority', 'priority'),
+    ('customer', 'customer__username'),
+    ('customer_email', 'customer__email'),
+    ('service', 'selected_service__name'),
+    ('assigned_employee', 'assigned_employee__username'),
+    ('vehicle_make', 'vehicle_make'),
+    ('vehicle_model', 'vehicle_model'),
+    ('vehicle_year', 'vehicle_year'),
+    ('vehicle_license', 'vehicle_license'),
+    ('work_started_at', 'work_started_at'),
+    ('work_completed_at', 'work_completed_at'),
+    ('created_at', 'created_at'),
+]
+
+ADMIN_LOG_EXPORT_FIELDS = [
+    ('id', 'id'),
+    ('timestamp', 'timestamp'),
+    ('admin_user', 'admin_user__username'),
+    ('action', 'action'),
+    ('content_type', 'content_type__model'),
+    ('object_id', 'object_id'),
+    ('object_repr', 'object_repr'),
+    ('change_message', 'change_message'),
+    ('ip_address', 'ip_address'),
+    ('user_agent', 'user_agent'),
+]
+
+
+class Echo:
+    """File-like object whose write() returns the value instead of buffering it"""
+
+    def write(self, value):
+        return value
+
+
+def iter_export_rows(queryset, fields, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield export rows as tuples, streaming them from the database"""
+    lookups = [lookup for _, lookup in fields]
+    return queryset.values_list(*lookups).iterator(chunk_size=chunk_size)
+
+
+def iter_csv(rows, fields):
+    """Yield CSV lines (header first) for the given rows"""
+    writer = csv.writer(Echo())
+    yield writer.writerow([column for column, _ in fields])
+    for row in rows:
+        yield writer.writerow(
+            ['' if value is None else (value.isoformat() if hasattr(value, 'isoformat') else value)
+             for value in row]
+        )
+
+
+def iter_ndjson(rows, fields):
+    """Yield one JSON document per line for the given rows"""
+    columns = [column for column, _ in fields]
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+def iter_export(queryset, fields, export_format, chunk_size=EXPORT_CHUNK_SIZE):
+    """Serialize a queryset lazily in the requested format"""
+    rows = iter_export_rows(queryset, fields, chunk_size=chunk_size)
+    if export_format == 'ndjson':
+        return iter_ndjson(rows, fields)
+    return iter_csv(rows, fields)
+
+
+def streaming_export_response(queryset, fields, export_format, filename):
+    """
+    Build a StreamingHttpResponse that exports the queryset as CSV or NDJSON
+
+    Args:
+        queryset: Filtered and ordered queryset to export
+        fields: List of (column name, values() lookup) pairs
+        export_format: 'csv' or 'ndjson'
+        filename: Download file name without extension
+    """
+    if export_format not in EXPORT_FORMATS:
+        export_format = 'csv'
+
+    response = StreamingHttpResponse(
+        iter_export(queryset, fields, export_format),
+        content_type=EXPORT_FORMATS[export_format]
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
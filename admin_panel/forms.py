@@ -6,6 +6,7 @@ from .models import SystemSettings
 from PIL import Image
 import os
 import json
+import csv
 
 
 class ServiceForm(forms.ModelForm):
@@ -578,25 +579,20 @@ class PriceImportForm(forms.Form):
         """Validate CSV file"""
         csv_file = self.cleaned_data.get('csv_file')
         if csv_file:
-            # Check file size (max 1MB)
-            if csv_file.size > 1024 * 1024:
-                raise ValidationError('CSV file size must be less than 1MB.')
+            # Check file size (max 50MB)
+            if csv_file.size > 50 * 1024 * 1024:
+                raise ValidationError('CSV file size must be less than 50MB.')
             
             # Check file extension
             if not csv_file.name.lower().endswith('.csv'):
                 raise ValidationError('Please upload a CSV file.')
             
-            # Basic content validation
+            # Validate the header only; rows are parsed incrementally during import
             try:
-                content = csv_file.read().decode('utf-8')
+                header_line = next(iter(csv_file), b'').decode('utf-8-sig')
                 csv_file.seek(0)  # Reset file pointer
                 
-                lines = content.strip().split('\n')
-                if len(lines) < 2:  # Header + at least one data row
-                    raise ValidationError('CSV file must contain at least a header row and one data row.')
-                
-                # Check header
-                header = lines[0].lower().strip()
+                header = [column.strip().lower() for column in next(csv.reader([header_line]), [])]
                 required_columns = ['service_name', 'vehicle_type', 'complexity_level', 'price']
                 for col in required_columns:
                     if col not in header:
@@ -604,6 +600,8 @@ class PriceImportForm(forms.Form):
                         
             except UnicodeDecodeError:
                 raise ValidationError('CSV file must be UTF-8 encoded.')
+            except ValidationError:
+                raise
             except Exception as e:
                 raise ValidationError(f'Invalid CSV file: {str(e)}')
         
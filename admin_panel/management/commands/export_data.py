@@ -0,0 +1,65 @@
+import sys
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from admin_panel.exports import (ADMIN_LOG_EXPORT_FIELDS, APPOINTMENT_EXPORT_FIELDS,
+                                 EXPORT_CHUNK_SIZE, EXPORT_FORMATS, iter_export)
+from admin_panel.models import AdminLog
+from admin_panel.utils import filter_admin_logs
+from appointments.forms import AppointmentSearchForm
+from appointments.models import Appointment
+
+
+class Command(BaseCommand):
+    help = 'Stream appointments or admin logs to a CSV/NDJSON file in constant memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=['appointments', 'logs'], help='What to export')
+        parser.add_argument('--format', choices=list(EXPORT_FORMATS), default='csv', help='Output format (default: csv)')
+        parser.add_argument('--output', '-o', help='Output file (default: stdout)')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE, help='Rows fetched per database round trip')
+        # Appointment filters (same as the appointment list search form)
+        parser.add_argument('--search', help='Appointments: customer, vehicle or service search')
+        parser.add_argument('--status', help='Appointments: status filter')
+        # Admin log filters (same as the log list)
+        parser.add_argument('--user', help='Logs: admin username contains')
+        parser.add_argument('--action', help='Logs: action contains')
+        # Shared date range
+        parser.add_argument('--date-from', type=date.fromisoformat, help='Start date (YYYY-MM-DD)')
+        parser.add_argument('--date-to', type=date.fromisoformat, help='End date (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        if options['dataset'] == 'appointments':
+            search_form = AppointmentSearchForm({
+                'search': options['search'] or '',
+                'status': options['status'] or '',
+                'date_from': options['date_from'] or '',
+                'date_to': options['date_to'] or '',
+            })
+            if not search_form.is_valid():
+                raise CommandError(f'Invalid filters: {search_form.errors.as_text()}')
+            queryset = search_form.filter_queryset(Appointment.objects.all()).order_by('-slot_date', '-slot_time')
+            fields = APPOINTMENT_EXPORT_FIELDS
+        else:
+            queryset = filter_admin_logs(AdminLog.objects.all(), {
+                'user': options['user'],
+                'action': options['action'],
+                'date_from': options['date_from'],
+                'date_to': options['date_to'],
+            }).order_by('-timestamp')
+            fields = ADMIN_LOG_EXPORT_FIELDS
+
+        chunks = iter_export(queryset, fields, options['format'], chunk_size=options['chunk_size'])
+        output = open(options['output'], 'w', newline='', encoding='utf-8') if options['output'] else sys.stdout
+        rows = -1 if options['format'] == 'csv' else 0  # do not count the CSV header
+        try:
+            for chunk in chunks:
+                output.write(chunk)
+                rows += 1
+        finally:
+            if options['output']:
+                output.close()
+
+        if options['output']:
+            self.stdout.write(
+                self.style.SUCCESS(f'Exported {rows} {options["dataset"]} row(s) to {options["output"]}')
+            )
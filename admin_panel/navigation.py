@@ -0,0 +1,105 @@
+"""
+Admin panel links shared by the context processors and admin action helpers
+
+URLs without arguments are reversed once per process into a read-only map;
+quick actions are static tables keyed by ``(namespace, url_name)`` of the
+current page, or by the model of the object being shown.
+"""
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
+
+from django.urls import reverse
+
+ADMIN_PANEL_URL_NAMES = (
+    'dashboard', 'service_list', 'service_create', 'category_list', 'employee_list',
+    'employee_create', 'pricing_matrix', 'settings_list', 'logs',
+)
+
+
+class QuickAction(namedtuple('QuickAction', ['name', 'url_name', 'icon', 'css_class', 'target'])):
+    """
+    A link to an admin panel page
+
+    ``target`` says how the object the page is about is passed: ``'path'``
+    as the URL argument, a query parameter name, or None for no object.
+    """
+
+    def resolve(self, pk=None):
+        if self.target == 'path':
+            url = _object_url(self.url_name, pk)
+        else:
+            url = admin_panel_urls()[self.url_name]
+            if self.target:
+                url = f'{url}?{self.target}={pk}'
+        return {'name': self.name, 'url': url, 'icon': self.icon, 'class': self.css_class}
+
+
+ADMIN_PANEL = QuickAction('Admin Panel', 'dashboard', 'fas fa-cogs', 'btn-outline-primary', None)
+ADMIN_DASHBOARD = QuickAction('Admin Dashboard', 'dashboard', 'fas fa-tachometer-alt', 'btn-outline-primary', None)
+MANAGE_SERVICES = QuickAction('Manage Services', 'service_list', 'fas fa-cogs', 'btn-outline-primary', None)
+ADD_SERVICE = QuickAction('Add Service', 'service_create', 'fas fa-plus', 'btn-outline-success', None)
+CATEGORIES = QuickAction('Categories', 'category_list', 'fas fa-tags', 'btn-outline-info', None)
+MANAGE_EMPLOYEES = QuickAction('Manage Employees', 'employee_list', 'fas fa-users', 'btn-outline-info', None)
+SYSTEM_SETTINGS = QuickAction('System Settings', 'settings_list', 'fas fa-cog', 'btn-outline-secondary', None)
+EDIT_SERVICE = QuickAction('Edit Service', 'service_update', 'fas fa-edit', 'btn-outline-warning', 'path')
+MANAGE_PRICING = QuickAction('Manage Pricing', 'pricing_matrix', 'fas fa-dollar-sign', 'btn-outline-info', 'service')
+ALL_SERVICES = QuickAction('All Services', 'service_list', 'fas fa-list', 'btn-outline-secondary', None)
+EDIT_CATEGORY = QuickAction('Edit Category', 'category_update', 'fas fa-edit', 'btn-outline-warning', 'path')
+ALL_CATEGORIES = QuickAction('All Categories', 'category_list', 'fas fa-tags', 'btn-outline-secondary', None)
+EDIT_EMPLOYEE = QuickAction('Edit Employee', 'employee_update', 'fas fa-user-edit', 'btn-outline-warning', 'path')
+EMPLOYEE_DETAILS = QuickAction('Employee Details', 'employee_detail', 'fas fa-user', 'btn-outline-info', 'path')
+ALL_EMPLOYEES = QuickAction('All Employees', 'employee_list', 'fas fa-users', 'btn-outline-secondary', None)
+
+# Quick actions of public pages, with the URL kwarg holding the page's object
+PAGE_ACTIONS = MappingProxyType({
+    ('services', 'service_list'): ((MANAGE_SERVICES, ADD_SERVICE, CATEGORIES), None),
+    ('services', 'service_detail'): ((EDIT_SERVICE, MANAGE_PRICING), 'service_id'),
+    ('accounts', 'employee_dashboard'): ((ADMIN_PANEL, MANAGE_EMPLOYEES, SYSTEM_SETTINGS), None),
+    ('accounts', 'admin_dashboard'): ((ADMIN_PANEL, MANAGE_EMPLOYEES, SYSTEM_SETTINGS), None),
+})
+
+# Admin actions for an object, by model name
+OBJECT_ACTIONS = MappingProxyType({
+    'Service': (EDIT_SERVICE, MANAGE_PRICING, ALL_SERVICES),
+    'ServiceCategory': (EDIT_CATEGORY, ALL_CATEGORIES),
+    'Employee': (EDIT_EMPLOYEE, EMPLOYEE_DETAILS, ALL_EMPLOYEES),
+})
+
+
+@lru_cache(maxsize=None)
+def admin_panel_urls():
+    """Read-only ``{url_name: url}`` map of the admin panel pages, reversed on first use"""
+    return MappingProxyType({name: reverse(f'admin_panel:{name}') for name in ADMIN_PANEL_URL_NAMES})
+
+
+@lru_cache(maxsize=1024)
+def _object_url(url_name, pk):
+    return reverse(f'admin_panel:{url_name}', args=[pk])
+
+
+@lru_cache(maxsize=1024)
+def _resolved(actions, pk):
+    return tuple(action.resolve(pk) for action in actions)
+
+
+def page_actions(resolver_match):
+    """Quick actions for the page ``resolver_match`` points to"""
+    if resolver_match is None:
+        return ()
+    entry = PAGE_ACTIONS.get((resolver_match.namespace, resolver_match.url_name))
+    if entry is None:
+        return ()
+    actions, object_kwarg = entry
+    pk = resolver_match.kwargs.get(object_kwarg) if object_kwarg else None
+    if object_kwarg and pk is None:
+        return ()
+    return _resolved(actions, pk)
+
+
+def object_actions(obj):
+    """Admin actions for a Service, ServiceCategory or Employee"""
+    actions = OBJECT_ACTIONS.get(type(obj).__name__)
+    if actions is None:
+        return ()
+    return _resolved(actions, obj.pk)
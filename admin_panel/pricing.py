@@ -0,0 +1,372 @@
+"""
+Pricing operations for the admin panel
+"""
+import codecs
+import csv
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Round
+from django.db.models.lookups import GreaterThan, LessThanOrEqual
+from services.models import Service, ServicePrice
+from services.catalog import invalidate_catalog
+from services.pricing import invalidate_pricing_matrix
+
+PRICE_ADJUSTMENT_RULES = [
+    ('percentage', 'Percentage change'),
+    ('absolute', 'Absolute change'),
+    ('rounding', 'Round to nearest step'),
+]
+PRICE_PREVIEW_LIMIT = 50
+
+PRICE_IMPORT_COLUMNS = ['service_name', 'vehicle_type', 'complexity_level', 'price']
+PRICE_IMPORT_BATCH_SIZE = 2000
+PRICE_IMPORT_MAX_REPORTED_ERRORS = 500
+
+_MAX_PRICE = Decimal('99999999.99')  # max_digits=10, decimal_places=2
+_VEHICLE_TYPE_MAX_LENGTH = ServicePrice._meta.get_field('vehicle_type').max_length
+_COMPLEXITY_LEVEL_MAX_LENGTH = ServicePrice._meta.get_field('complexity_level').max_length
+
+
+def import_prices_from_csv(csv_file, overwrite_existing=False, batch_size=PRICE_IMPORT_BATCH_SIZE):
+    """
+    Import a pricing CSV (service_name, vehicle_type, complexity_level, price).
+
+    The file is decoded and parsed one line at a time, service names are
+    resolved through a single prefetched dictionary and rows are upserted
+    with bulk_create in batches inside one transaction.
+
+    Args:
+        csv_file: Uploaded file (or any iterable of UTF-8 encoded lines)
+        overwrite_existing: Update prices that already exist instead of skipping them
+        batch_size: Number of rows written per bulk_create call
+
+    Returns:
+        Report dict with created/updated/skipped counts and per-row errors
+    """
+    reader = csv.reader(codecs.iterdecode(csv_file, 'utf-8-sig'))
+    report = {
+        'rows': 0,
+        'created': 0,
+        'updated': 0,
+        'skipped': 0,
+        'error_count': 0,
+        'errors': [],
+    }
+
+    header = [column.strip().lower() for column in next(reader, [])]
+    missing = [column for column in PRICE_IMPORT_COLUMNS if column not in header]
+    if missing:
+        _add_error(report, 1, [f'Missing column(s): {", ".join(missing)}'])
+        return report
+    positions = [header.index(column) for column in PRICE_IMPORT_COLUMNS]
+
+    service_ids, ambiguous_names = _service_lookup()
+    existing_keys = set(
+        ServicePrice.objects.values_list('service_id', 'vehicle_type', 'complexity_level')
+    )
+
+    pending = {}
+    with transaction.atomic():
+        for line_number, row in enumerate(reader, start=2):
+            if not any(cell.strip() for cell in row):
+                continue
+            report['rows'] += 1
+
+            parsed, errors = _parse_row(row, positions, service_ids, ambiguous_names)
+            if errors:
+                _add_error(report, line_number, errors, row)
+                continue
+
+            key = parsed[:3]
+            if key in existing_keys and not overwrite_existing:
+                report['skipped'] += 1
+                continue
+
+            if key not in pending:
+                if key in existing_keys:
+                    report['updated'] += 1
+                else:
+                    report['created'] += 1
+                    existing_keys.add(key)
+            pending[key] = parsed[3]  # later rows for the same key win
+
+            if len(pending) >= batch_size:
+                _write_batch(pending, overwrite_existing)
+                pending = {}
+
+        if pending:
+            _write_batch(pending, overwrite_existing)
+
+    if report['created'] or report['updated']:
+        invalidate_pricing_matrix()
+        invalidate_catalog()
+    return report
+
+
+def _service_lookup():
+    """Map lower-cased service names to ids in one query"""
+    service_ids = {}
+    ambiguous_names = set()
+    for service_id, name in Service.objects.values_list('id', 'name'):
+        key = name.strip().lower()
+        if key in service_ids:
+            ambiguous_names.add(key)
+        service_ids[key] = service_id
+    return service_ids, ambiguous_names
+
+
+def _parse_row(row, positions, service_ids, ambiguous_names):
+    """Validate one CSV row, returning ((service_id, vehicle_type, complexity_level, price), errors)"""
+    if len(row) <= max(positions):
+        return None, [f'Expected {len(PRICE_IMPORT_COLUMNS)} columns, found {len(row)}.']
+
+    service_name, vehicle_type, complexity_level, raw_price = (row[i].strip() for i in positions)
+    errors = []
+
+    service_key = service_name.lower()
+    service_id = service_ids.get(service_key)
+    if not service_name:
+        errors.append('Service name is required.')
+    elif service_key in ambiguous_names:
+        errors.append(f'Service name "{service_name}" matches more than one service.')
+    elif service_id is None:
+        errors.append(f'Unknown service "{service_name}".')
+
+    if not vehicle_type:
+        errors.append('Vehicle type is required.')
+    elif len(vehicle_type) > _VEHICLE_TYPE_MAX_LENGTH:
+        errors.append(f'Vehicle type must be at most {_VEHICLE_TYPE_MAX_LENGTH} characters.')
+
+    if not complexity_level:
+        errors.append('Complexity level is required.')
+    elif len(complexity_level) > _COMPLEXITY_LEVEL_MAX_LENGTH:
+        errors.append(f'Complexity level must be at most {_COMPLEXITY_LEVEL_MAX_LENGTH} characters.')
+
+    try:
+        price = Decimal(raw_price).quantize(Decimal('0.01'))
+        if price <= 0:
+            errors.append('Price must be greater than 0.')
+        elif price > _MAX_PRICE:
+            errors.append('Price is too large.')
+    except (InvalidOperation, ValueError):
+        errors.append(f'Invalid price "{raw_price}".')
+
+    if errors:
+        return None, errors
+    return (service_id, vehicle_type, complexity_level, price), []
+
+
+def _write_batch(pending, overwrite_existing):
+    """Upsert one batch of prices"""
+    objects = [
+        ServicePrice(
+            service_id=service_id,
+            vehicle_type=vehicle_type,
+            complexity_level=complexity_level,
+            price=price,
+            is_active=True,
+        )
+        for (service_id, vehicle_type, complexity_level), price in pending.items()
+    ]
+    if overwrite_existing:
+        ServicePrice.objects.bulk_create(
+            objects,
+            update_conflicts=True,
+            unique_fields=['service', 'vehicle_type', 'complexity_level'],
+            update_fields=['price', 'is_active'],
+        )
+    else:
+        ServicePrice.objects.bulk_create(objects, ignore_conflicts=True)
+
+
+def _add_error(report, line_number, errors, row=None):
+    """Record a row error, keeping the report bounded for very large files"""
+    report['error_count'] += 1
+    if len(report['errors']) < PRICE_IMPORT_MAX_REPORTED_ERRORS:
+        report['errors'].append({
+            'line': line_number,
+            'errors': errors,
+            'row': row or [],
+        })
+
+
+def adjustable_prices(service_ids=None, category_ids=None, active_only=False):
+    """
+    ServicePrice rows targeted by a bulk adjustment.
+
+    Prices are selected when their service is in ``service_ids`` or belongs
+    to a category in ``category_ids``.
+    """
+    scope = Q()
+    if service_ids:
+        scope |= Q(service_id__in=service_ids)
+    if category_ids:
+        scope |= Q(service__category_id__in=category_ids)
+    if not scope:
+        return ServicePrice.objects.none()
+
+    queryset = ServicePrice.objects.filter(scope)
+    if active_only:
+        queryset = queryset.filter(is_active=True)
+    return queryset
+
+
+def price_adjustment_expression(rule, value):
+    """
+    SQL expression computing the adjusted price for a rule
+
+    Args:
+        rule: 'percentage' (value is the % change), 'absolute' (value is added)
+              or 'rounding' (round to the nearest multiple of value)
+        value: Decimal parameter for the rule
+    """
+    output_field = DecimalField(max_digits=10, decimal_places=2)
+    value = Decimal(value)
+
+    if rule == 'percentage':
+        factor = Value(1 + value / 100, output_field=DecimalField())
+        return Round(F('price') * factor, 2, output_field=output_field)
+    if rule == 'absolute':
+        delta = Value(value, output_field=DecimalField())
+        return Round(F('price') + delta, 2, output_field=output_field)
+    if rule == 'rounding':
+        step = Value(value, output_field=DecimalField())
+        return Round(Round(F('price') / step, 0) * step, 2, output_field=output_field)
+    raise ValueError(f'Unknown price adjustment rule: {rule}')
+
+
+def validate_price_adjustment(rule, value):
+    """Return an error message for an invalid rule/value pair, or None"""
+    if rule not in dict(PRICE_ADJUSTMENT_RULES):
+        return 'Invalid adjustment rule.'
+    if rule == 'percentage' and value <= -100:
+        return 'Percentage change must be greater than -100.'
+    if rule == 'rounding' and value <= 0:
+        return 'Rounding step must be greater than 0.'
+    return None
+
+
+def apply_price_adjustment(queryset, rule, value, dry_run=False, preview_limit=PRICE_PREVIEW_LIMIT):
+    """
+    Adjust every price in the queryset with one set-based UPDATE.
+
+    Rows whose adjusted price would not be positive (or would overflow the
+    price column) are left untouched.
+    The summary, preview and update all run inside one transaction.
+
+    Returns:
+        Dict with matched/updated/skipped counts, old and new price totals and
+        a preview of the first ``preview_limit`` changes
+    """
+    new_price = price_adjustment_expression(rule, value)
+    stays_valid = Q(GreaterThan(new_price, 0)) & Q(LessThanOrEqual(new_price, _MAX_PRICE))
+
+    with transaction.atomic():
+        summary = queryset.aggregate(
+            matched=Count('id'),
+            eligible=Count('id', filter=stays_valid),
+            current_total=Sum('price', filter=stays_valid),
+            new_total=Sum(new_price, filter=stays_valid),
+        )
+        eligible = queryset.filter(stays_valid)
+        preview = list(
+            eligible.annotate(new_price=new_price)
+            .order_by('service__name', 'vehicle_type', 'complexity_level')
+            .values('id', 'service__name', 'vehicle_type', 'complexity_level', 'price', 'new_price')[:preview_limit]
+        )
+        updated = 0 if dry_run else eligible.update(price=new_price)
+        if updated:
+            invalidate_pricing_matrix()
+            invalidate_catalog()
+
+    cents = Decimal('0.01')
+    for row in preview:
+        row['new_price'] = row['new_price'].quantize(cents)
+
+    return {
+        'dry_run': dry_run,
+        'matched': summary['matched'],
+        'updated': summary['eligible'] if dry_run else updated,
+        'skipped': summary['matched'] - summary['eligible'],
+        'current_total': (summary['current_total'] or Decimal('0')).quantize(cents),
+        'new_total': (summary['new_total'] or Decimal('0')).quantize(cents),
+        'preview': preview,
+    }
+
+
+def build_pricing_matrix(services):
+    """
+    Build dense pricing matrices for the given services from one scan of ServicePrice.
+
+    The axes (vehicle types and complexity levels) and the summary stats cover
+    every price in the table, so each matrix shares the same columns and the
+    statistics match the whole catalog.
+
+    Args:
+        services: Iterable of Service instances to build matrices for
+
+    Returns:
+        Dict with 'vehicle_types', 'complexity_levels', 'matrices' (one per
+        service: {'service', 'price_count', 'rows': [{'vehicle_type', 'cells'}]})
+        and the 'total_prices', 'active_prices' and 'services_with_pricing' stats
+    """
+    services = list(services)
+    wanted_ids = {service.id for service in services}
+
+    vehicle_types = set()
+    complexity_levels = set()
+    priced_service_ids = set()
+    active_prices = 0
+    total_prices = 0
+    cells_by_service = {}
+
+    rows = ServicePrice.objects.values_list(
+        'id', 'service_id', 'vehicle_type', 'complexity_level', 'price', 'is_active'
+    )
+    for price_id, service_id, vehicle_type, complexity_level, price, is_active in rows:
+        total_prices += 1
+        active_prices += is_active
+        priced_service_ids.add(service_id)
+        vehicle_types.add(vehicle_type)
+        complexity_levels.add(complexity_level)
+        if service_id in wanted_ids:
+            cells_by_service.setdefault(service_id, {})[(vehicle_type, complexity_level)] = {
+                'id': price_id,
+                'price': price,
+                'is_active': is_active,
+            }
+
+    vehicle_types = sorted(vehicle_types)
+    complexity_levels = sorted(complexity_levels)
+
+    matrices = []
+    for service in services:
+        cells = cells_by_service.get(service.id, {})
+        matrices.append({
+            'service': service,
+            'price_count': len(cells),
+            'rows': [
+                {
+                    'vehicle_type': vehicle_type,
+                    'cells': [
+                        {
+                            'complexity_level': complexity_level,
+                            'price': cells.get((vehicle_type, complexity_level)),
+                        }
+                        for complexity_level in complexity_levels
+                    ],
+                }
+                for vehicle_type in vehicle_types
+            ],
+        })
+
+    return {
+        'vehicle_types': vehicle_types,
+        'complexity_levels': complexity_levels,
+        'matrices': matrices,
+        'total_prices': total_prices,
+        'active_prices': active_prices,
+        'services_with_pricing': len(priced_service_ids),
+    }
@@ -766,10 +766,12 @@ window.AdminPanel = {
         },
 
         initRealTimeUpdates: function() {
-            // Auto-refresh dashboard stats every 5 minutes
-            this.refreshInterval = setInterval(function() {
-                AdminPanel.Dashboard.refreshStats();
-            }, 300000);
+            // Stats changes are pushed over the admin stream; without it, refresh every 5 minutes
+            AdminPanel.Stream.connect(function() {
+                AdminPanel.Dashboard.refreshInterval = setInterval(function() {
+                    AdminPanel.Dashboard.refreshStats();
+                }, 300000);
+            });
 
             // Manual refresh button
             $('#refreshDashboard').on('click', function() {
@@ -859,15 +861,25 @@ window.AdminPanel = {
             });
         },
 
+        statCards: {
+            today_appointments: '#todayAppointments',
+            pending_appointments: '#pendingAppointments',
+            month_appointments: '#monthAppointments',
+            active_services: '#activeServices',
+            active_employees: '#activeEmployees',
+            active_categories: '#activeCategories'
+        },
+
         updateStatsDisplay: function(stats) {
-            // Update stat cards
-            $('#todayAppointments').text(stats.today_appointments);
-            $('#pendingAppointments').text(stats.pending_appointments);
-            $('#monthAppointments').text(stats.month_appointments);
-            $('#monthRevenue').text(AdminPanel.formatCurrency(stats.month_revenue));
-            $('#activeServices').text(stats.active_services);
-            $('#activeEmployees').text(stats.active_employees);
-            $('#activeCategories').text(stats.active_categories);
+            // Update stat cards (the stream sends only the stats that changed)
+            $.each(this.statCards, function(key, selector) {
+                if (key in stats) {
+                    $(selector).text(stats[key]);
+                }
+            });
+            if ('month_revenue' in stats) {
+                $('#monthRevenue').text(AdminPanel.formatCurrency(stats.month_revenue));
+            }
             
             // Update last updated timestamp
             $('#lastUpdated').text('Last updated: ' + AdminPanel.formatDate(stats.last_updated));
@@ -893,32 +905,99 @@ window.AdminPanel = {
         }
     },
 
+    // Server-Sent Events stream of dashboard stats and notifications
+    Stream: {
+        source: null,
+        fallbacks: [],
+
+        // Open the stream once per page; `fallback` starts polling if the stream is unavailable
+        connect: function(fallback) {
+            if (!window.EventSource) {
+                fallback();
+                return;
+            }
+            this.fallbacks.push(fallback);
+            if (this.source) {
+                return;
+            }
+
+            var source = this.source = new EventSource('/admin-panel/ajax/dashboard/stream/');
+            source.addEventListener('stats', function(event) {
+                AdminPanel.Dashboard.updateStatsDisplay(JSON.parse(event.data));
+            });
+            source.addEventListener('notifications', function(event) {
+                var data = JSON.parse(event.data);
+                AdminPanel.Notifications.addNotifications(data.notifications, data.cursor);
+            });
+            source.onerror = function() {
+                // The browser reconnects by itself unless the server refused the stream
+                if (source.readyState === EventSource.CLOSED) {
+                    AdminPanel.Stream.fallbacks.forEach(function(start) {
+                        start();
+                    });
+                    AdminPanel.Stream.fallbacks = [];
+                }
+            };
+            $(window).on('beforeunload', function() {
+                source.close();
+            });
+        }
+    },
+
     // Enhanced Notifications Module
     Notifications: {
+        items: [],
+        cursor: null,
+        maxItems: 10,
+
         init: function() {
-            this.loadNotifications();
             this.initNotificationPolling();
             this.initNotificationActions();
         },
 
         loadNotifications: function() {
+            // Only the events after the cursor of the previous response
+            var cursor = this.cursor;
             $.ajax({
                 url: '/admin-panel/ajax/notifications/',
                 method: 'GET',
+                data: cursor === null ? {} : { since: cursor },
                 success: function(response) {
                     if (response.success) {
-                        AdminPanel.Notifications.displayNotifications(response.notifications);
-                        AdminPanel.Notifications.updateNotificationBadge(response.unread_count);
+                        AdminPanel.Notifications.addNotifications(response.notifications, response.cursor);
                     }
                 }
             });
         },
 
+        addNotifications: function(notifications, cursor) {
+            var known = {};
+            this.items.forEach(function(notification) {
+                known[notification.id] = true;
+            });
+            var added = notifications.filter(function(notification) {
+                return !known[notification.id];
+            });
+
+            this.cursor = cursor;
+            if (added.length === 0 && this.items.length > 0) {
+                return;
+            }
+            this.items = added.concat(this.items)
+                .sort(function(a, b) { return b.id - a.id; })
+                .slice(0, this.maxItems);
+            this.displayNotifications(this.items);
+            this.updateNotificationBadge(this.items.length);
+        },
+
         initNotificationPolling: function() {
-            // Poll for new notifications every 2 minutes
-            setInterval(function() {
+            // Notifications are pushed over the admin stream; without it, poll every 2 minutes
+            AdminPanel.Stream.connect(function() {
                 AdminPanel.Notifications.loadNotifications();
-            }, 120000);
+                setInterval(function() {
+                    AdminPanel.Notifications.loadNotifications();
+                }, 120000);
+            });
         },
 
         initNotificationActions: function() {
@@ -1008,6 +1087,7 @@ window.AdminPanel = {
         },
 
         clearAllNotifications: function() {
+            this.items = [];
             $('#notificationsList').empty().append('<div class="text-muted p-3">No new notifications</div>');
             this.updateNotificationBadge(0);
         }
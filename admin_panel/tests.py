@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User
+from appointments.models import AppointmentEvent
+from monitoring.testing import create_appointments, create_services
+
+from .utils import NOTIFICATION_SETTLE_SECONDS
+
+AJAX = {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'}
+
+
+def _settle(*events):
+    """Date events back past NOTIFICATION_SETTLE_SECONDS so the cursor can move past them"""
+    settled = timezone.now() - timedelta(seconds=NOTIFICATION_SETTLE_SECONDS + 1)
+    AppointmentEvent.objects.filter(pk__in=[event.pk for event in events]).update(created_at=settled)
+
+
+class DashboardPollingTests(TestCase):
+    """The async quick stats and notification endpoints polled by admin pages"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', password='secret')
+        cls.customer = User.objects.create_user('customer', password='secret', role='customer')
+        cls.services = create_services(2)
+        cls.appointments = create_appointments([cls.customer], cls.services, [None, None, None])
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def notifications(self, **params):
+        response = self.client.get(reverse('admin_panel:notifications_ajax'), params, **AJAX)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_quick_stats(self):
+        response = self.client.get(reverse('admin_panel:quick_stats_ajax'), **AJAX)
+        self.assertEqual(response.status_code, 200)
+        stats = response.json()['stats']
+        self.assertEqual(stats['pending_appointments'], 3)
+        self.assertEqual(stats['active_services'], 2)
+
+    def test_superusers_only(self):
+        self.client.force_login(self.customer)
+        response = self.client.get(reverse('admin_panel:quick_stats_ajax'), **AJAX)
+        self.assertEqual(response.status_code, 403)
+
+    def test_since_cursor_returns_only_newer_events(self):
+        _settle(*AppointmentEvent.objects.all())
+        first = self.notifications()
+        self.assertEqual(len(first['notifications']), 3)
+        self.assertEqual(first['cursor'], AppointmentEvent.objects.latest('id').id)
+        self.assertEqual(self.notifications(since=first['cursor'])['notifications'], [])
+
+        appointment = self.appointments[0]
+        appointment.status = 'cancelled'
+        appointment.save()
+        event = AppointmentEvent.objects.latest('id')
+
+        # Too recent to settle: returned, but the cursor stays put
+        recent = self.notifications(since=first['cursor'])
+        self.assertEqual([item['id'] for item in recent['notifications']], [event.id])
+        self.assertEqual(recent['notifications'][0]['type'], 'cancellation')
+        self.assertEqual(recent['cursor'], first['cursor'])
+
+        _settle(event)
+        settled = self.notifications(since=first['cursor'])
+        self.assertEqual([item['id'] for item in settled['notifications']], [event.id])
+        self.assertEqual(settled['cursor'], event.id)
+        self.assertEqual(self.notifications(since=settled['cursor'])['notifications'], [])
+
+    def test_invalid_since_cursor(self):
+        for since in ('abc', '-1'):
+            response = self.client.get(reverse('admin_panel:notifications_ajax'), {'since': since}, **AJAX)
+            self.assertEqual(response.status_code, 400)
+
+    def test_dashboard_stream_fallback_sends_stats_and_notifications(self):
+        _settle(*AppointmentEvent.objects.all())
+        response = self.client.get(reverse('admin_panel:dashboard_stream'))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = response.content.decode()
+        self.assertTrue(body.startswith('retry: 120000\n\n'))
+        self.assertIn('event: stats\n', body)
+        self.assertIn('event: notifications\n', body)
+        self.assertIn(f'id: {AppointmentEvent.objects.latest("id").id}\n', body)
+
+    def test_dashboard_stream_resumes_from_last_event_id(self):
+        _settle(*AppointmentEvent.objects.all())
+        cursor = AppointmentEvent.objects.latest('id').id
+        response = self.client.get(reverse('admin_panel:dashboard_stream'), HTTP_LAST_EVENT_ID=str(cursor))
+        body = response.content.decode()
+        self.assertIn('event: stats\n', body)
+        self.assertNotIn('event: notifications\n', body)
+
+        appointment = self.appointments[1]
+        appointment.status = 'cancelled'
+        appointment.save()
+        response = self.client.get(reverse('admin_panel:dashboard_stream'), HTTP_LAST_EVENT_ID=str(cursor))
+        self.assertIn('event: notifications\n', response.content.decode())
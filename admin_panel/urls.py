@@ -10,6 +10,7 @@ urlpatterns = [
     
     # Admin Logs
     path('logs/', views.AdminLogListView.as_view(), name='logs'),
+    path('logs/export/', views.AdminLogExportView.as_view(), name='logs_export'),
     
     # Service Management
     path('services/', views.ServiceListView.as_view(), name='service_list'),
@@ -35,6 +36,7 @@ urlpatterns = [
     path('pricing/conflict-check/', views.PricingConflictCheckView.as_view(), name='pricing_conflict_check'),
     path('pricing/service/<int:service_id>/prices/', views.ServicePricesAjaxView.as_view(), name='service_prices_ajax'),
     path('pricing/bulk-update/', views.BulkPricingUpdateView.as_view(), name='bulk_pricing_update'),
+    path('pricing/import/', views.PriceImportView.as_view(), name='price_import'),
     
     # Employee Management
     path('employees/', views.EmployeeListView.as_view(), name='employee_list'),
@@ -67,4 +69,5 @@ urlpatterns = [
     path('ajax/dashboard/quick-stats/', views.QuickStatsAjaxView.as_view(), name='quick_stats_ajax'),
     path('ajax/form/validate/', views.FormValidationAjaxView.as_view(), name='form_validation_ajax'),
     path('ajax/notifications/', views.NotificationAjaxView.as_view(), name='notifications_ajax'),
+    path('ajax/dashboard/stream/', views.DashboardStreamView.as_view(), name='dashboard_stream'),
 ]
\ No newline at end of file
@@ -3,7 +3,18 @@ Utility functions for admin panel operations
 """
 from django.contrib.contenttypes.models import ContentType
 from django.utils import timezone
-from .models import AdminLog
+from .models import AdminLog, SystemSettings
+from carmodx.routers import reporting_database
+from monitoring.metrics import Counter
+
+ADMIN_LOG_WRITES = Counter('carmodx_admin_log_writes_total', 'Admin log entries written')
+ADMIN_STATS_CACHE = Counter(
+    'carmodx_admin_stats_cache_total', 'Dashboard statistics cache lookups by result', ['result']
+)
+
+# Seconds after which an appointment event is assumed committed; the
+# notification cursor never moves past a younger one (see aget_notifications)
+NOTIFICATION_SETTLE_SECONDS = 10
 
 
 def log_admin_action(user, action, request=None, content_object=None, 
@@ -42,6 +53,7 @@ def log_admin_action(user, action, request=None, content_object=None,
         log_entry.extra_data = str(view_kwargs)
     
     log_entry.save()
+    ADMIN_LOG_WRITES.inc()
     return log_entry
 
 
@@ -57,6 +69,74 @@ def get_client_ip(request):
     return ip
 
 
+def filter_admin_logs(queryset, params):
+    """
+    Apply the admin log list filters to an AdminLog queryset
+    
+    Args:
+        queryset: AdminLog queryset to filter
+        params: Mapping with optional user, action, date_from and date_to keys
+    """
+    # Filter by user if specified
+    user_filter = params.get('user')
+    if user_filter:
+        queryset = queryset.filter(admin_user__username__icontains=user_filter)
+    
+    # Filter by action if specified
+    action_filter = params.get('action')
+    if action_filter:
+        queryset = queryset.filter(action__icontains=action_filter)
+    
+    # Filter by date range if specified (malformed dates are ignored)
+    date_from = _parse_date(params.get('date_from'))
+    date_to = _parse_date(params.get('date_to'))
+    if date_from:
+        queryset = queryset.filter(timestamp__date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(timestamp__date__lte=date_to)
+    
+    return queryset
+
+
+def _parse_date(value):
+    """A YYYY-MM-DD filter value as a date, or None when missing or invalid"""
+    from datetime import date
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def get_system_settings(defaults):
+    """
+    Read several system settings in a single query
+
+    Args:
+        defaults: Dict mapping setting keys to the value used when the
+                  setting has not been stored yet
+
+    Returns:
+        Dict mapping each requested key to its stored (string) value or default
+    """
+    values = dict(defaults)
+    values.update(
+        SystemSettings.objects.filter(key__in=list(defaults)).values_list('key', 'value')
+    )
+    return values
+
+
+def setting_is_enabled(value):
+    """
+    Interpret a stored boolean setting value ('true', '1', 'yes')
+    """
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ['true', '1', 'yes']
+
+
+@reporting_database()
 def get_admin_statistics():
     """
     Calculate comprehensive admin dashboard statistics with caching
@@ -74,7 +154,9 @@ def get_admin_statistics():
     cache_key = 'admin_dashboard_stats'
     cached_stats = cache.get(cache_key)
     if cached_stats:
+        ADMIN_STATS_CACHE.inc(result='hit')
         return cached_stats
+    ADMIN_STATS_CACHE.inc(result='miss')
     
     User = get_user_model()
     now = timezone.now()
@@ -98,17 +180,17 @@ def get_admin_statistics():
     completed_appointments = Appointment.objects.filter(status='completed').count()
     cancelled_appointments = Appointment.objects.filter(status='cancelled').count()
     
-    # Revenue calculations - using service base_price since final_price doesn't exist
+    # Revenue calculations - single-table sums over the price quoted at booking
     total_revenue = Appointment.objects.filter(
         status='completed'
     ).aggregate(
-        total=Sum('selected_service__base_price')
+        total=Sum('quoted_price')
     )['total'] or Decimal('0.00')
     
     estimated_revenue = Appointment.objects.filter(
         status__in=['booked', 'assigned', 'in_progress']
     ).aggregate(
-        total=Sum('selected_service__base_price')
+        total=Sum('quoted_price')
     )['total'] or Decimal('0.00')
     
     # Time-based statistics
@@ -141,7 +223,7 @@ def get_admin_statistics():
         work_completed_at__gte=last_30_days,
         status='completed'
     ).aggregate(
-        total=Sum('selected_service__base_price')
+        total=Sum('quoted_price')
     )['total'] or Decimal('0.00')
     
     # Popular services (top 5 by appointment count)
@@ -172,7 +254,7 @@ def get_admin_statistics():
                 )
             ),
             total_revenue=Sum(
-                'assigned_work__selected_service__base_price',
+                'assigned_work__quoted_price',
                 filter=Q(
                     assigned_work__status='completed',
                     assigned_work__work_completed_at__gte=last_30_days
@@ -220,7 +302,7 @@ def get_admin_statistics():
     avg_appointment_value = Appointment.objects.filter(
         status='completed'
     ).aggregate(
-        avg=Avg('selected_service__base_price')
+        avg=Avg('quoted_price')
     )['avg'] or Decimal('0.00')
     
     # Compile all statistics
@@ -270,6 +352,9 @@ def get_admin_statistics():
         'revenue_per_appointment': round(
             float(total_revenue / completed_appointments) if completed_appointments > 0 else 0, 2
         ),
+        
+        # Version of this snapshot, for the dashboard's cached widget fragments
+        'generated_at': now.isoformat(),
     }
     
     # Cache for 5 minutes
@@ -278,6 +363,119 @@ def get_admin_statistics():
     return stats
 
 
+async def aget_quick_stats(from_replica=True):
+    """
+    Headline dashboard counters, read asynchronously from the reporting database
+
+    The independent aggregates are awaited together. Pass ``from_replica=False``
+    to read a change that was just committed and may not be on the replica yet.
+    """
+    import asyncio
+    from contextlib import nullcontext
+    from django.db.models import Sum
+    from accounts.models import Employee
+    from appointments.models import Appointment
+    from services.models import Service, ServiceCategory
+    
+    today = timezone.now().date()
+    month_start = today.replace(day=1)
+    
+    with reporting_database() if from_replica else nullcontext():
+        (today_appointments, pending_appointments, month_appointments, month_revenue,
+         active_services, active_employees, active_categories) = await asyncio.gather(
+            Appointment.objects.filter(slot_date=today).acount(),
+            Appointment.objects.filter(status='booked').acount(),
+            Appointment.objects.filter(slot_date__gte=month_start).acount(),
+            Appointment.objects.filter(
+                slot_date__gte=month_start,
+                status='completed'
+            ).aaggregate(total=Sum('quoted_price')),
+            Service.objects.filter(is_active=True).acount(),
+            Employee.objects.filter(is_active=True).acount(),
+            ServiceCategory.objects.filter(is_active=True).acount(),
+        )
+    
+    return {
+        'today_appointments': today_appointments,
+        'pending_appointments': pending_appointments,
+        'month_appointments': month_appointments,
+        'month_revenue': float(month_revenue['total'] or 0),
+        'active_services': active_services,
+        'active_employees': active_employees,
+        'active_categories': active_categories,
+        'last_updated': timezone.now().isoformat()
+    }
+
+
+def _format_notification(event):
+    appointment = event.appointment
+    customer = appointment.customer.get_full_name()
+    service = appointment.selected_service.name
+    if event.is_booking:
+        notification_type, title, message = 'new_appointment', 'New Appointment', f'{customer} booked {service}'
+    elif event.to_status == 'cancelled':
+        notification_type, title, message = 'cancellation', 'Appointment Cancelled', f'{customer} cancelled {service}'
+    elif event.to_status == 'assigned' and appointment.assigned_employee:
+        notification_type, title = 'assignment', 'Appointment Assigned'
+        message = f'{service} for {customer} assigned to {appointment.assigned_employee.get_full_name()}'
+    else:
+        notification_type, title = 'status_change', f'Appointment {event.get_to_status_display()}'
+        message = f'{service} for {customer} is now {event.get_to_status_display()}'
+    return {
+        'id': event.id,
+        'type': notification_type,
+        'title': title,
+        'message': message,
+        'timestamp': event.created_at.isoformat(),
+        'url': f'/admin/appointments/{appointment.id}/'
+    }
+
+
+async def aget_notifications(since=None, limit=10):
+    """
+    Notifications from the appointment event log, newest first
+    
+    Without ``since`` returns the latest events of the last 24 hours; with it,
+    only the events after that cursor (a primary key range scan, so a poll
+    costs O(new events)).
+    
+    Event ids are taken when an event is written but become visible when its
+    transaction commits, which on PostgreSQL need not happen in id order. The
+    cursor therefore only moves past events older than
+    NOTIFICATION_SETTLE_SECONDS; younger ones are returned again by the next
+    call (the browser merges notifications by id). An event committed later
+    than that after it was written can still be skipped.
+    
+    Returns:
+        (notifications, cursor) - pass ``cursor`` as ``since`` on the next call
+    """
+    from datetime import timedelta
+    from appointments.models import AppointmentEvent
+    
+    now = timezone.now()
+    settled_before = now - timedelta(seconds=NOTIFICATION_SETTLE_SECONDS)
+    events = AppointmentEvent.objects.select_related(
+        'appointment__customer', 'appointment__selected_service', 'appointment__assigned_employee'
+    )
+    if since is None:
+        yesterday = now - timedelta(hours=24)
+        events = [event async for event in events.filter(created_at__gte=yesterday).order_by('-id')[:limit]]
+        cursor = await AppointmentEvent.objects.filter(
+            created_at__lt=settled_before
+        ).order_by('-id').values_list('id', flat=True).afirst() or 0
+    else:
+        # Oldest first, so the cursor never skips events beyond the limit
+        events = [event async for event in events.filter(id__gt=since).order_by('id')[:limit]]
+        cursor = since
+        for event in events:
+            if event.created_at >= settled_before:
+                break
+            cursor = event.id
+        events.reverse()
+    
+    return [_format_notification(event) for event in events], cursor
+
+
 def clear_dashboard_cache():
     """
     Clear the dashboard statistics cache
@@ -297,135 +495,24 @@ def get_context_admin_actions(request, context_object=None):
     Returns:
         List of admin action dictionaries
     """
-    from django.urls import reverse, NoReverseMatch
-    from services.models import Service, ServiceCategory
-    from accounts.models import Employee
-    
-    actions = []
+    from django.urls import NoReverseMatch
+    from .navigation import ADMIN_DASHBOARD, object_actions, page_actions
     
     if not (request.user.is_authenticated and request.user.is_superuser):
-        return actions
+        return []
     
     try:
         # Always include dashboard link
-        actions.append({
-            'name': 'Admin Dashboard',
-            'url': reverse('admin_panel:dashboard'),
-            'icon': 'fas fa-tachometer-alt',
-            'class': 'btn-outline-primary'
-        })
+        actions = [ADMIN_DASHBOARD.resolve()]
         
-        # Context-specific actions based on object type
+        # Context-specific actions based on object type, else on the current page
         if context_object:
-            if isinstance(context_object, Service):
-                actions.extend([
-                    {
-                        'name': 'Edit Service',
-                        'url': reverse('admin_panel:service_update', args=[context_object.pk]),
-                        'icon': 'fas fa-edit',
-                        'class': 'btn-outline-warning'
-                    },
-                    {
-                        'name': 'Manage Pricing',
-                        'url': f"{reverse('admin_panel:pricing_matrix')}?service={context_object.pk}",
-                        'icon': 'fas fa-dollar-sign',
-                        'class': 'btn-outline-info'
-                    },
-                    {
-                        'name': 'All Services',
-                        'url': reverse('admin_panel:service_list'),
-                        'icon': 'fas fa-list',
-                        'class': 'btn-outline-secondary'
-                    }
-                ])
-            
-            elif isinstance(context_object, ServiceCategory):
-                actions.extend([
-                    {
-                        'name': 'Edit Category',
-                        'url': reverse('admin_panel:category_update', args=[context_object.pk]),
-                        'icon': 'fas fa-edit',
-                        'class': 'btn-outline-warning'
-                    },
-                    {
-                        'name': 'All Categories',
-                        'url': reverse('admin_panel:category_list'),
-                        'icon': 'fas fa-tags',
-                        'class': 'btn-outline-secondary'
-                    }
-                ])
-            
-            elif isinstance(context_object, Employee):
-                actions.extend([
-                    {
-                        'name': 'Edit Employee',
-                        'url': reverse('admin_panel:employee_update', args=[context_object.pk]),
-                        'icon': 'fas fa-user-edit',
-                        'class': 'btn-outline-warning'
-                    },
-                    {
-                        'name': 'Employee Details',
-                        'url': reverse('admin_panel:employee_detail', args=[context_object.pk]),
-                        'icon': 'fas fa-user',
-                        'class': 'btn-outline-info'
-                    },
-                    {
-                        'name': 'All Employees',
-                        'url': reverse('admin_panel:employee_list'),
-                        'icon': 'fas fa-users',
-                        'class': 'btn-outline-secondary'
-                    }
-                ])
-        
-        # URL-based actions when no specific object
+            specific = object_actions(context_object)
         else:
-            current_url = request.resolver_match
-            if current_url:
-                namespace = current_url.namespace
-                url_name = current_url.url_name
-                
-                if namespace == 'services':
-                    if url_name == 'service_list':
-                        actions.extend([
-                            {
-                                'name': 'Manage Services',
-                                'url': reverse('admin_panel:service_list'),
-                                'icon': 'fas fa-cogs',
-                                'class': 'btn-outline-primary'
-                            },
-                            {
-                                'name': 'Add Service',
-                                'url': reverse('admin_panel:service_create'),
-                                'icon': 'fas fa-plus',
-                                'class': 'btn-outline-success'
-                            },
-                            {
-                                'name': 'Categories',
-                                'url': reverse('admin_panel:category_list'),
-                                'icon': 'fas fa-tags',
-                                'class': 'btn-outline-info'
-                            }
-                        ])
-                
-                elif namespace == 'accounts':
-                    if url_name in ['employee_dashboard', 'admin_dashboard']:
-                        actions.extend([
-                            {
-                                'name': 'Manage Employees',
-                                'url': reverse('admin_panel:employee_list'),
-                                'icon': 'fas fa-users',
-                                'class': 'btn-outline-info'
-                            },
-                            {
-                                'name': 'System Settings',
-                                'url': reverse('admin_panel:settings_list'),
-                                'icon': 'fas fa-cog',
-                                'class': 'btn-outline-secondary'
-                            }
-                        ])
-    
+            specific = page_actions(request.resolver_match)
+        actions.extend(action for action in specific if action['url'] != actions[0]['url'])
     except NoReverseMatch:
-        pass
+        return []
     
     return actions
 
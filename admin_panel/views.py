@@ -1,6 +1,7 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.views.generic import TemplateView, ListView, View, CreateView, UpdateView, DeleteView
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.views import redirect_to_login
 from django.core.exceptions import PermissionDenied
 from django.http import JsonResponse
 from django.contrib import messages
@@ -10,16 +11,31 @@ from django.utils import timezone
 from django.urls import reverse_lazy, reverse
 from django.db.models import Q, Count, Sum, Avg
 from django.core.paginator import Paginator
+from django.core.cache import cache
 from django.db.models.functions import TruncDate
+import hashlib
 from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+from . import bulk
 from .models import AdminLog, SystemSettings
-from .utils import log_admin_action, get_admin_statistics, clear_dashboard_cache
+from .exports import ADMIN_LOG_EXPORT_FIELDS, streaming_export_response
+from .pricing import (PRICE_ADJUSTMENT_RULES, adjustable_prices, apply_price_adjustment,
+                      build_pricing_matrix, import_prices_from_csv, validate_price_adjustment)
+from .utils import (log_admin_action, get_admin_statistics, clear_dashboard_cache, filter_admin_logs,
+                    aget_notifications, aget_quick_stats)
 from .forms import (ServiceForm, ServiceSearchForm, ServiceBulkActionForm, 
                    CategoryForm, CategorySearchForm, CategoryBulkActionForm,
                    ServicePriceForm, PricingSearchForm, BulkPricingForm, PriceImportForm,
                    EmployeeCreateForm, EmployeeUpdateForm, EmployeeSearchForm, EmployeeBulkActionForm)
 from services.models import Service, ServiceCategory, ServicePrice
+from services.pricing import invalidate_pricing_matrix
+from services.catalog import CATALOG_VERSION, invalidate_catalog
+from search.backends import search_queryset, search_terms
+from accounts.auth import aget_user
 from accounts.models import User, Employee
+from carmodx.routers import reporting_database
+from carmodx.versions import get_version
+from appointments.events import event_stream_response
 
 
 class SuperUserRequiredMixin(LoginRequiredMixin):
@@ -35,6 +51,21 @@ class SuperUserRequiredMixin(LoginRequiredMixin):
         return super().dispatch(request, *args, **kwargs)
 
 
+class AsyncSuperUserRequiredMixin:
+    """SuperUserRequiredMixin for views whose handlers are coroutines (JSON errors)"""
+    
+    async def dispatch(self, request, *args, **kwargs):
+        user = await aget_user(request)
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        if not user.is_superuser:
+            return JsonResponse({
+                'success': False,
+                'error': 'You must be a super user to access this page.'
+            }, status=403)
+        return await super().dispatch(request, *args, **kwargs)
+
+
 class AdminLogMixin:
     """
     Mixin for automatic admin action logging
@@ -84,6 +115,109 @@ class AjaxResponseMixin:
         return super().dispatch(request, *args, **kwargs)
 
 
+class TypeaheadMixin:
+    """
+    Shared GET handler for typeahead search endpoints
+
+    Fetches ``limit + 1`` rows to report ``has_more`` without a count()
+    query and caches each user's recent results per query. When a shorter
+    prefix of the query already returned its complete result set, the new
+    query is answered by filtering that cached set instead of hitting the
+    database.
+
+    Subclasses set ``results_key`` and ``filter_params`` and implement
+    ``get_typeahead_queryset()``, ``serialize_result()`` and ``get_search_text()``.
+    With ``data_version`` set, cached results are keyed on that data version
+    (carmodx/versions.py), so writes show up at once instead of after
+    ``cache_timeout``.
+    """
+    results_key = None
+    filter_params = ()
+    data_version = None
+    default_limit = 10
+    max_limit = 50
+    cache_timeout = 60
+    
+    def get(self, request, *args, **kwargs):
+        """Return matching results as JSON"""
+        try:
+            query = request.GET.get('q', '').strip()
+            filters = {name: request.GET.get(name, '').strip() for name in self.filter_params}
+            try:
+                limit = min(max(int(request.GET.get('limit', self.default_limit)), 1), self.max_limit)
+            except ValueError:
+                limit = self.default_limit
+            
+            results, has_more = self.get_typeahead_results(query, filters, limit)
+            
+            return JsonResponse({
+                'success': True,
+                self.results_key: results,
+                'has_more': has_more
+            })
+            
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            }, status=500)
+    
+    def get_typeahead_results(self, query, filters, limit):
+        """Return (serialized results, has_more) from the cache or the database"""
+        normalized = ' '.join(query.lower().split())
+        self._version = get_version(self.data_version) if self.data_version else 0
+        
+        entry = cache.get(self._cache_key(normalized, filters))
+        if entry and (entry['complete'] or entry['limit'] >= limit):
+            items = entry['items']
+            return [item['data'] for item in items[:limit]], len(items) > limit or not entry['complete']
+        
+        # A complete result set for a shorter prefix contains every match for this query
+        prefix_keys = [self._cache_key(normalized[:end], filters) for end in range(len(normalized) - 1, 0, -1)]
+        cached_prefixes = cache.get_many(prefix_keys)
+        for key in prefix_keys:
+            prefix_entry = cached_prefixes.get(key)
+            if prefix_entry and prefix_entry['complete']:
+                items = [item for item in prefix_entry['items'] if self.matches_query(item['text'], normalized)]
+                self._store(normalized, filters, items, True, limit)
+                return [item['data'] for item in items[:limit]], len(items) > limit
+        
+        rows = list(self.get_typeahead_queryset(query, filters)[:limit + 1])
+        complete = len(rows) <= limit
+        items = [
+            {'data': self.serialize_result(obj), 'text': self.get_search_text(obj).lower()}
+            for obj in rows[:limit]
+        ]
+        self._store(normalized, filters, items, complete, limit)
+        return [item['data'] for item in items], not complete
+    
+    def matches_query(self, text, query):
+        """Whether cached search text matches the query (every term prefixes a word, as in the index)"""
+        words = search_terms(text)
+        return all(any(word.startswith(term) for word in words) for term in search_terms(query))
+    
+    def get_typeahead_queryset(self, query, filters):
+        raise NotImplementedError
+    
+    def serialize_result(self, obj):
+        raise NotImplementedError
+    
+    def get_search_text(self, obj):
+        raise NotImplementedError
+    
+    def _cache_key(self, query, filters):
+        filter_key = '&'.join(f'{name}={value}' for name, value in sorted(filters.items()))
+        digest = hashlib.md5(f'{filter_key}|{query}'.encode()).hexdigest()
+        return f'typeahead:{self.request.user.pk}:{self.results_key}:{self._version}:{digest}'
+    
+    def _store(self, query, filters, items, complete, limit):
+        cache.set(
+            self._cache_key(query, filters),
+            {'items': items, 'complete': complete, 'limit': limit},
+            self.cache_timeout
+        )
+
+
 class AdminDashboardView(SuperUserRequiredMixin, AdminLogMixin, TemplateView):
     """Admin dashboard view with comprehensive statistics and analytics"""
     template_name = 'admin_panel/dashboard.html'
@@ -108,34 +242,35 @@ class AdminLogListView(SuperUserRequiredMixin, ListView):
     template_name = 'admin_panel/logs/log_list.html'
     context_object_name = 'logs'
     paginate_by = 50
+    query_budget = 12
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['page_title'] = 'Admin Logs'
         return context
     
+    def get(self, request, *args, **kwargs):
+        with reporting_database():
+            # Render inside the block: the template is what fetches the page of logs
+            return super().get(request, *args, **kwargs).render()
+    
     def get_queryset(self):
-        queryset = AdminLog.objects.select_related('admin_user', 'content_type')
-        
-        # Filter by user if specified
-        user_filter = self.request.GET.get('user')
-        if user_filter:
-            queryset = queryset.filter(admin_user__username__icontains=user_filter)
-        
-        # Filter by action if specified
-        action_filter = self.request.GET.get('action')
-        if action_filter:
-            queryset = queryset.filter(action__icontains=action_filter)
-        
-        # Filter by date range if specified
-        date_from = self.request.GET.get('date_from')
-        date_to = self.request.GET.get('date_to')
-        if date_from:
-            queryset = queryset.filter(timestamp__date__gte=date_from)
-        if date_to:
-            queryset = queryset.filter(timestamp__date__lte=date_to)
-        
-        return queryset
+        queryset = AdminLog.objects.select_related('admin_user', 'content_type').prefetch_related('content_object')
+        return filter_admin_logs(queryset, self.request.GET)
+
+
+class AdminLogExportView(SuperUserRequiredMixin, AdminLogMixin, View):
+    """Stream the filtered admin logs as CSV or NDJSON"""
+    log_action = 'Exported Admin Logs'
+    
+    def get(self, request, *args, **kwargs):
+        queryset = filter_admin_logs(AdminLog.objects.all(), request.GET).order_by('-timestamp')
+        return streaming_export_response(
+            queryset,
+            ADMIN_LOG_EXPORT_FIELDS,
+            request.GET.get('format', 'csv'),
+            filename=f'admin_logs_{timezone.now().date().isoformat()}'
+        )
 
 
 class DashboardStatsAjaxView(SuperUserRequiredMixin, AjaxResponseMixin, View):
@@ -168,6 +303,7 @@ class ServiceListView(SuperUserRequiredMixin, AdminLogMixin, ListView):
     template_name = 'admin_panel/services/service_list.html'
     context_object_name = 'services'
     paginate_by = 20
+    query_budget = 12
     log_action = 'Viewed Service List'
     
     def get_queryset(self):
@@ -314,40 +450,29 @@ class ServiceBulkActionView(SuperUserRequiredMixin, AdminLogMixin, View):
             service_ids = form.cleaned_data['selected_services']
             new_category = form.cleaned_data.get('new_category')
             
-            services = Service.objects.filter(id__in=service_ids)
-            count = services.count()
-            
             if action == 'activate':
-                services.update(is_active=True)
-                messages.success(request, f'{count} service(s) activated successfully.')
+                result = bulk.update_services(service_ids, is_active=True)
+                messages.success(request, f'{result.count} service(s) activated successfully.')
                 
             elif action == 'deactivate':
-                services.update(is_active=False)
-                messages.success(request, f'{count} service(s) deactivated successfully.')
+                result = bulk.update_services(service_ids, is_active=False)
+                messages.success(request, f'{result.count} service(s) deactivated successfully.')
                 
             elif action == 'delete':
-                # Check for related appointments before deletion
-                from appointments.models import Appointment
-                services_with_appointments = []
-                for service in services:
-                    if Appointment.objects.filter(service=service).exists():
-                        services_with_appointments.append(service.name)
-                
-                if services_with_appointments:
+                result = bulk.delete_services(service_ids)
+                if not result.ok:
                     messages.error(
                         request, 
-                        f'Cannot delete services with existing appointments: {", ".join(services_with_appointments)}'
+                        f'Cannot delete services with existing appointments: {", ".join(result.blocked)}'
                     )
                 else:
-                    service_names = [s.name for s in services]
-                    services.delete()
-                    messages.success(request, f'Deleted services: {", ".join(service_names)}')
+                    messages.success(request, f'Deleted services: {", ".join(result.names)}')
                     
             elif action == 'change_category' and new_category:
-                services.update(category=new_category)
+                result = bulk.update_services(service_ids, category=new_category)
                 messages.success(
                     request, 
-                    f'{count} service(s) moved to category "{new_category.name}" successfully.'
+                    f'{result.count} service(s) moved to category "{new_category.name}" successfully.'
                 )
         else:
             messages.error(request, 'Invalid bulk action request.')
@@ -412,6 +537,7 @@ class CategoryListView(SuperUserRequiredMixin, AdminLogMixin, ListView):
     template_name = 'admin_panel/categories/category_list.html'
     context_object_name = 'categories'
     paginate_by = 20
+    query_budget = 10
     log_action = 'Viewed Category List'
     
     def get_queryset(self):
@@ -556,33 +682,23 @@ class CategoryBulkActionView(SuperUserRequiredMixin, AdminLogMixin, View):
             action = form.cleaned_data['action']
             category_ids = form.cleaned_data['selected_categories']
             
-            categories = ServiceCategory.objects.filter(id__in=category_ids)
-            count = categories.count()
-            
             if action == 'activate':
-                categories.update(is_active=True)
-                messages.success(request, f'{count} category(ies) activated successfully.')
+                result = bulk.update_categories(category_ids, is_active=True)
+                messages.success(request, f'{result.count} category(ies) activated successfully.')
                 
             elif action == 'deactivate':
-                categories.update(is_active=False)
-                messages.success(request, f'{count} category(ies) deactivated successfully.')
+                result = bulk.update_categories(category_ids, is_active=False)
+                messages.success(request, f'{result.count} category(ies) deactivated successfully.')
                 
             elif action == 'delete':
-                # Check for related services before deletion
-                categories_with_services = []
-                for category in categories:
-                    if category.services.exists():
-                        categories_with_services.append(f"{category.name} ({category.services.count()} services)")
-                
-                if categories_with_services:
+                result = bulk.delete_categories(category_ids)
+                if not result.ok:
                     messages.error(
                         request, 
-                        f'Cannot delete categories with services: {", ".join(categories_with_services)}'
+                        f'Cannot delete categories with services: {", ".join(result.blocked)}'
                     )
                 else:
-                    category_names = [c.name for c in categories]
-                    categories.delete()
-                    messages.success(request, f'Deleted categories: {", ".join(category_names)}')
+                    messages.success(request, f'Deleted categories: {", ".join(result.names)}')
         else:
             messages.error(request, 'Invalid bulk action request.')
         
@@ -647,41 +763,29 @@ class ServicePricingView(SuperUserRequiredMixin, AdminLogMixin, TemplateView):
         context = super().get_context_data(**kwargs)
         context['page_title'] = 'Pricing Management'
         
-        # Get service if specified
+        # Get all services for dropdown
+        services = list(Service.objects.filter(is_active=True).select_related('category'))
+        context['services'] = services
+        context['categories'] = ServiceCategory.objects.filter(is_active=True)
+        context['adjustment_rules'] = PRICE_ADJUSTMENT_RULES
+        
+        # Get service if specified ('all' renders every active service)
         service_id = self.request.GET.get('service')
-        if service_id:
+        matrix_services = []
+        if service_id == 'all':
+            context['show_all_services'] = True
+            matrix_services = services
+        elif service_id:
             try:
-                context['selected_service'] = get_object_or_404(Service, pk=int(service_id))
+                service_pk = int(service_id)
+                selected = next((service for service in services if service.pk == service_pk), None)
+                context['selected_service'] = selected or get_object_or_404(Service, pk=service_pk)
+                matrix_services = [context['selected_service']]
             except (ValueError, Service.DoesNotExist):
                 context['selected_service'] = None
         
-        # Get all services for dropdown
-        context['services'] = Service.objects.filter(is_active=True).select_related('category')
-        
-        # Get distinct vehicle types and complexity levels for matrix
-        context['vehicle_types'] = ServicePrice.objects.values_list('vehicle_type', flat=True).distinct().order_by('vehicle_type')
-        context['complexity_levels'] = ServicePrice.objects.values_list('complexity_level', flat=True).distinct().order_by('complexity_level')
-        
-        # Get pricing data for matrix
-        if 'selected_service' in context and context['selected_service']:
-            service = context['selected_service']
-            prices = ServicePrice.objects.filter(service=service)
-            
-            # Create pricing matrix with all prices (active and inactive)
-            pricing_matrix = {}
-            for price in prices:
-                key = f"{price.vehicle_type},{price.complexity_level}"
-                pricing_matrix[key] = {
-                    'id': price.id,
-                    'price': price.price,
-                    'is_active': price.is_active
-                }
-            context['pricing_matrix'] = pricing_matrix
-        
-        # Statistics
-        context['total_prices'] = ServicePrice.objects.count()
-        context['active_prices'] = ServicePrice.objects.filter(is_active=True).count()
-        context['services_with_pricing'] = Service.objects.filter(prices__isnull=False).distinct().count()
+        # Axes, matrices and statistics from a single scan of ServicePrice
+        context.update(build_pricing_matrix(matrix_services))
         
         return context
 
@@ -965,6 +1069,7 @@ class ServicePricesAjaxView(SuperUserRequiredMixin, AjaxResponseMixin, View):
             service = get_object_or_404(Service, pk=service_id)
             
             prices = []
+            # Read the database, not the cached matrix: the editor must see its own writes
             for price in service.prices.all().order_by('vehicle_type', 'complexity_level'):
                 prices.append({
                     'id': price.id,
@@ -1001,6 +1106,9 @@ class BulkPricingUpdateView(SuperUserRequiredMixin, AdminLogMixin, View):
             action = request.POST.get('action')
             service_id = request.POST.get('service_id')
             
+            if action in ('apply_percentage', 'apply_adjustment'):
+                return self.apply_adjustment(request, action)
+            
             if not all([action, service_id]):
                 return JsonResponse({
                     'success': False,
@@ -1017,6 +1125,8 @@ class BulkPricingUpdateView(SuperUserRequiredMixin, AdminLogMixin, View):
             
             if action == 'activate_all':
                 updated = service.prices.update(is_active=True)
+                invalidate_pricing_matrix()
+                invalidate_catalog()
                 return JsonResponse({
                     'success': True,
                     'message': f'Activated {updated} price(s) for {service.name}.'
@@ -1025,9 +1135,10 @@ class BulkPricingUpdateView(SuperUserRequiredMixin, AdminLogMixin, View):
             elif action == 'deactivate_all':
                 # Check for active appointments
                 from appointments.models import Appointment
+                from appointments.notifications import ACTIVE_STATUSES
                 active_appointments = Appointment.objects.filter(
-                    service=service,
-                    status__in=['pending', 'confirmed', 'in_progress']
+                    selected_service=service,
+                    status__in=ACTIVE_STATUSES
                 ).count()
                 
                 if active_appointments > 0:
@@ -1037,6 +1148,8 @@ class BulkPricingUpdateView(SuperUserRequiredMixin, AdminLogMixin, View):
                     }, status=400)
                 
                 updated = service.prices.update(is_active=False)
+                invalidate_pricing_matrix()
+                invalidate_catalog()
                 return JsonResponse({
                     'success': True,
                     'message': f'Deactivated {updated} price(s) for {service.name}.'
@@ -1045,9 +1158,10 @@ class BulkPricingUpdateView(SuperUserRequiredMixin, AdminLogMixin, View):
             elif action == 'delete_all':
                 # Check for active appointments
                 from appointments.models import Appointment
+                from appointments.notifications import ACTIVE_STATUSES
                 active_appointments = Appointment.objects.filter(
-                    service=service,
-                    status__in=['pending', 'confirmed', 'in_progress']
+                    selected_service=service,
+                    status__in=ACTIVE_STATUSES
                 ).count()
                 
                 if active_appointments > 0:
@@ -1063,29 +1177,6 @@ class BulkPricingUpdateView(SuperUserRequiredMixin, AdminLogMixin, View):
                     'message': f'Deleted {deleted_count} price(s) for {service.name}.'
                 })
                 
-            elif action == 'apply_percentage':
-                percentage = request.POST.get('percentage')
-                try:
-                    percentage_value = float(percentage)
-                except (ValueError, TypeError):
-                    return JsonResponse({
-                        'success': False,
-                        'error': 'Invalid percentage value.'
-                    }, status=400)
-                
-                updated_count = 0
-                for price in service.prices.all():
-                    new_price = price.price * (1 + percentage_value / 100)
-                    if new_price > 0:
-                        price.price = round(new_price, 2)
-                        price.save()
-                        updated_count += 1
-                
-                return JsonResponse({
-                    'success': True,
-                    'message': f'Applied {percentage}% change to {updated_count} price(s) for {service.name}.'
-                })
-            
             else:
                 return JsonResponse({
                     'success': False,
@@ -1097,6 +1188,121 @@ class BulkPricingUpdateView(SuperUserRequiredMixin, AdminLogMixin, View):
                 'success': False,
                 'error': f'An error occurred: {str(e)}'
             }, status=500)
+    
+    def apply_adjustment(self, request, action):
+        """Apply a percentage/absolute/rounding rule to many services or categories at once"""
+        if action == 'apply_percentage':
+            rule, raw_value = 'percentage', request.POST.get('percentage')
+        else:
+            rule, raw_value = request.POST.get('rule'), request.POST.get('value')
+        
+        try:
+            value = Decimal(raw_value)
+            if not value.is_finite():
+                raise InvalidOperation
+        except (InvalidOperation, TypeError):
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid adjustment value.'
+            }, status=400)
+        
+        error = validate_price_adjustment(rule, value)
+        if error:
+            return JsonResponse({'success': False, 'error': error}, status=400)
+        
+        try:
+            service_ids = [int(pk) for pk in request.POST.getlist('service_ids') if pk]
+            category_ids = [int(pk) for pk in request.POST.getlist('category_ids') if pk]
+            if request.POST.get('service_id'):
+                service_ids.append(int(request.POST['service_id']))
+        except ValueError:
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid service or category.'
+            }, status=400)
+        
+        if not (service_ids or category_ids):
+            return JsonResponse({
+                'success': False,
+                'error': 'Select at least one service or category.'
+            }, status=400)
+        
+        dry_run = request.POST.get('dry_run') in ('1', 'true', 'on')
+        result = apply_price_adjustment(
+            adjustable_prices(
+                service_ids=service_ids,
+                category_ids=category_ids,
+                active_only=request.POST.get('active_only') in ('1', 'true', 'on')
+            ),
+            rule,
+            value,
+            dry_run=dry_run
+        )
+        
+        verb = 'Would update' if dry_run else 'Updated'
+        message = f'{verb} {result["updated"]} of {result["matched"]} price(s).'
+        if result['skipped']:
+            message += f' {result["skipped"]} price(s) skipped because the new price would be out of range.'
+        
+        return JsonResponse({
+            'success': True,
+            'message': message,
+            'dry_run': dry_run,
+            'matched': result['matched'],
+            'updated': result['updated'],
+            'skipped': result['skipped'],
+            'current_total': str(result['current_total']),
+            'new_total': str(result['new_total']),
+            'preview': [
+                {
+                    'id': row['id'],
+                    'service': row['service__name'],
+                    'vehicle_type': row['vehicle_type'],
+                    'complexity_level': row['complexity_level'],
+                    'price': str(row['price']),
+                    'new_price': str(row['new_price']),
+                }
+                for row in result['preview']
+            ],
+        })
+
+
+class PriceImportView(SuperUserRequiredMixin, AdminLogMixin, View):
+    """Import service prices from a CSV file"""
+    log_action = 'Imported Service Prices'
+    
+    def post(self, request, *args, **kwargs):
+        """Handle AJAX CSV import and return a per-row report"""
+        form = PriceImportForm(request.POST, request.FILES)
+        
+        if not form.is_valid():
+            errors = [error for field_errors in form.errors.values() for error in field_errors]
+            return JsonResponse({
+                'success': False,
+                'error': ' '.join(errors) or 'Invalid import file.'
+            }, status=400)
+        
+        try:
+            report = import_prices_from_csv(
+                form.cleaned_data['csv_file'],
+                overwrite_existing=form.cleaned_data['overwrite_existing']
+            )
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': f'An error occurred: {str(e)}'
+            }, status=500)
+        
+        message = (
+            f"Imported {report['rows']} row(s): {report['created']} created, "
+            f"{report['updated']} updated, {report['skipped']} skipped, "
+            f"{report['error_count']} with errors."
+        )
+        return JsonResponse({
+            'success': True,
+            'message': message,
+            'report': report
+        })
 
 
 # Employee Management Views
@@ -1107,6 +1313,7 @@ class EmployeeListView(SuperUserRequiredMixin, AdminLogMixin, ListView):
     template_name = 'admin_panel/employees/employee_list.html'
     context_object_name = 'employees'
     paginate_by = 20
+    query_budget = 10
     log_action = 'Viewed Employee List'
     
     def get_queryset(self):
@@ -1122,14 +1329,7 @@ class EmployeeListView(SuperUserRequiredMixin, AdminLogMixin, ListView):
         
         # Apply search filter
         if search_query:
-            queryset = queryset.filter(
-                Q(user__first_name__icontains=search_query) |
-                Q(user__last_name__icontains=search_query) |
-                Q(user__username__icontains=search_query) |
-                Q(user__email__icontains=search_query) |
-                Q(employee_id__icontains=search_query) |
-                Q(specialization__icontains=search_query)
-            )
+            queryset = search_queryset(queryset, 'employees', search_query, ranked=False)
         
         # Apply status filter
         if status == 'active':
@@ -1384,43 +1584,26 @@ class EmployeeBulkActionView(SuperUserRequiredMixin, AdminLogMixin, View):
             employee_ids = form.cleaned_data['selected_employees']
             new_specialization = form.cleaned_data.get('new_specialization')
             
-            employees = Employee.objects.filter(id__in=employee_ids)
-            count = employees.count()
-            
             if action == 'activate':
-                employees.update(is_active=True)
-                # Also activate user accounts
-                User.objects.filter(employee_profile__in=employees).update(is_active=True)
-                messages.success(request, f'{count} employee(s) activated successfully.')
+                # Also activates the user accounts
+                result = bulk.set_employees_active(employee_ids, True)
+                messages.success(request, f'{result.count} employee(s) activated successfully.')
                 
             elif action == 'deactivate':
-                # Check for pending appointments
-                from appointments.models import Appointment
-                employees_with_appointments = []
-                for employee in employees:
-                    pending_count = Appointment.objects.filter(
-                        employee=employee,
-                        status__in=['pending', 'confirmed']
-                    ).count()
-                    if pending_count > 0:
-                        employees_with_appointments.append(f"{employee.user.get_full_name()} ({pending_count} appointments)")
-                
-                if employees_with_appointments:
+                result = bulk.set_employees_active(employee_ids, False)
+                if not result.ok:
                     messages.warning(
                         request, 
-                        f'Cannot deactivate employees with pending appointments: {", ".join(employees_with_appointments)}'
+                        f'Cannot deactivate employees with active appointments: {", ".join(result.blocked)}'
                     )
                 else:
-                    employees.update(is_active=False)
-                    # Also deactivate user accounts
-                    User.objects.filter(employee_profile__in=employees).update(is_active=False)
-                    messages.success(request, f'{count} employee(s) deactivated successfully.')
+                    messages.success(request, f'{result.count} employee(s) deactivated successfully.')
                     
             elif action == 'change_specialization' and new_specialization:
-                employees.update(specialization=new_specialization)
+                result = bulk.update_employees(employee_ids, specialization=new_specialization)
                 messages.success(
                     request, 
-                    f'{count} employee(s) specialization updated to "{new_specialization}" successfully.'
+                    f'{result.count} employee(s) specialization updated to "{new_specialization}" successfully.'
                 )
         else:
             messages.error(request, 'Invalid bulk action request.')
@@ -1486,6 +1669,7 @@ class SystemSettingsListView(SuperUserRequiredMixin, AdminLogMixin, ListView):
     template_name = 'admin_panel/settings/settings_list.html'
     context_object_name = 'settings'
     paginate_by = 20
+    query_budget = 10
     log_action = 'Viewed System Settings'
     
     def get_queryset(self):
@@ -2177,184 +2361,141 @@ class SettingsResetView(SuperUserRequiredMixin, AdminLogMixin, View):
 
 # Additional AJAX Endpoints for Enhanced Functionality
 
-class ServiceSearchAjaxView(SuperUserRequiredMixin, AjaxResponseMixin, View):
+class ServiceSearchAjaxView(SuperUserRequiredMixin, AjaxResponseMixin, TypeaheadMixin, View):
     """AJAX endpoint for service search and filtering"""
+    results_key = 'services'
+    filter_params = ('category', 'status')
+    data_version = CATALOG_VERSION
     
-    def get(self, request, *args, **kwargs):
-        """Return filtered services as JSON"""
-        try:
-            search_query = request.GET.get('q', '').strip()
-            category_id = request.GET.get('category', '').strip()
-            status = request.GET.get('status', '').strip()
-            limit = int(request.GET.get('limit', 10))
-            
-            queryset = Service.objects.select_related('category')
-            
-            # Apply search filter
-            if search_query:
-                queryset = queryset.filter(
-                    Q(name__icontains=search_query) |
-                    Q(description__icontains=search_query) |
-                    Q(category__name__icontains=search_query)
-                )
-            
-            # Apply category filter
-            if category_id:
-                try:
-                    queryset = queryset.filter(category_id=int(category_id))
-                except ValueError:
-                    pass
-            
-            # Apply status filter
-            if status == 'active':
-                queryset = queryset.filter(is_active=True)
-            elif status == 'inactive':
-                queryset = queryset.filter(is_active=False)
-            
-            # Limit results
-            services = queryset[:limit]
-            
-            results = []
-            for service in services:
-                results.append({
-                    'id': service.id,
-                    'name': service.name,
-                    'category': service.category.name,
-                    'base_price': str(service.base_price),
-                    'is_active': service.is_active,
-                    'image_url': service.image.url if service.image else None
-                })
-            
-            return JsonResponse({
-                'success': True,
-                'services': results,
-                'total': queryset.count()
-            })
-            
-        except Exception as e:
-            return JsonResponse({
-                'success': False,
-                'error': str(e)
-            }, status=500)
+    def get_typeahead_queryset(self, query, filters):
+        """Filtered services, best match first"""
+        queryset = Service.objects.select_related('category')
+        
+        # Apply category filter
+        if filters['category']:
+            try:
+                queryset = queryset.filter(category_id=int(filters['category']))
+            except ValueError:
+                pass
+        
+        # Apply status filter
+        if filters['status'] == 'active':
+            queryset = queryset.filter(is_active=True)
+        elif filters['status'] == 'inactive':
+            queryset = queryset.filter(is_active=False)
+        
+        # Search last, so the filters also apply to the ranked candidates
+        if query:
+            queryset = search_queryset(queryset, 'services', query)
+        
+        return queryset
+    
+    def serialize_result(self, service):
+        return {
+            'id': service.id,
+            'name': service.name,
+            'category': service.category.name,
+            'base_price': str(service.base_price),
+            'is_active': service.is_active,
+            'image_url': service.image.url if service.image else None
+        }
+    
+    def get_search_text(self, service):
+        return f'{service.name} {service.category.name} {service.description}'
 
 
-class CategorySearchAjaxView(SuperUserRequiredMixin, AjaxResponseMixin, View):
+class CategorySearchAjaxView(SuperUserRequiredMixin, AjaxResponseMixin, TypeaheadMixin, View):
     """AJAX endpoint for category search and filtering"""
+    results_key = 'categories'
+    filter_params = ('status',)
+    data_version = CATALOG_VERSION
     
-    def get(self, request, *args, **kwargs):
-        """Return filtered categories as JSON"""
-        try:
-            search_query = request.GET.get('q', '').strip()
-            status = request.GET.get('status', '').strip()
-            limit = int(request.GET.get('limit', 10))
-            
-            queryset = ServiceCategory.objects.annotate(service_count=Count('services'))
-            
-            # Apply search filter
-            if search_query:
-                queryset = queryset.filter(
-                    Q(name__icontains=search_query) |
-                    Q(description__icontains=search_query)
-                )
-            
-            # Apply status filter
-            if status == 'active':
-                queryset = queryset.filter(is_active=True)
-            elif status == 'inactive':
-                queryset = queryset.filter(is_active=False)
-            
-            # Limit results
-            categories = queryset[:limit]
-            
-            results = []
-            for category in categories:
-                results.append({
-                    'id': category.id,
-                    'name': category.name,
-                    'description': category.description,
-                    'icon': category.icon,
-                    'is_active': category.is_active,
-                    'service_count': category.service_count
-                })
-            
-            return JsonResponse({
-                'success': True,
-                'categories': results,
-                'total': queryset.count()
-            })
-            
-        except Exception as e:
-            return JsonResponse({
-                'success': False,
-                'error': str(e)
-            }, status=500)
+    def get_typeahead_queryset(self, query, filters):
+        """Filtered categories with their service counts"""
+        queryset = ServiceCategory.objects.annotate(service_count=Count('services'))
+        
+        # Apply search filter
+        if query:
+            queryset = queryset.filter(
+                Q(name__icontains=query) |
+                Q(description__icontains=query)
+            )
+        
+        # Apply status filter
+        if filters['status'] == 'active':
+            queryset = queryset.filter(is_active=True)
+        elif filters['status'] == 'inactive':
+            queryset = queryset.filter(is_active=False)
+        
+        return queryset
+    
+    def matches_query(self, text, query):
+        """Categories match on substrings, like the icontains filter above"""
+        return query in text
+    
+    def serialize_result(self, category):
+        return {
+            'id': category.id,
+            'name': category.name,
+            'description': category.description,
+            'icon': category.icon,
+            'is_active': category.is_active,
+            'service_count': category.service_count
+        }
+    
+    def get_search_text(self, category):
+        # Kept separate so a query never matches across the name/description boundary
+        return f'{category.name}\n{category.description}'
 
 
-class EmployeeSearchAjaxView(SuperUserRequiredMixin, AjaxResponseMixin, View):
+class EmployeeSearchAjaxView(SuperUserRequiredMixin, AjaxResponseMixin, TypeaheadMixin, View):
     """AJAX endpoint for employee search and filtering"""
+    results_key = 'employees'
+    filter_params = ('status', 'specialization')
     
-    def get(self, request, *args, **kwargs):
-        """Return filtered employees as JSON"""
-        try:
-            search_query = request.GET.get('q', '').strip()
-            status = request.GET.get('status', '').strip()
-            specialization = request.GET.get('specialization', '').strip()
-            limit = int(request.GET.get('limit', 10))
-            
-            queryset = Employee.objects.select_related('user')
-            
-            # Apply search filter
-            if search_query:
-                queryset = queryset.filter(
-                    Q(user__first_name__icontains=search_query) |
-                    Q(user__last_name__icontains=search_query) |
-                    Q(user__username__icontains=search_query) |
-                    Q(user__email__icontains=search_query) |
-                    Q(employee_id__icontains=search_query) |
-                    Q(specialization__icontains=search_query)
-                )
-            
-            # Apply status filter
-            if status == 'active':
-                queryset = queryset.filter(is_active=True)
-            elif status == 'inactive':
-                queryset = queryset.filter(is_active=False)
-            
-            # Apply specialization filter
-            if specialization:
-                queryset = queryset.filter(specialization__icontains=specialization)
-            
-            # Limit results
-            employees = queryset[:limit]
-            
-            results = []
-            for employee in employees:
-                results.append({
-                    'id': employee.id,
-                    'employee_id': employee.employee_id,
-                    'name': employee.user.get_full_name(),
-                    'email': employee.user.email,
-                    'specialization': employee.specialization,
-                    'is_active': employee.is_active,
-                    'hire_date': employee.hire_date.isoformat() if employee.hire_date else None
-                })
-            
-            return JsonResponse({
-                'success': True,
-                'employees': results,
-                'total': queryset.count()
-            })
-            
-        except Exception as e:
-            return JsonResponse({
-                'success': False,
-                'error': str(e)
-            }, status=500)
+    def get_typeahead_queryset(self, query, filters):
+        """Filtered employees, best match first"""
+        queryset = Employee.objects.select_related('user')
+        
+        # Apply status filter
+        if filters['status'] == 'active':
+            queryset = queryset.filter(is_active=True)
+        elif filters['status'] == 'inactive':
+            queryset = queryset.filter(is_active=False)
+        
+        # Apply specialization filter
+        if filters['specialization']:
+            queryset = queryset.filter(specialization__icontains=filters['specialization'])
+        
+        # Search last, so the filters also apply to the ranked candidates
+        if query:
+            queryset = search_queryset(queryset, 'employees', query)
+        
+        return queryset
+    
+    def serialize_result(self, employee):
+        return {
+            'id': employee.id,
+            'employee_id': employee.employee_id,
+            'name': employee.user.get_full_name(),
+            'email': employee.user.email,
+            'specialization': employee.specialization,
+            'is_active': employee.is_active,
+            'hire_date': employee.hire_date.isoformat() if employee.hire_date else None
+        }
+    
+    def get_search_text(self, employee):
+        user = employee.user
+        return ' '.join([
+            user.first_name, user.last_name, user.username, user.email,
+            employee.employee_id, employee.specialization
+        ])
 
 
 class DashboardChartsAjaxView(SuperUserRequiredMixin, AjaxResponseMixin, View):
     """AJAX endpoint for dashboard chart data"""
     
+    @method_decorator(reporting_database())
     def get(self, request, *args, **kwargs):
         """Return chart data as JSON"""
         try:
@@ -2390,19 +2531,17 @@ class DashboardChartsAjaxView(SuperUserRequiredMixin, AjaxResponseMixin, View):
         
         # Get daily appointment counts
         appointments = Appointment.objects.filter(
-            appointment_date__range=[start_date, end_date]
-        ).extra(
-            select={'day': 'date(appointment_date)'}
-        ).values('day').annotate(
+            slot_date__range=[start_date, end_date]
+        ).values('slot_date').annotate(
             count=Count('id')
-        ).order_by('day')
+        ).order_by('slot_date')
         
         labels = []
         data = []
         
         # Fill in missing days with 0
         current_date = start_date
-        appointment_dict = {item['day']: item['count'] for item in appointments}
+        appointment_dict = {item['slot_date']: item['count'] for item in appointments}
         
         while current_date <= end_date:
             labels.append(current_date.strftime('%Y-%m-%d'))
@@ -2427,22 +2566,20 @@ class DashboardChartsAjaxView(SuperUserRequiredMixin, AjaxResponseMixin, View):
         """Get revenue trend data"""
         from appointments.models import Appointment
         
-        # Get daily revenue (assuming appointments have a price field)
+        # Get daily revenue from the price quoted at booking time
         revenue_data = Appointment.objects.filter(
-            appointment_date__range=[start_date, end_date],
+            slot_date__range=[start_date, end_date],
             status='completed'
-        ).extra(
-            select={'day': 'date(appointment_date)'}
-        ).values('day').annotate(
-            revenue=Sum('service__base_price')
-        ).order_by('day')
+        ).values('slot_date').annotate(
+            revenue=Sum('quoted_price')
+        ).order_by('slot_date')
         
         labels = []
         data = []
         
         # Fill in missing days with 0
         current_date = start_date
-        revenue_dict = {item['day']: float(item['revenue'] or 0) for item in revenue_data}
+        revenue_dict = {item['slot_date']: float(item['revenue'] or 0) for item in revenue_data}
         
         while current_date <= end_date:
             labels.append(current_date.strftime('%Y-%m-%d'))
@@ -2469,14 +2606,14 @@ class DashboardChartsAjaxView(SuperUserRequiredMixin, AjaxResponseMixin, View):
         
         # Get most popular services
         service_data = Appointment.objects.filter(
-            appointment_date__range=[start_date, end_date]
+            slot_date__range=[start_date, end_date]
         ).values(
-            'service__name'
+            'selected_service__name'
         ).annotate(
             count=Count('id')
         ).order_by('-count')[:10]
         
-        labels = [item['service__name'] for item in service_data]
+        labels = [item['selected_service__name'] for item in service_data]
         data = [item['count'] for item in service_data]
         
         return JsonResponse({
@@ -2502,16 +2639,16 @@ class DashboardChartsAjaxView(SuperUserRequiredMixin, AjaxResponseMixin, View):
         start_date = timezone.now().replace(day=1).date()
         
         employee_data = Appointment.objects.filter(
-            appointment_date__gte=start_date,
+            slot_date__gte=start_date,
             assigned_employee__isnull=False
         ).values(
-            'assigned_employee__user__first_name',
-            'assigned_employee__user__last_name'
+            'assigned_employee__first_name',
+            'assigned_employee__last_name'
         ).annotate(
             count=Count('id')
         ).order_by('-count')[:10]
         
-        labels = [f"{item['assigned_employee__user__first_name']} {item['assigned_employee__user__last_name']}" 
+        labels = [f"{item['assigned_employee__first_name']} {item['assigned_employee__last_name']}" 
                  for item in employee_data]
         data = [item['count'] for item in employee_data]
         
@@ -2528,51 +2665,15 @@ class DashboardChartsAjaxView(SuperUserRequiredMixin, AjaxResponseMixin, View):
         })
 
 
-class QuickStatsAjaxView(SuperUserRequiredMixin, AjaxResponseMixin, View):
-    """AJAX endpoint for quick statistics updates"""
+class QuickStatsAjaxView(AsyncSuperUserRequiredMixin, View):
+    """AJAX endpoint for quick statistics updates (async: polled by every open dashboard)"""
     
-    def get(self, request, *args, **kwargs):
+    async def get(self, request, *args, **kwargs):
         """Return quick stats as JSON"""
         try:
-            from appointments.models import Appointment
-            
-            today = timezone.now().date()
-            
-            # Today's stats
-            today_appointments = Appointment.objects.filter(appointment_date=today).count()
-            pending_appointments = Appointment.objects.filter(status='pending').count()
-            
-            # This month's stats
-            month_start = today.replace(day=1)
-            month_appointments = Appointment.objects.filter(
-                appointment_date__gte=month_start
-            ).count()
-            
-            # Revenue stats
-            month_revenue = Appointment.objects.filter(
-                appointment_date__gte=month_start,
-                status='completed'
-            ).aggregate(
-                total=Sum('service__base_price')
-            )['total'] or 0
-            
-            # Active counts
-            active_services = Service.objects.filter(is_active=True).count()
-            active_employees = Employee.objects.filter(is_active=True).count()
-            active_categories = ServiceCategory.objects.filter(is_active=True).count()
-            
             return JsonResponse({
                 'success': True,
-                'stats': {
-                    'today_appointments': today_appointments,
-                    'pending_appointments': pending_appointments,
-                    'month_appointments': month_appointments,
-                    'month_revenue': float(month_revenue),
-                    'active_services': active_services,
-                    'active_employees': active_employees,
-                    'active_categories': active_categories,
-                    'last_updated': timezone.now().isoformat()
-                }
+                'stats': await aget_quick_stats()
             })
             
         except Exception as e:
@@ -2686,55 +2787,40 @@ class FormValidationAjaxView(SuperUserRequiredMixin, AjaxResponseMixin, View):
         return {'valid': True, 'message': 'Field is valid'}
 
 
-class NotificationAjaxView(SuperUserRequiredMixin, AjaxResponseMixin, View):
-    """AJAX endpoint for real-time notifications"""
+def _notification_cursor(value):
+    """``since`` cursor from a request value; None when absent, ValueError when malformed"""
+    if value in (None, ''):
+        return None
+    cursor = int(value)
+    if cursor < 0:
+        raise ValueError(value)
+    return cursor
+
+
+class NotificationAjaxView(AsyncSuperUserRequiredMixin, View):
+    """
+    AJAX endpoint for real-time notifications (async: polled by every open admin page)
     
-    def get(self, request, *args, **kwargs):
+    Pass the ``cursor`` of the previous response as ``since`` to get only the
+    events that happened after it.
+    """
+    
+    async def get(self, request, *args, **kwargs):
         """Get recent notifications"""
         try:
-            from appointments.models import Appointment
-            
-            # Get recent activities (last 24 hours)
-            yesterday = timezone.now() - timedelta(hours=24)
-            
-            notifications = []
-            
-            # New appointments
-            new_appointments = Appointment.objects.filter(
-                created_at__gte=yesterday,
-                status='pending'
-            ).select_related('service', 'customer').order_by('-created_at')[:5]
-            
-            for appointment in new_appointments:
-                notifications.append({
-                    'type': 'new_appointment',
-                    'title': 'New Appointment',
-                    'message': f'{appointment.customer.get_full_name()} booked {appointment.service.name}',
-                    'timestamp': appointment.created_at.isoformat(),
-                    'url': f'/admin/appointments/{appointment.id}/'
-                })
-            
-            # Recent cancellations
-            cancelled_appointments = Appointment.objects.filter(
-                updated_at__gte=yesterday,
-                status='cancelled'
-            ).select_related('service', 'customer').order_by('-updated_at')[:3]
-            
-            for appointment in cancelled_appointments:
-                notifications.append({
-                    'type': 'cancellation',
-                    'title': 'Appointment Cancelled',
-                    'message': f'{appointment.customer.get_full_name()} cancelled {appointment.service.name}',
-                    'timestamp': appointment.updated_at.isoformat(),
-                    'url': f'/admin/appointments/{appointment.id}/'
-                })
-            
-            # Sort by timestamp
-            notifications.sort(key=lambda x: x['timestamp'], reverse=True)
-            
+            since = _notification_cursor(request.GET.get('since'))
+        except ValueError:
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid since cursor'
+            }, status=400)
+        
+        try:
+            notifications, cursor = await aget_notifications(since=since)
             return JsonResponse({
                 'success': True,
-                'notifications': notifications[:10],  # Limit to 10 most recent
+                'notifications': notifications,
+                'cursor': cursor,
                 'unread_count': len(notifications)
             })
             
@@ -2742,4 +2828,49 @@ class NotificationAjaxView(SuperUserRequiredMixin, AjaxResponseMixin, View):
             return JsonResponse({
                 'success': False,
                 'error': str(e)
-            }, status=500)
\ No newline at end of file
+            }, status=500)
+
+
+class DashboardStreamView(AsyncSuperUserRequiredMixin, View):
+    """
+    Server-Sent Events stream replacing the quick stats and notification polling
+    
+    Sends the full ``stats`` and the recent ``notifications`` on connect; after
+    each committed appointment change only the stats that changed, and the
+    notifications logged since. Notification events carry the event log cursor
+    as their SSE id, so a reconnecting browser (Last-Event-ID) only gets what it
+    missed.
+    """
+    
+    async def get(self, request, *args, **kwargs):
+        try:
+            state = {'cursor': _notification_cursor(request.headers.get('Last-Event-ID'))}
+        except ValueError:
+            state = {'cursor': None}
+        
+        async def notification_messages():
+            notifications, state['cursor'] = await aget_notifications(since=state['cursor'])
+            if not notifications:
+                return []
+            data = {'notifications': notifications, 'cursor': state['cursor'], 'unread_count': len(notifications)}
+            return [('notifications', data, state['cursor'])]
+        
+        async def snapshot():
+            state['stats'] = await aget_quick_stats()
+            return [('stats', state['stats'])] + await notification_messages()
+        
+        async def refresh(events):
+            # Read the primary: the replica may not have the change yet
+            stats = await aget_quick_stats(from_replica=False)
+            messages = []
+            delta = {
+                key: value for key, value in stats.items()
+                if key != 'last_updated' and state['stats'].get(key) != value
+            }
+            if delta:
+                delta['last_updated'] = stats['last_updated']
+                messages.append(('stats', delta))
+            state['stats'] = stats
+            return messages + await notification_messages()
+        
+        return await event_stream_response(request, 'dashboard', snapshot, refresh)
@@ -0,0 +1,198 @@
+"""
+In-process pub/sub of appointment changes for Server-Sent Events
+
+Appointment signals publish an event after every committed save or delete;
+each open SSE stream holds a ``Subscription`` whose asyncio queue lives on
+the event loop serving it. Publishing is thread-safe, so events raised in
+the ORM worker threads reach the streams through ``call_soon_threadsafe``.
+
+Events only reach streams in the same process, and changes made with
+``QuerySet.update()`` bypass the signals and are not published, so every
+stream also re-checks its state after each quiet keepalive interval: other
+workers' changes arrive within ``SSE_KEEPALIVE_SECONDS`` instead of at the
+next reconnect.
+
+``event_stream_response()`` turns a snapshot/refresh pair of coroutines into
+an SSE response. Long-lived streams need an ASGI server; under WSGI the
+response carries the snapshot only and the browser reconnects after
+``SSE_FALLBACK_RETRY_MS`` (two minutes, the interval the admin dashboard
+used to poll at), which degrades to polling.
+"""
+import asyncio
+import json
+import threading
+from contextlib import contextmanager
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.http import HttpResponse, StreamingHttpResponse
+
+from monitoring.metrics import Counter
+
+SUBSCRIPTION_QUEUE_SIZE = 256
+
+SSE_STREAMS = Counter('carmodx_sse_streams_total', 'Server-Sent Events streams opened by stream', ['stream'])
+
+
+class Subscription:
+    """One stream's queue of events"""
+
+    def __init__(self, loop, max_size=SUBSCRIPTION_QUEUE_SIZE):
+        self.loop = loop
+        self.queue = asyncio.Queue(max_size)
+        # Set when events were dropped; the stream must resynchronise its state
+        self.overflowed = False
+
+    def push(self, event):
+        """Queue an event from any thread"""
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            pass  # the stream's event loop is already closed
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get_batch(self, timeout, settle=0.25):
+        """
+        Wait up to ``timeout`` seconds for events, then collect whatever else
+        arrives within ``settle`` seconds, so a burst is handled at once
+
+        Returns:
+            List of events, empty on timeout
+        """
+        try:
+            events = [await asyncio.wait_for(self.queue.get(), timeout)]
+        except asyncio.TimeoutError:
+            return []
+        await asyncio.sleep(settle)
+        while not self.queue.empty():
+            events.append(self.queue.get_nowait())
+        return events
+
+    def clear(self):
+        """Drop the queued events and the overflow flag, after resynchronising from a snapshot"""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.overflowed = False
+
+
+class EventBroker:
+    """Fan events out to every current subscription"""
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+    def publish(self, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.push(event)
+
+    @contextmanager
+    def subscribe(self):
+        """Subscribe for the duration of the block; call from the event loop that reads the events"""
+        subscription = Subscription(asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                self._subscriptions.discard(subscription)
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscriptions)
+
+
+broker = EventBroker()
+
+
+def appointment_event(appointment, action):
+    """Event payload for a saved or deleted appointment"""
+    return {
+        'type': 'appointment',
+        'action': action,
+        'id': appointment.pk,
+        'slot_date': str(appointment.slot_date),
+        'slot_time': appointment.slot_time,
+        'status': appointment.status,
+    }
+
+
+def sse_message(event, data, event_id=None):
+    """One SSE message; ``event_id`` is sent back by a reconnecting browser as Last-Event-ID"""
+    message = f'event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n'
+    if event_id is not None:
+        message += f'id: {event_id}\n'
+    return message + '\n'
+
+
+async def _release_connections():
+    # A stream lives for minutes; don't hold a database connection between updates
+    await sync_to_async(connections.close_all)()
+
+
+async def event_stream(snapshot, refresh):
+    """
+    Body of an SSE response
+
+    ``snapshot()`` returns the messages describing the current state; it is
+    sent first, and again whenever the subscription dropped events.
+    ``refresh(events)`` returns the messages for a batch of appointment
+    events, or for ``events=None`` after a quiet keepalive interval, when
+    changes may have been made that this process was never told about. Both
+    are coroutines returning lists of ``(event, data)`` or
+    ``(event, data, event_id)`` tuples.
+    """
+    max_seconds = getattr(settings, 'SSE_MAX_STREAM_SECONDS', 300)
+    keepalive_seconds = getattr(settings, 'SSE_KEEPALIVE_SECONDS', 15)
+
+    # Subscribe before reading the snapshot so no change falls in between
+    with broker.subscribe() as subscription:
+        yield f'retry: {getattr(settings, "SSE_RETRY_MS", 3000)}\n\n'
+        for message in await snapshot():
+            yield sse_message(*message)
+        await _release_connections()
+
+        # Streams end after max_seconds (the browser reconnects), which
+        # also bounds streams whose client went away without a disconnect
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_seconds
+        while (remaining := deadline - loop.time()) > 0:
+            events = await subscription.get_batch(min(keepalive_seconds, remaining))
+            if subscription.overflowed:
+                subscription.clear()
+                messages = await snapshot()
+            else:
+                messages = await refresh(events or None)
+            await _release_connections()
+            if not messages:
+                yield ': keepalive\n\n'
+            for message in messages:
+                yield sse_message(*message)
+
+
+async def event_stream_response(request, name, snapshot, refresh):
+    """SSE response serving ``event_stream()``, or just the snapshot outside ASGI"""
+    SSE_STREAMS.inc(stream=name)
+    if isinstance(request, ASGIRequest):
+        response = StreamingHttpResponse(event_stream(snapshot, refresh), content_type='text/event-stream')
+    else:
+        # A WSGI worker can't be held by a stream: send the current state and
+        # let the browser reconnect later, which amounts to polling
+        body = f'retry: {getattr(settings, "SSE_FALLBACK_RETRY_MS", 120000)}\n\n'
+        body += ''.join(sse_message(*message) for message in await snapshot())
+        response = HttpResponse(body, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
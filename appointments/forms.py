@@ -4,6 +4,7 @@ from django.utils import timezone
 from datetime import date, timedelta
 from .models import Appointment
 from services.models import Service
+from search.backends import search_queryset
 
 
 class AppointmentBookingForm(forms.ModelForm):
@@ -120,3 +121,27 @@ class AppointmentSearchForm(forms.Form):
         required=False,
         widget=forms.DateInput(attrs={'type': 'date', 'class': 'form-control'})
     )
+    
+    def filter_queryset(self, queryset):
+        """Apply the submitted search and filters to an appointment queryset"""
+        if not self.is_valid():
+            return queryset
+        
+        search = self.cleaned_data.get('search')
+        status = self.cleaned_data.get('status')
+        date_from = self.cleaned_data.get('date_from')
+        date_to = self.cleaned_data.get('date_to')
+        
+        if search:
+            queryset = search_queryset(queryset, 'appointments', search, ranked=False)
+        
+        if status:
+            queryset = queryset.filter(status=status)
+        
+        if date_from:
+            queryset = queryset.filter(slot_date__gte=date_from)
+        
+        if date_to:
+            queryset = queryset.filter(slot_date__lte=date_to)
+        
+        return queryset
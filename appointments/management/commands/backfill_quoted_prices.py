@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from appointments.models import Appointment
+from services.pricing import get_pricing_matrix
+
+
+class Command(BaseCommand):
+    help = 'Fill in quoted_price for appointments booked before prices were captured'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many appointments are missing a quoted price'
+        )
+
+    def handle(self, *args, **options):
+        missing = Appointment.objects.filter(quoted_price__isnull=True)
+        service_ids = list(
+            missing.order_by().values_list('selected_service_id', flat=True).distinct()
+        )
+
+        if options['dry_run']:
+            self.stdout.write(
+                f'{missing.count()} appointment(s) across {len(service_ids)} service(s) need a quoted price'
+            )
+            return
+
+        # One UPDATE per service: every appointment of a service gets the same price
+        matrix = get_pricing_matrix()
+        updated = 0
+        with transaction.atomic():
+            for service_id in service_ids:
+                updated += missing.filter(selected_service_id=service_id).update(
+                    quoted_price=matrix.resolve(service_id)
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully backfilled quoted prices for {updated} appointment(s)')
+        )
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+from admin_panel.utils import get_system_settings, setting_is_enabled
+from appointments.notifications import REMINDER_SETTING_DEFAULTS, send_appointment_reminders
+
+
+class Command(BaseCommand):
+    help = 'Send reminder emails for appointments entering the reminder window (run every few minutes)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=int,
+            help='Reminder window in hours (default: the reminder_hours_before setting)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of reminders sent and marked per batch (default: 500)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many reminders are due'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Send even if reminder or email notifications are disabled in settings'
+        )
+
+    def handle(self, *args, **options):
+        settings = get_system_settings(REMINDER_SETTING_DEFAULTS)
+
+        if not options['force'] and not (
+            setting_is_enabled(settings['send_reminder_notifications'])
+            and setting_is_enabled(settings['email_notifications_enabled'])
+        ):
+            self.stdout.write(
+                self.style.WARNING('Reminder notifications are disabled in system settings. Nothing sent.')
+            )
+            return
+
+        hours_before = options['hours']
+        if hours_before is None:
+            try:
+                hours_before = int(settings['reminder_hours_before'])
+            except ValueError:
+                hours_before = int(REMINDER_SETTING_DEFAULTS['reminder_hours_before'])
+
+        count = send_appointment_reminders(
+            hours_before=hours_before,
+            from_email=settings['from_email'],
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f'{count} reminder(s) due in the next {hours_before} hours')
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f'Successfully sent {count} appointment reminder(s)')
+            )
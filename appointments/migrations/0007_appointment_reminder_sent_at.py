@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0006_alter_appointment_status_delete_taskassignment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='appointment',
+            name='reminder_sent_at',
+            field=models.DateTimeField(blank=True, help_text='When the appointment reminder was sent', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='appointment',
+            index=models.Index(fields=['slot_date', 'slot_time'], name='appointment_slot_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:30
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0007_appointment_reminder_sent_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='appointment',
+            name='quoted_price',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Price quoted from the pricing matrix when the appointment was booked', max_digits=10, null=True, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+    ]
@@ -1,10 +1,11 @@
-from django.db import models
+from django.db import models, router, transaction
 from django.core.validators import MinValueValidator
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from datetime import datetime, time, date
 from accounts.models import User
 from services.models import Service
+from services.pricing import resolve_price
 
 
 class Appointment(models.Model):
@@ -57,11 +58,24 @@ class Appointment(models.Model):
     vehicle_year = models.PositiveIntegerField()
     vehicle_license = models.CharField(max_length=20)
     
+    # Pricing
+    quoted_price = models.DecimalField(
+        max_digits=10, 
+        decimal_places=2, 
+        null=True, 
+        blank=True,
+        validators=[MinValueValidator(0)],
+        help_text="Price quoted from the pricing matrix when the appointment was booked"
+    )
+    
     # Work tracking
     work_started_at = models.DateTimeField(null=True, blank=True)
     work_completed_at = models.DateTimeField(null=True, blank=True)
     estimated_completion = models.DateTimeField(null=True, blank=True)
     
+    # Notifications
+    reminder_sent_at = models.DateTimeField(null=True, blank=True, help_text="When the appointment reminder was sent")
+    
     # Notes and requirements
     special_requirements = models.TextField(blank=True)
     work_notes = models.TextField(blank=True, help_text="Employee work progress notes")
@@ -74,6 +88,10 @@ class Appointment(models.Model):
     class Meta:
         ordering = ['-created_at']
         # Allow multiple appointments per customer (no unique constraints)
+        indexes = [
+            # Slot lookups and reminder window range scans
+            models.Index(fields=['slot_date', 'slot_time'], name='appointment_slot_idx'),
+        ]
     
     def __str__(self):
         return f"{self.customer.username} - {self.selected_service.name} - {self.slot_date} {self.get_slot_time_display()}"
@@ -100,9 +118,39 @@ class Appointment(models.Model):
                     f"available once that service is completed. Please select a different time slot."
                 )
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Status as stored, so save() can tell a status transition
+        # (None when the status was deferred)
+        instance._stored_status = instance.__dict__.get('status')
+        return instance
+    
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        # Also runs when a deferred status is first read
+        if fields is None or 'status' in fields:
+            self._stored_status = self.status
+    
     def save(self, *args, **kwargs):
+        if self.quoted_price is None and self.selected_service_id:
+            self.quoted_price = resolve_price(self.selected_service_id)
         self.full_clean()
-        super().save(*args, **kwargs)
+        
+        # Bookings and status transitions are appended to the event log in the same transaction
+        adding = self._state.adding
+        from_status = '' if adding else getattr(self, '_stored_status', None)
+        using = kwargs.get('using') or router.db_for_write(Appointment, instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            if from_status is None:
+                # Loaded without its status (or not loaded at all): read the stored one
+                from_status = Appointment.objects.using(using).filter(pk=self.pk).values_list(
+                    'status', flat=True
+                ).first() or ''
+            super().save(*args, **kwargs)
+            if adding or self.status != from_status:
+                AppointmentEvent.objects.create(appointment=self, from_status=from_status, to_status=self.status)
+        self._stored_status = self.status
     
     @classmethod
     def get_available_slots(cls, selected_date):
@@ -166,6 +214,13 @@ class Appointment(models.Model):
                     available_count += 1
             return available_count
     
+    @classmethod
+    def _active_on(cls, selected_date):
+        return cls.objects.filter(
+            slot_date=selected_date,
+            status__in=['booked', 'assigned', 'in_progress', 'on_hold']
+        ).select_related('customer', 'selected_service', 'assigned_employee').order_by('slot_time')
+    
     @classmethod
     def get_daily_slot_details(cls, selected_date):
         """
@@ -173,10 +228,37 @@ class Appointment(models.Model):
         Shows which slots are occupied and which are available.
         """
         # Get all active appointments for the date
-        active_appointments = cls.objects.filter(
-            slot_date=selected_date,
+        active_appointments = cls._active_on(selected_date)
+        details = cls._slot_details(active_appointments)
+        details['all_appointments'] = active_appointments
+        return details
+    
+    @classmethod
+    async def aget_daily_slot_details(cls, selected_date):
+        """Async get_daily_slot_details(), reading the day's appointments in one query"""
+        active_appointments = [appointment async for appointment in cls._active_on(selected_date)]
+        details = cls._slot_details(active_appointments)
+        details['all_appointments'] = active_appointments
+        return details
+    
+    @classmethod
+    async def aget_occupied_slot_times(cls, dates):
+        """Occupied slot times of each of ``dates``, read in one query (for the slot stream)"""
+        occupied = {selected_date: set() for selected_date in dates}
+        active_slots = cls.objects.filter(
+            slot_date__in=dates,
             status__in=['booked', 'assigned', 'in_progress', 'on_hold']
-        ).select_related('customer', 'selected_service', 'assigned_employee').order_by('slot_time')
+        ).values_list('slot_date', 'slot_time')
+        async for slot_date, slot_time in active_slots:
+            occupied[slot_date].add(slot_time)
+        return occupied
+    
+    @classmethod
+    def _slot_details(cls, active_appointments):
+        """Slot summary of a day from its active appointments"""
+        by_slot = {}
+        for appointment in active_appointments:
+            by_slot.setdefault(appointment.slot_time, appointment)
         
         # Build slot information
         time_slots_info = []
@@ -184,7 +266,7 @@ class Appointment(models.Model):
         
         for slot_time, slot_display in cls.TIME_SLOT_CHOICES:
             # Find appointment occupying this slot
-            appointment = active_appointments.filter(slot_time=slot_time).first()
+            appointment = by_slot.get(slot_time)
             
             slot_info = {
                 'time': slot_time,
@@ -211,7 +293,6 @@ class Appointment(models.Model):
             'occupied_slots': occupied_count,
             'available_slots': len(cls.TIME_SLOT_CHOICES) - occupied_count,
             'slots': time_slots_info,
-            'all_appointments': active_appointments
         }
     
     @classmethod
@@ -279,4 +360,32 @@ class Appointment(models.Model):
             'completed': 'success',
             'cancelled': 'danger'
         }
-        return colors.get(self.status, 'secondary')
\ No newline at end of file
+        return colors.get(self.status, 'secondary')
+
+
+class AppointmentEvent(models.Model):
+    """
+    Append-only log of bookings and status transitions
+    
+    Ids only grow, so a reader keeps the last id it has seen as a cursor and
+    fetches what happened since with a primary key range scan. Ids may
+    become visible out of order (on PostgreSQL), so readers only advance the
+    cursor past events a few seconds old.
+    """
+    appointment = models.ForeignKey(Appointment, on_delete=models.CASCADE, related_name='events')
+    from_status = models.CharField(
+        max_length=20, choices=Appointment.STATUS_CHOICES, blank=True,
+        help_text="Empty when the event is the booking itself"
+    )
+    to_status = models.CharField(max_length=20, choices=Appointment.STATUS_CHOICES)
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        ordering = ['id']
+    
+    def __str__(self):
+        return f"#{self.appointment_id}: {self.from_status or 'new'} -> {self.to_status}"
+    
+    @property
+    def is_booking(self):
+        return not self.from_status
@@ -0,0 +1,126 @@
+"""
+Appointment reminder notifications
+
+Selects appointments entering the reminder window with a single range query
+over (slot_date, slot_time), renders the messages in bulk and sends them over
+one email connection. Every sent appointment is stamped with
+``reminder_sent_at`` so reruns never send the same reminder twice.
+"""
+from datetime import timedelta
+
+from django.core.mail import get_connection, send_mass_mail
+from django.db.models import Q
+from django.template import loader
+from django.utils import timezone
+
+from .models import Appointment
+
+ACTIVE_STATUSES = ['booked', 'assigned', 'in_progress', 'on_hold']
+
+REMINDER_SETTING_DEFAULTS = {
+    'send_reminder_notifications': 'true',
+    'email_notifications_enabled': 'true',
+    'reminder_hours_before': '24',
+    'from_email': 'noreply@example.com',
+}
+
+
+def get_reminder_window(hours_before, now=None):
+    """
+    Return the (start, end) local datetimes of the reminder window
+    """
+    start = timezone.localtime(now or timezone.now()).replace(tzinfo=None, second=0, microsecond=0)
+    return start, start + timedelta(hours=hours_before)
+
+
+def appointments_due_for_reminder(window_start, window_end):
+    """
+    Active appointments starting inside the window that have not been reminded yet.
+
+    Slot times are stored as zero-padded 'HH:MM' strings, so they compare in
+    chronological order and the window becomes a plain range over the
+    (slot_date, slot_time) index.
+    """
+    start_date, start_time = window_start.date(), window_start.strftime('%H:%M')
+    end_date, end_time = window_end.date(), window_end.strftime('%H:%M')
+
+    return Appointment.objects.filter(
+        Q(slot_date__gt=start_date) | Q(slot_date=start_date, slot_time__gte=start_time),
+        Q(slot_date__lt=end_date) | Q(slot_date=end_date, slot_time__lte=end_time),
+        slot_date__range=[start_date, end_date],
+        status__in=ACTIVE_STATUSES,
+        reminder_sent_at__isnull=True,
+    ).exclude(customer__email='')
+
+
+def _reminder_rows(queryset, chunk_size):
+    """Stream only the columns needed to render a reminder"""
+    return queryset.order_by('slot_date', 'slot_time', 'id').values(
+        'id', 'slot_date', 'slot_time', 'vehicle_make', 'vehicle_model',
+        'customer__email', 'customer__first_name', 'customer__last_name',
+        'customer__username', 'selected_service__name',
+    ).iterator(chunk_size=chunk_size)
+
+
+def send_appointment_reminders(hours_before, from_email, batch_size=500, dry_run=False, now=None):
+    """
+    Send reminder emails for every appointment entering the reminder window.
+
+    Args:
+        hours_before: Size of the reminder window in hours
+        from_email: Sender address for the reminder emails
+        batch_size: Number of messages sent and marked per batch
+        dry_run: Count the due reminders without sending or marking them
+        now: Reference time (defaults to the current time)
+
+    Returns:
+        Number of reminders sent (or due, for a dry run)
+    """
+    window_start, window_end = get_reminder_window(hours_before, now=now)
+    due = appointments_due_for_reminder(window_start, window_end)
+
+    if dry_run:
+        return due.count()
+
+    subject_template = loader.get_template('appointments/emails/reminder_subject.txt')
+    body_template = loader.get_template('appointments/emails/reminder_body.txt')
+    slot_labels = dict(Appointment.TIME_SLOT_CHOICES)
+
+    sent = 0
+    connection = get_connection()
+    connection.open()
+    try:
+        batch_ids, batch_messages = [], []
+        for row in _reminder_rows(due, batch_size):
+            full_name = f"{row['customer__first_name']} {row['customer__last_name']}".strip()
+            context = {
+                'appointment_id': row['id'],
+                'customer_name': full_name or row['customer__username'],
+                'service_name': row['selected_service__name'],
+                'slot_date': row['slot_date'],
+                'slot_display': slot_labels.get(row['slot_time'], row['slot_time']),
+                'vehicle': f"{row['vehicle_make']} {row['vehicle_model']}",
+            }
+            subject = ' '.join(subject_template.render(context).split())
+            batch_messages.append(
+                (subject, body_template.render(context), from_email, [row['customer__email']])
+            )
+            batch_ids.append(row['id'])
+
+            if len(batch_ids) >= batch_size:
+                sent += _flush_batch(batch_ids, batch_messages, connection)
+                batch_ids, batch_messages = [], []
+
+        if batch_ids:
+            sent += _flush_batch(batch_ids, batch_messages, connection)
+    finally:
+        connection.close()
+
+    return sent
+
+
+def _flush_batch(appointment_ids, messages, connection):
+    """Send one batch and record the sent marker for it"""
+    send_mass_mail(messages, fail_silently=False, connection=connection)
+    Appointment.objects.filter(pk__in=appointment_ids).update(reminder_sent_at=timezone.now())
+    return len(appointment_ids)
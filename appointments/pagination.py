@@ -0,0 +1,162 @@
+"""
+Cursor (keyset) pagination for appointment lists
+
+Pages are addressed by an opaque cursor encoding the sort key of the first
+or last row shown, so every page - however deep - is one indexed range query
+fetching ``per_page + 1`` rows. Totals are approximate: the count stops at
+``count_limit`` rows and is cached briefly, so large filtered lists never
+pay for a full COUNT(*).
+"""
+import base64
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db.models import Q
+
+DEFAULT_ORDERING = ('-slot_date', '-slot_time', '-id')
+COUNT_LIMIT = 1000
+COUNT_CACHE_TIMEOUT = 60
+
+
+class CursorPage:
+    """One page of results, usable in templates like a Django Page"""
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if self._has_next and self.object_list:
+            return self.paginator.encode_cursor(self.object_list[-1])
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self._has_previous and self.object_list:
+            return self.paginator.encode_cursor(self.object_list[0], backwards=True)
+        return None
+
+    @property
+    def total_count(self):
+        return self.paginator.count
+
+    @property
+    def count_is_estimate(self):
+        return self.paginator.count > self.paginator.count_limit
+
+    @property
+    def count_display(self):
+        """Total for display, e.g. '42' or '1000+'"""
+        if self.count_is_estimate:
+            return f'{self.paginator.count_limit}+'
+        return str(self.paginator.count)
+
+
+class CursorPaginator:
+    """
+    Keyset paginator over a unique ordering
+
+    Args:
+        queryset: Filtered queryset to paginate
+        per_page: Rows per page
+        ordering: Order fields; the last one must be unique (e.g. '-id')
+        count_limit: Stop counting after this many rows
+    """
+
+    def __init__(self, queryset, per_page, ordering=DEFAULT_ORDERING, count_limit=COUNT_LIMIT):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = list(ordering)
+        self.count_limit = count_limit
+        self._fields = [field.lstrip('-') for field in self.ordering]
+        self._count = None
+
+    def get_page(self, cursor=None):
+        """Return the page after (or, for a backwards cursor, before) ``cursor``"""
+        position, backwards = self.decode_cursor(cursor)
+
+        queryset = self.queryset.order_by(*(self._reversed() if backwards else self.ordering))
+        if position is not None:
+            queryset = queryset.filter(self._keyset_filter(position, backwards))
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if backwards:
+            rows.reverse()
+            return CursorPage(rows, self, has_next=True, has_previous=has_more)
+        return CursorPage(rows, self, has_next=has_more, has_previous=position is not None)
+
+    @property
+    def count(self):
+        """Number of rows, capped at count_limit + 1 and cached briefly"""
+        if self._count is None:
+            key = 'cursor_count:' + hashlib.md5(str(self.queryset.query).encode()).hexdigest()
+            self._count = cache.get(key)
+            if self._count is None:
+                self._count = self.queryset.order_by()[:self.count_limit + 1].count()
+                cache.set(key, self._count, COUNT_CACHE_TIMEOUT)
+        return self._count
+
+    def encode_cursor(self, obj, backwards=False):
+        """Opaque cursor for the position of ``obj``"""
+        values = [self._serialize(getattr(obj, field)) for field in self._fields]
+        payload = json.dumps({'v': values, 'b': backwards}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """Return (position values, backwards); invalid cursors start from the first page"""
+        if not cursor:
+            return None, False
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            model_fields = [self.queryset.model._meta.get_field(field) for field in self._fields]
+            values = [field.to_python(value) for field, value in zip(model_fields, payload['v'])]
+            if len(values) != len(self._fields):
+                return None, False
+            return values, bool(payload.get('b'))
+        except Exception:
+            return None, False
+
+    def _reversed(self):
+        return [field[1:] if field.startswith('-') else f'-{field}' for field in self.ordering]
+
+    def _keyset_filter(self, values, backwards):
+        """Rows strictly after ``values`` in the (possibly reversed) ordering"""
+        condition = Q()
+        for i, field in enumerate(self.ordering):
+            descending = field.startswith('-')
+            lookup = 'lt' if descending != backwards else 'gt'
+            term = Q(**{f'{self._fields[i]}__{lookup}': values[i]})
+            for name, value in zip(self._fields[:i], values[:i]):
+                term &= Q(**{name: value})
+            condition |= term
+        return condition
+
+    @staticmethod
+    def _serialize(value):
+        return value.isoformat() if hasattr(value, 'isoformat') else value
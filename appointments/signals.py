@@ -0,0 +1,21 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .events import appointment_event, broker
+from .models import Appointment
+
+
+@receiver(post_save, sender=Appointment)
+def publish_appointment_saved(sender, instance, created, raw=False, **kwargs):
+    """Tell the open streams about a booking or status change once it is committed"""
+    if raw:
+        return
+    event = appointment_event(instance, 'created' if created else 'updated')
+    transaction.on_commit(lambda: broker.publish(event))
+
+
+@receiver(post_delete, sender=Appointment)
+def publish_appointment_deleted(sender, instance, **kwargs):
+    event = appointment_event(instance, 'deleted')
+    transaction.on_commit(lambda: broker.publish(event))
@@ -0,0 +1,174 @@
+import json
+from datetime import date, timedelta
+
+from asgiref.sync import sync_to_async
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import User
+from monitoring.testing import QueryBudgetTestMixin, create_appointments, create_employee, create_services
+
+from .events import broker, event_stream
+from .models import Appointment
+
+
+def _sse_events(body):
+    """(event, data) pairs of an SSE body, comments and retry lines left out"""
+    events = []
+    for message in body.split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in message.splitlines() if not line.startswith(':'))
+        if 'event' in fields:
+            events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+
+class AppointmentListQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    """Appointment lists show more rows than their budget, so an N+1 query fails the test"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create_user('customer', password='secret', role='customer')
+        other_customer = User.objects.create_user('other', password='secret', role='customer')
+        cls.staff = User.objects.create_user('staff', password='secret', role='employee', is_staff=True)
+        employees = [create_employee(f'employee{i}', f'EMP{i}').user for i in range(3)]
+        create_appointments(
+            [other_customer, cls.customer], create_services(3),
+            [employees[i % 3] if i % 4 else None for i in range(12)],
+        )
+
+    def test_appointment_list_within_budget(self):
+        self.client.force_login(self.staff)
+        response = self.assertWithinQueryBudget(reverse('appointments:appointment_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['appointments']), 12)
+
+    def test_filtered_appointment_list_within_budget(self):
+        self.client.force_login(self.staff)
+        response = self.assertWithinQueryBudget(reverse('appointments:appointment_list') + '?status=assigned')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['appointments']), 9)
+
+    def test_my_appointments_within_budget(self):
+        self.client.force_login(self.customer)
+        response = self.assertWithinQueryBudget(reverse('appointments:my_appointments'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['appointments']), 6)
+
+
+class SlotApiTests(TestCase):
+    """The async slot API lists the free slots of a day"""
+
+    @classmethod
+    def setUpTestData(cls):
+        customer = User.objects.create_user('customer', password='secret', role='customer')
+        create_appointments([customer], create_services(1), [None, None])  # tomorrow 09:00 and 11:00
+        cls.tomorrow = date.today() + timedelta(days=1)
+
+    def test_occupied_slots_are_not_offered(self):
+        response = self.client.get(reverse('appointments:available_slots_api'), {'date': self.tomorrow.isoformat()})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['occupied_slots'], 2)
+        self.assertEqual([slot['time'] for slot in data['slots']], ['13:00', '15:00', '17:00'])
+
+    def test_past_dates_have_no_slots(self):
+        yesterday = date.today() - timedelta(days=1)
+        response = self.client.get(reverse('appointments:available_slots_api'), {'date': yesterday.isoformat()})
+        self.assertEqual(response.json()['slots'], [])
+
+    def test_invalid_date(self):
+        response = self.client.get(reverse('appointments:available_slots_api'), {'date': 'tomorrow'})
+        self.assertEqual(response.status_code, 400)
+
+
+class SlotStreamFallbackTests(TestCase):
+    """Outside ASGI the slot stream sends the current state and a long retry"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create_user('customer', password='secret', role='customer')
+        create_appointments([cls.customer], create_services(1), [None])
+        cls.tomorrow = date.today() + timedelta(days=1)
+
+    def test_snapshot_of_each_date(self):
+        self.client.force_login(self.customer)
+        day_after = self.tomorrow + timedelta(days=1)
+        response = self.client.get(
+            reverse('appointments:slot_stream'), {'date': [self.tomorrow.isoformat(), day_after.isoformat()]}
+        )
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = response.content.decode()
+        self.assertTrue(body.startswith('retry: 120000\n\n'))
+        events = _sse_events(body)
+        self.assertEqual([data['date'] for _, data in events], [self.tomorrow.isoformat(), day_after.isoformat()])
+        self.assertEqual(events[0][1]['occupied'], ['09:00'])
+        self.assertEqual(events[1][1]['occupied'], [])
+
+    def test_requires_login_and_valid_dates(self):
+        url = reverse('appointments:slot_stream')
+        self.assertEqual(self.client.get(url, {'date': self.tomorrow.isoformat()}).status_code, 401)
+        self.client.force_login(self.customer)
+        self.assertEqual(self.client.get(url).status_code, 400)
+        self.assertEqual(self.client.get(url, {'date': 'soon'}).status_code, 400)
+
+
+@override_settings(SSE_KEEPALIVE_SECONDS=0.2, SSE_MAX_STREAM_SECONDS=1.5)
+class SlotStreamTests(TransactionTestCase):
+    """Under ASGI the slot stream pushes every change to a watched date"""
+
+    def setUp(self):
+        self.customer = User.objects.create_user('customer', password='secret', role='customer')
+        self.services = create_services(1)
+
+    async def test_pushes_bookings_and_changes_made_without_signals(self):
+        await sync_to_async(self.async_client.force_login)(self.customer)
+        tomorrow = (date.today() + timedelta(days=1)).isoformat()
+        response = await self.async_client.get(reverse('appointments:slot_stream'), {'date': tomorrow})
+
+        updates = []
+        async for chunk in response.streaming_content:
+            for event, data in _sse_events(chunk.decode()):
+                updates.append(data['occupied'])
+                if len(updates) == 1:
+                    # Published through the broker after commit
+                    [appointment] = await sync_to_async(create_appointments)(
+                        [self.customer], self.services, [None]
+                    )
+                elif len(updates) == 2:
+                    # No signal: picked up by the re-check after a quiet interval
+                    await Appointment.objects.filter(pk=appointment.pk).aupdate(status='cancelled')
+        self.assertEqual(updates, [[], ['09:00'], []])
+        self.assertEqual(broker.subscriber_count, 0)
+
+
+@override_settings(SSE_KEEPALIVE_SECONDS=0.05, SSE_MAX_STREAM_SECONDS=0.3, SSE_RETRY_MS=1000)
+class EventStreamTests(SimpleTestCase):
+    """event_stream() sends a snapshot, then refreshes on events and quiet intervals"""
+
+    async def _collect(self, snapshot, refresh, publish=()):
+        messages = []
+        async for message in event_stream(snapshot, refresh):
+            messages.append(message)
+            if len(messages) == 2:
+                for event in publish:
+                    broker.publish(event)
+        return messages
+
+    async def test_refresh_gets_events_then_none_when_quiet(self):
+        calls = []
+
+        async def snapshot():
+            return [('state', {'n': 0})]
+
+        async def refresh(events):
+            calls.append(events)
+            return [('state', {'n': len(calls)})] if events else []
+
+        messages = await self._collect(snapshot, refresh, publish=[{'id': 1}, {'id': 2}])
+        self.assertEqual(messages[0], 'retry: 1000\n\n')
+        self.assertEqual(messages[1], 'event: state\ndata: {"n": 0}\n\n')
+        self.assertEqual(messages[2], 'event: state\ndata: {"n": 1}\n\n')
+        self.assertEqual(calls[0], [{'id': 1}, {'id': 2}])
+        self.assertTrue(calls[1:])
+        self.assertTrue(all(events is None for events in calls[1:]))
+        self.assertIn(': keepalive\n\n', messages[3:])
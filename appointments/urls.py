@@ -7,9 +7,11 @@ urlpatterns = [
     path('book/', views.book_appointment_view, name='book_appointment'),
     path('my-appointments/', views.my_appointments_view, name='my_appointments'),
     path('list/', views.appointment_list_view, name='appointment_list'),
+    path('export/', views.appointment_export_view, name='appointment_export'),
     path('<int:appointment_id>/', views.appointment_detail_view, name='appointment_detail'),
     path('<int:appointment_id>/cancel/', views.cancel_appointment_view, name='cancel_appointment'),
     path('<int:appointment_id>/update-status/', views.update_appointment_status_view, name='update_status'),
     path('api/available-slots/', views.get_available_slots_api, name='available_slots_api'),
+    path('api/slot-stream/', views.slot_stream_view, name='slot_stream'),
     path('slot-occupancy/', views.slot_occupancy_view, name='slot_occupancy'),
 ]
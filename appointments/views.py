@@ -1,24 +1,43 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.core.paginator import Paginator
-from django.db.models import Q
 from django.http import JsonResponse
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from datetime import date, timedelta
 from .models import Appointment
+from .events import event_stream_response
 from .forms import AppointmentBookingForm, AppointmentSearchForm
+from .pagination import CursorPaginator
 from services.models import Service
+from accounts.auth import aget_user
+from admin_panel.exports import APPOINTMENT_EXPORT_FIELDS, streaming_export_response
+from monitoring.budgets import query_budget
+from monitoring.metrics import Counter, Histogram
 
 User = get_user_model()
 
+MAX_WATCHED_DATES = 31  # the booking window: today and the next 30 days
+
+BOOKING_REQUESTS = Counter(
+    'carmodx_booking_requests_total', 'Booking page requests by method and outcome', ['method', 'outcome']
+)
+BOOKING_DURATION = Histogram('carmodx_booking_duration_seconds', 'Booking page response time', ['method'])
+SLOT_API_REQUESTS = Counter(
+    'carmodx_slot_api_requests_total',
+    'Slot availability lookups by outcome (available, full or error)',
+    ['outcome']
+)
+SLOT_API_DURATION = Histogram('carmodx_slot_api_duration_seconds', 'Slot availability API response time', ['method'])
+
 
 @login_required
+@BOOKING_DURATION.time_view
 def book_appointment_view(request):
     """Book a new appointment with dropdown slot selection"""
     # Only customers can book appointments
     if not request.user.role == 'customer':
+        BOOKING_REQUESTS.inc(method=request.method, outcome='denied')
         messages.error(request, 'Only customers can book appointments. Employees should manage existing appointments.')
         return redirect('accounts:dashboard')
     
@@ -28,11 +47,14 @@ def book_appointment_view(request):
             appointment = form.save(commit=False)
             appointment.customer = request.user
             appointment.save()
+            BOOKING_REQUESTS.inc(method=request.method, outcome='booked')
             
             messages.success(request, f'Appointment booked successfully! Your appointment ID is #{appointment.id}')
             return redirect('appointments:appointment_detail', appointment_id=appointment.id)
+        BOOKING_REQUESTS.inc(method=request.method, outcome='invalid')
     else:
         form = AppointmentBookingForm(user=request.user)
+        BOOKING_REQUESTS.inc(method=request.method, outcome='form')
     
     context = {
         'form': form,
@@ -42,7 +64,19 @@ def book_appointment_view(request):
     return render(request, 'appointments/book_appointment.html', context)
 
 
-def get_available_slots_api(request):
+def _available_slots(selected_date, occupied_times):
+    """Dropdown entries for the free slots of a date; none for past dates"""
+    if selected_date < date.today():
+        return []
+    return [
+        {'time': slot_time, 'display': slot_display, 'available': True}
+        for slot_time, slot_display in Appointment.TIME_SLOT_CHOICES
+        if slot_time not in occupied_times
+    ]
+
+
+@SLOT_API_DURATION.time_view
+async def get_available_slots_api(request):
     """
     API endpoint to get available time slots for a selected date.
     
@@ -50,42 +84,33 @@ def get_available_slots_api(request):
     - Each time slot can only have 1 active appointment at a time
     - Active statuses: booked, assigned, in_progress, on_hold
     - Completed/cancelled appointments free up the slot
+    
+    Async: polled on every date change, it reads the day's appointments with
+    a single async query instead of tying up a worker thread.
     """
     selected_date = request.GET.get('date')
     
     if not selected_date:
+        SLOT_API_REQUESTS.inc(outcome='error')
         return JsonResponse({'error': 'Date parameter is required'}, status=400)
     
     try:
         selected_date = date.fromisoformat(selected_date)
     except ValueError:
+        SLOT_API_REQUESTS.inc(outcome='error')
         return JsonResponse({'error': 'Invalid date format'}, status=400)
     
-    available_slots = Appointment.get_available_slots(selected_date)
-    daily_details = Appointment.get_daily_slot_details(selected_date)
+    daily_details = await Appointment.aget_daily_slot_details(selected_date)
     
-    # Format slots for dropdown (only available ones)
-    formatted_slots = []
-    for slot in available_slots:
-        formatted_slots.append({
-            'time': slot['time'],
-            'display': slot['display'],
-            'available': True
-        })
-    
-    # Get detailed info about all slots
-    all_slots_info = []
-    for slot_info in daily_details['slots']:
-        all_slots_info.append({
-            'time': slot_info['time'],
-            'display': slot_info['display'],
-            'occupied': slot_info['occupied'],
-            'appointment': slot_info['appointment']
-        })
+    # Format slots for dropdown (only available ones, never in the past)
+    formatted_slots = _available_slots(
+        selected_date, {slot_info['time'] for slot_info in daily_details['slots'] if slot_info['occupied']}
+    )
+    SLOT_API_REQUESTS.inc(outcome='available' if formatted_slots else 'full')
     
     return JsonResponse({
         'slots': formatted_slots,  # Only available slots for the dropdown
-        'all_slots': all_slots_info,  # All slots with their status
+        'all_slots': daily_details['slots'],  # All slots with their status
         'date': selected_date.isoformat(),
         'total_slots': daily_details['total_slots'],
         'occupied_slots': daily_details['occupied_slots'],
@@ -94,6 +119,60 @@ def get_available_slots_api(request):
     })
 
 
+async def slot_stream_view(request):
+    """
+    Server-Sent Events stream of slot availability for the watched dates
+    (``?date=2024-05-01&date=2024-05-02``, at most MAX_WATCHED_DATES).
+    
+    Sends a ``slots`` event per date on connect, then one whenever a committed
+    booking, cancellation or status change alters that date's occupancy.
+    """
+    user = await aget_user(request)
+    if not user.is_authenticated:
+        return JsonResponse({'error': 'Authentication required'}, status=401)
+    
+    try:
+        dates = sorted({date.fromisoformat(value) for value in request.GET.getlist('date')})
+    except ValueError:
+        return JsonResponse({'error': 'Invalid date format'}, status=400)
+    if not dates:
+        return JsonResponse({'error': 'Date parameter is required'}, status=400)
+    if len(dates) > MAX_WATCHED_DATES:
+        return JsonResponse({'error': f'At most {MAX_WATCHED_DATES} dates can be watched'}, status=400)
+    
+    watched = {selected_date.isoformat() for selected_date in dates}
+    occupied = {}
+    
+    def payload(selected_date):
+        occupied_times = occupied[selected_date]
+        total_slots = len(Appointment.TIME_SLOT_CHOICES)
+        return {
+            'date': selected_date.isoformat(),
+            'slots': _available_slots(selected_date, occupied_times),
+            'occupied': sorted(occupied_times),
+            'total_slots': total_slots,
+            'occupied_slots': len(occupied_times),
+            'available_slots': total_slots - len(occupied_times),
+        }
+    
+    async def snapshot():
+        occupied.update(await Appointment.aget_occupied_slot_times(dates))
+        return [('slots', payload(selected_date)) for selected_date in dates]
+    
+    async def refresh(events):
+        # An update may have moved an appointment off a watched date, so only
+        # creations and deletions on other dates can be skipped. Without
+        # events (a quiet interval) other workers' changes are checked for.
+        if events is not None and not any(event['action'] == 'updated' or event['slot_date'] in watched for event in events):
+            return []
+        current = await Appointment.aget_occupied_slot_times(dates)
+        changed = [selected_date for selected_date in dates if current[selected_date] != occupied[selected_date]]
+        occupied.update(current)
+        return [('slots', payload(selected_date)) for selected_date in changed]
+    
+    return await event_stream_response(request, 'slots', snapshot, refresh)
+
+
 @login_required
 def appointment_detail_view(request, appointment_id):
     """View appointment details"""
@@ -111,23 +190,33 @@ def appointment_detail_view(request, appointment_id):
     return render(request, 'appointments/appointment_detail.html', context)
 
 
+def _pagination_query(request):
+    """Current query string without the page cursor, for pagination links"""
+    params = request.GET.copy()
+    params.pop('cursor', None)
+    params.pop('page', None)
+    return params.urlencode()
+
+
+@query_budget(5)
 @login_required
 def my_appointments_view(request):
     """List current user's appointments"""
-    appointments = Appointment.objects.filter(customer=request.user).order_by('-slot_date', '-slot_time')
+    appointments = Appointment.objects.filter(customer=request.user).select_related('selected_service')
     
-    # Pagination
-    paginator = Paginator(appointments, 10)
-    page_number = request.GET.get('page')
-    appointments = paginator.get_page(page_number)
+    # Cursor pagination, newest first
+    paginator = CursorPaginator(appointments, 10)
+    appointments = paginator.get_page(request.GET.get('cursor'))
     
     context = {
         'appointments': appointments,
+        'pagination_query': _pagination_query(request),
     }
     
     return render(request, 'appointments/my_appointments.html', context)
 
 
+@query_budget(6)
 @login_required
 def appointment_list_view(request):
     """List all appointments (for staff and employees)"""
@@ -139,47 +228,43 @@ def appointment_list_view(request):
     
     # Apply search and filters
     search_form = AppointmentSearchForm(request.GET)
-    if search_form.is_valid():
-        search = search_form.cleaned_data.get('search')
-        status = search_form.cleaned_data.get('status')
-        date_from = search_form.cleaned_data.get('date_from')
-        date_to = search_form.cleaned_data.get('date_to')
-        
-        if search:
-            appointments = appointments.filter(
-                Q(customer__username__icontains=search) |
-                Q(customer__first_name__icontains=search) |
-                Q(customer__last_name__icontains=search) |
-                Q(vehicle_make__icontains=search) |
-                Q(vehicle_model__icontains=search) |
-                Q(selected_service__name__icontains=search)
-            )
-        
-        if status:
-            appointments = appointments.filter(status=status)
-        
-        if date_from:
-            appointments = appointments.filter(slot_date__gte=date_from)
-        
-        if date_to:
-            appointments = appointments.filter(slot_date__lte=date_to)
+    appointments = search_form.filter_queryset(appointments)
     
-    # Order by date and time
-    appointments = appointments.order_by('-slot_date', '-slot_time')
+    appointments = appointments.select_related(
+        'customer', 'selected_service__category', 'assigned_employee'
+    )
     
-    # Pagination
-    paginator = Paginator(appointments, 20)
-    page_number = request.GET.get('page')
-    appointments = paginator.get_page(page_number)
+    # Cursor pagination ordered by date and time; totals are capped estimates
+    paginator = CursorPaginator(appointments, 20)
+    appointments = paginator.get_page(request.GET.get('cursor'))
     
     context = {
         'appointments': appointments,
         'search_form': search_form,
+        'pagination_query': _pagination_query(request),
     }
     
     return render(request, 'appointments/appointment_list.html', context)
 
 
+@login_required
+def appointment_export_view(request):
+    """Stream the filtered appointment list as CSV or NDJSON (for staff and employees)"""
+    if not (request.user.is_staff or request.user.role == 'employee'):
+        messages.error(request, 'Access denied. Only employees can export appointments.')
+        return redirect('appointments:my_appointments')
+    
+    search_form = AppointmentSearchForm(request.GET)
+    appointments = search_form.filter_queryset(Appointment.objects.all()).order_by('-slot_date', '-slot_time')
+    
+    return streaming_export_response(
+        appointments,
+        APPOINTMENT_EXPORT_FIELDS,
+        request.GET.get('format', 'csv'),
+        filename=f'appointments_{date.today().isoformat()}'
+    )
+
+
 @login_required
 def cancel_appointment_view(request, appointment_id):
     """Cancel an appointment"""
@@ -0,0 +1,50 @@
+"""
+Cache configuration
+
+``cache_config()`` builds ``CACHES['default']`` from ``CACHE_URL``:
+
+- unset: a local-memory cache, private to each process. Fine for
+  ``runserver`` and a single worker only: the data versions
+  (carmodx/versions.py) live in this cache, so with several processes a
+  version bumped in one of them never reaches the others and they keep
+  serving their old catalog, prices and cached pages.
+- ``redis://host:6379/0`` (or ``rediss://``): Django's Redis cache, needs
+  the ``redis`` package
+- ``memcached://host:11211``: Django's pymemcache cache, needs the
+  ``pymemcache`` package
+
+Deployments with more than one process must set ``CACHE_URL``.
+"""
+from urllib.parse import urlparse
+
+from decouple import config
+
+CACHE_KEY_PREFIX = 'carmodx'
+
+
+def parse_cache_url(url):
+    """
+    Django cache settings for a ``redis://`` or ``memcached://`` URL
+
+    Raises:
+        ValueError: For an unsupported scheme
+    """
+    parsed = urlparse(url)
+    if parsed.scheme in ('redis', 'rediss'):
+        return {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': url}
+    if parsed.scheme == 'memcached':
+        return {'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache', 'LOCATION': parsed.netloc}
+    raise ValueError(f'Unsupported CACHE_URL scheme: {parsed.scheme!r}')
+
+
+def cache_config():
+    """``CACHES['default']`` from the environment (see the module docstring)"""
+    url = config('CACHE_URL', default='')
+    if not url:
+        return {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    cache = parse_cache_url(url)
+    cache['KEY_PREFIX'] = CACHE_KEY_PREFIX
+    return cache
@@ -0,0 +1,131 @@
+"""
+Full-page cache for anonymous visitors
+
+Public pages that look the same to every anonymous visitor opt in with the
+``@cache_public_page`` decorator; ``PublicPageCacheMiddleware`` then serves
+them from the cache, keyed on the path, the ``page``, ``search`` and
+``category`` parameters and the catalog data version, so a service or
+category change replaces the server-side copy at once::
+
+    @cache_public_page
+    def about_view(request):
+        ...
+
+Signed-in users, visitors with pending messages and responses that set
+cookies bypass the cache, and so do requests with any other query parameter
+(tracking tags, typos), which would otherwise each store a copy of the page.
+Cached pages are ``Cache-Control: public, max-age=PAGE_CACHE_MAX_AGE`` with
+``Vary: Cookie``: browsers and shared caches may keep showing a page for that
+long after a catalog change. The pages that bypass the cache because of the
+visitor are marked private so shared caches never store them.
+"""
+import hashlib
+from urllib.parse import urlencode
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from services.catalog import get_catalog_version
+
+PAGE_CACHE_KEY = 'public_page:{version}:{url}'
+
+# Query parameters the cached pages read; any other one bypasses the cache
+PAGE_CACHE_PARAMS = ('page', 'search', 'category')
+
+
+def cache_public_page(view_func):
+    """Serve this view from the anonymous full-page cache"""
+    view_func.cache_public_page = True
+    return view_func
+
+
+def _is_anonymous(request):
+    # Without a session cookie there is nobody to look up
+    if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+        return True
+    return not request.user.is_authenticated
+
+
+def _page_cache_key(request):
+    """The page's cache key, or None when the query string has parameters the key leaves out"""
+    if not set(request.GET) <= set(PAGE_CACHE_PARAMS):
+        return None
+    params = urlencode([(name, request.GET[name]) for name in PAGE_CACHE_PARAMS if name in request.GET])
+    url = f'{request.scheme}://{request.get_host()}{request.path}?{params}'
+    return PAGE_CACHE_KEY.format(version=get_catalog_version(), url=hashlib.md5(url.encode()).hexdigest())
+
+
+class PublicPageCacheMiddleware:
+    """
+    Serve ``@cache_public_page`` views to anonymous visitors from the cache
+
+    Pages are kept for settings.PAGE_CACHE_SECONDS (which also bounds how
+    stale non-catalog figures such as appointment counts can get) and
+    browsers may reuse them for settings.PAGE_CACHE_MAX_AGE seconds.
+    Must come after the authentication and message middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.timeout = getattr(settings, 'PAGE_CACHE_SECONDS', 300)
+        self.max_age = getattr(settings, 'PAGE_CACHE_MAX_AGE', 60)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        return await sync_to_async(self.process_response)(request, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        if not (getattr(view_func, 'cache_public_page', False) or getattr(view_class, 'cache_public_page', False)):
+            return None
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        # Counting the messages doesn't mark them as shown
+        if not _is_anonymous(request) or len(get_messages(request)):
+            request.public_page_private = True
+            return None
+
+        cache_key = _page_cache_key(request)
+        if cache_key is None:
+            return None
+        request.public_page_cache_key = cache_key
+        response = cache.get(cache_key)
+        if response is not None:
+            request.public_page_cache_key = None  # already cached
+        return response
+
+    def process_response(self, request, response):
+        if getattr(request, 'public_page_private', False):
+            patch_vary_headers(response, ('Cookie',))
+            patch_cache_control(response, private=True)
+            return response
+
+        if not hasattr(request, 'public_page_cache_key'):
+            return response
+        patch_vary_headers(response, ('Cookie',))
+        if response.status_code != 200 or response.streaming or response.cookies:
+            patch_cache_control(response, private=True)
+            return response
+        if request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+            # The page embeds a CSRF token for this visitor
+            patch_cache_control(response, private=True)
+            return response
+
+        patch_cache_control(response, public=True, max_age=self.max_age)
+        if request.public_page_cache_key and request.method == 'GET':
+            cache.set(request.public_page_cache_key, response, self.timeout)
+        return response
@@ -0,0 +1,58 @@
+"""
+Database routing for reporting queries
+
+Reads inside a ``reporting_database()`` block go to
+``settings.REPORTING_DATABASE`` (the ``replica`` alias when
+``REPLICA_DATABASE_URL`` is set, otherwise ``default``). Everything else,
+including all writes and any read made inside a transaction on the primary,
+stays on ``default``, so bookings always read their own writes.
+
+    @reporting_database()
+    def get(self, request):
+        ...
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_reporting = ContextVar('reporting_database', default=False)
+
+
+@contextmanager
+def reporting_database():
+    """Route the reads made inside the block (or decorated function) to the reporting database"""
+    token = _reporting.set(True)
+    try:
+        yield
+    finally:
+        _reporting.reset(token)
+
+
+def get_reporting_alias():
+    return getattr(settings, 'REPORTING_DATABASE', DEFAULT_DB_ALIAS)
+
+
+class ReportingRouter:
+    """Send reporting reads to the replica, everything else to the primary"""
+
+    def db_for_read(self, model, **hints):
+        alias = get_reporting_alias()
+        if alias == DEFAULT_DB_ALIAS or not _reporting.get():
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            # Part of a write transaction: read from the primary
+            return None
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from the primary (replication or snapshots)
+        return db == DEFAULT_DB_ALIAS
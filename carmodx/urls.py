@@ -31,6 +31,7 @@ urlpatterns = [
     path('appointments/', include('appointments.urls')),
     path('admin-panel/', include('admin_panel.urls')),
     path('ai-agent/', include('ai_agent.urls')),
+    path('monitoring/', include('monitoring.urls')),
 ]
 
 # Serve media files during development
@@ -0,0 +1,59 @@
+"""
+Data versions for cache keys
+
+A data version is a counter in the shared cache that is bumped whenever the
+data behind it changes. Keys that include the version (template fragments,
+cached pages, cached objects) never need deleting: after a bump they are
+simply not looked up again and expire on their own.
+
+    {% cache 3600 service_grid data_versions.catalog services.number %}
+
+Bumps made inside a transaction are deferred until it commits.
+"""
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_CACHE_KEY = 'data_version:{}'
+
+
+def get_versions(*names):
+    """Current versions of the named data sets, initialised on first use"""
+    keys = {VERSION_CACHE_KEY.format(name): name for name in names}
+    found = cache.get_many(keys)
+    for key in keys.keys() - found.keys():
+        cache.add(key, 1, timeout=None)
+        found[key] = cache.get(key, 1)
+    return {keys[key]: version for key, version in found.items()}
+
+
+def get_version(name):
+    return get_versions(name)[name]
+
+
+def bump_version(name):
+    """Mark everything cached under the current version of ``name`` as stale"""
+    transaction.on_commit(lambda: _incr(VERSION_CACHE_KEY.format(name)))
+
+
+def _incr(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, timeout=None)
+
+
+class DataVersions:
+    """Template-facing mapping of data versions, read from the cache on first access"""
+
+    def __init__(self):
+        self._versions = {}
+
+    def __getitem__(self, name):
+        if name not in self._versions:
+            self._versions[name] = get_version(name)
+        return self._versions[name]
+
+
+def data_versions(request):
+    """Context processor: ``{{ data_versions.<name> }}``, costing nothing unless used"""
+    return {'data_versions': DataVersions()}
@@ -1,20 +1,24 @@
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
-from services.models import Service, ServiceCategory
+from services.catalog import get_catalog
 from appointments.models import Appointment
 from django.db.models import Count
+from .page_cache import cache_public_page
 
 
+@cache_public_page
 def home_view(request):
     """Home page view"""
+    catalog = get_catalog()
+    
     # Get featured services
-    featured_services = Service.objects.filter(is_active=True)[:6]
+    featured_services = catalog.services[:6]
     
     # Get service categories
-    categories = ServiceCategory.objects.filter(is_active=True)[:4]
+    categories = catalog.categories[:4]
     
     # Get recent statistics (for display)
-    total_services = Service.objects.filter(is_active=True).count()
+    total_services = len(catalog.services)
     total_appointments = Appointment.objects.count()
     
     context = {
@@ -27,11 +31,13 @@ def home_view(request):
     return render(request, 'home.html', context)
 
 
+@cache_public_page
 def about_view(request):
     """About page view"""
     return render(request, 'about.html')
 
 
+@cache_public_page
 def contact_view(request):
     """Contact page view"""
     return render(request, 'contact.html')
@@ -0,0 +1,339 @@
+"""
+Benchmark scenarios for the booking and dashboard hot paths
+
+Every scenario drives one request (or call) through the Django test client
+and is timed together with its query count. ``manage.py benchmark`` seeds a
+throwaway test database with ``seed_benchmark_data()``, runs the scenarios,
+writes the percentiles to JSON and compares them with a stored baseline.
+"""
+import multiprocessing
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from django.db.models import Count
+from django.test import Client
+from django.urls import reverse
+
+from accounts.models import User
+from admin_panel.utils import clear_dashboard_cache, get_admin_statistics
+from appointments.models import Appointment
+from appointments.notifications import ACTIVE_STATUSES
+from services.models import Service
+
+from .budgets import record_queries
+from .loadgen import VEHICLES, LoadDataGenerator
+
+SCENARIOS = {}
+
+
+class BenchmarkError(Exception):
+    """A scenario request failed"""
+
+
+def scenario(name, prepare=None):
+    """
+    Register a benchmark scenario
+
+    ``func(context, iteration)`` performs one timed request and returns the
+    response (or None); ``prepare(context, iteration)`` runs untimed before it.
+    """
+    def decorator(func):
+        SCENARIOS[name] = (func, prepare)
+        return func
+    return decorator
+
+
+class BenchmarkContext:
+    """Logged-in clients and fixtures shared by the scenarios"""
+
+    def __init__(self):
+        self.anonymous = Client()
+        self.customer = self._client(User.objects.filter(role='customer').order_by('pk').first())
+        self.employee = self._client(
+            User.objects.filter(employee_profile__employee_type='regular', employee_profile__is_active=True).first()
+        )
+        self.super_employee = self._client(
+            User.objects.filter(employee_profile__employee_type='super', employee_profile__is_active=True).first()
+        )
+        self.admin = self._client(User.objects.filter(is_superuser=True).first())
+        self.service_ids = list(Service.objects.filter(is_active=True).values_list('pk', flat=True))
+
+    @staticmethod
+    def _client(user):
+        if user is None:
+            raise BenchmarkError('Benchmark data is missing a user role; seed the database first')
+        client = Client()
+        client.force_login(user)
+        return client
+
+
+def _check(response):
+    if response is not None and response.status_code >= 400:
+        raise BenchmarkError(f'{response.request["PATH_INFO"]} returned {response.status_code}')
+    return response
+
+
+@scenario('slots_api')
+def slots_api(context, iteration):
+    slot_date = date.today() + timedelta(days=iteration % 30)
+    return context.anonymous.get(reverse('appointments:available_slots_api'), {'date': slot_date.isoformat()})
+
+
+def _booking_slot(iteration):
+    """Cycle through every bookable (date, time) in the 30-day booking window"""
+    slots = Appointment.TIME_SLOT_CHOICES
+    day = (iteration // len(slots)) % 30 + 1
+    return date.today() + timedelta(days=day), slots[iteration % len(slots)][0]
+
+
+def free_booking_slot(context, iteration):
+    slot_date, slot_time = _booking_slot(iteration)
+    Appointment.objects.filter(
+        slot_date=slot_date, slot_time=slot_time, status__in=ACTIVE_STATUSES
+    ).update(status='cancelled')
+
+
+@scenario('book_appointment', prepare=free_booking_slot)
+def book_appointment(context, iteration):
+    slot_date, slot_time = _booking_slot(iteration)
+    make, model = VEHICLES[iteration % len(VEHICLES)]
+    response = context.customer.post(reverse('appointments:book_appointment'), {
+        'selected_service': context.service_ids[iteration % len(context.service_ids)],
+        'slot_date': slot_date.isoformat(),
+        'slot_time': slot_time,
+        'vehicle_make': make,
+        'vehicle_model': model,
+        'vehicle_year': 2020,
+        'vehicle_license': f'BEN-{iteration:05d}',
+    })
+    if response.status_code != 302:
+        raise BenchmarkError('Booking form was rejected')
+    return response
+
+
+@scenario('employee_dashboard')
+def employee_dashboard(context, iteration):
+    return context.employee.get(reverse('accounts:employee_dashboard'))
+
+
+@scenario('super_employee_dashboard')
+def super_employee_dashboard(context, iteration):
+    return context.super_employee.get(reverse('accounts:employee_dashboard'))
+
+
+@scenario('admin_statistics')
+def admin_statistics(context, iteration):
+    clear_dashboard_cache()
+    get_admin_statistics()
+
+
+@scenario('admin_statistics_cached')
+def admin_statistics_cached(context, iteration):
+    get_admin_statistics()
+
+
+@scenario('dashboard_charts')
+def dashboard_charts(context, iteration):
+    chart_type = ('appointments', 'revenue', 'services', 'employees')[iteration % 4]
+    return context.admin.get(reverse('admin_panel:dashboard_charts_ajax'), {'type': chart_type, 'days': 30})
+
+
+@scenario('quick_stats')
+def quick_stats(context, iteration):
+    return context.admin.get(reverse('admin_panel:quick_stats_ajax'))
+
+
+def percentile(values, fraction):
+    """Linearly interpolated percentile of a non-empty list"""
+    values = sorted(values)
+    position = (len(values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def summarize(timings_ms, query_counts=None):
+    summary = {
+        'iterations': len(timings_ms),
+        'mean_ms': round(sum(timings_ms) / len(timings_ms), 3),
+        'min_ms': round(min(timings_ms), 3),
+        'p50_ms': round(percentile(timings_ms, 0.50), 3),
+        'p90_ms': round(percentile(timings_ms, 0.90), 3),
+        'p95_ms': round(percentile(timings_ms, 0.95), 3),
+        'p99_ms': round(percentile(timings_ms, 0.99), 3),
+        'max_ms': round(max(timings_ms), 3),
+    }
+    if query_counts:
+        summary['queries_mean'] = round(sum(query_counts) / len(query_counts), 2)
+        summary['queries_max'] = max(query_counts)
+    return summary
+
+
+def run_scenario(name, context, iterations, warmup=3):
+    """Run a scenario ``iterations`` times (after ``warmup`` untimed runs) and summarize it"""
+    func, prepare = SCENARIOS[name]
+    for iteration in range(warmup):
+        if prepare:
+            prepare(context, iteration)
+        _check(func(context, iteration))
+
+    timings_ms = []
+    query_counts = []
+    for iteration in range(warmup, warmup + iterations):
+        if prepare:
+            prepare(context, iteration)
+        with record_queries() as queries:
+            start = time.perf_counter()
+            response = func(context, iteration)
+            timings_ms.append((time.perf_counter() - start) * 1000)
+        _check(response)
+        query_counts.append(len(queries))
+    return summarize(timings_ms, query_counts)
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """
+    Regressions against a baseline run
+
+    A scenario regresses when its p95 latency grows by more than
+    ``tolerance`` (a fraction) or it runs more queries than before.
+
+    Returns:
+        List of (scenario, metric, baseline value, current value)
+    """
+    regressions = []
+    for name, current in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous:
+            continue
+        if current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append((name, 'p95_ms', previous['p95_ms'], current['p95_ms']))
+        if current['queries_max'] > previous['queries_max']:
+            regressions.append((name, 'queries_max', previous['queries_max'], current['queries_max']))
+    return regressions
+
+
+def seed_benchmark_data(customers, employees, appointments, seed=42):
+    """
+    Populate an empty database with a deterministic synthetic workload
+
+    Uses LoadDataGenerator for a small catalog, ``customers`` customers,
+    ``employees`` employees and ``appointments`` appointments over the last
+    180 and next 14 days, plus an admin user.
+    """
+    cache.clear()
+    generator = LoadDataGenerator(seed=seed, prefix='bench')
+    quotable = generator.generate_catalog(categories=4, services=12)
+    customer_ids = generator.generate_customers(customers)
+    employee_ids = generator.generate_employees(employees)
+    generator.generate_appointments(
+        appointments, customer_ids, employee_ids, quotable, days_back=180, days_ahead=14
+    )
+    User.objects.create(
+        username='bench_admin', role='admin', is_staff=True, is_superuser=True, password=make_password(None)
+    )
+
+
+def _booking_worker(index, customer_pk, service_ids, attempts, seed, barrier, results):
+    """One booking process: check the slot API for a day, then book its first free slot"""
+    connections.close_all()  # never share the parent's connection across fork()
+    client = Client()
+    client.force_login(User.objects.get(pk=customer_pk))
+    samples = []
+    barrier.wait()
+    for attempt in range(attempts):
+        slot_date = date.today() + timedelta(days=(index + attempt * 7 + seed) % 30 + 1)
+        start = time.perf_counter()
+        try:
+            slots = client.get(
+                reverse('appointments:available_slots_api'), {'date': slot_date.isoformat()}
+            ).json().get('slots', [])
+            if not slots:
+                samples.append(('no_slot', None, None))
+                continue
+            make, model = VEHICLES[attempt % len(VEHICLES)]
+            response = client.post(reverse('appointments:book_appointment'), {
+                'selected_service': service_ids[(index + attempt) % len(service_ids)],
+                'slot_date': slot_date.isoformat(),
+                'slot_time': slots[0]['time'],
+                'vehicle_make': make,
+                'vehicle_model': model,
+                'vehicle_year': 2020,
+                'vehicle_license': f'CON-{index:03d}-{attempt:05d}',
+            })
+        except DatabaseError as exc:
+            samples.append(('error', None, str(exc)))
+            continue
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        samples.append(('booked' if response.status_code == 302 else 'rejected', elapsed_ms, None))
+    connections.close_all()
+    results.put(samples)
+
+
+def run_booking_concurrency(workers, attempts, seed=42):
+    """
+    Drive the booking flow from ``workers`` processes at once
+
+    Every active upcoming appointment is cancelled first, then each worker
+    process (logged in as its own customer, like one gunicorn worker) asks the
+    slot API for a day in the booking window and books the first free slot,
+    so workers compete for the same slots. Database errors (e.g. "database
+    is locked") are counted, not raised. Needs the ``fork`` start method.
+
+    Returns:
+        Summary dict with throughput, latency percentiles, outcome counts and
+        the number of double-booked slots
+    """
+    Appointment.objects.filter(slot_date__gte=date.today(), status__in=ACTIVE_STATUSES).update(status='cancelled')
+    customer_pks = list(User.objects.filter(role='customer').order_by('pk').values_list('pk', flat=True)[:workers])
+    if len(customer_pks) < workers:
+        raise BenchmarkError(f'Concurrency benchmark needs {workers} customers, found {len(customer_pks)}')
+    service_ids = list(Service.objects.filter(is_active=True).values_list('pk', flat=True))
+    connections.close_all()
+
+    context = multiprocessing.get_context('fork')
+    barrier = context.Barrier(workers + 1)
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=_booking_worker,
+            args=(index, customer_pks[index], service_ids, attempts, seed, barrier, results),
+        )
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    barrier.wait()
+    start = time.perf_counter()
+    samples = [sample for _ in processes for sample in results.get()]
+    elapsed = time.perf_counter() - start
+    for process in processes:
+        process.join()
+
+    outcomes = {'booked': 0, 'rejected': 0, 'no_slot': 0, 'error': 0}
+    errors = {}
+    timings_ms = []
+    for outcome, elapsed_ms, error in samples:
+        outcomes[outcome] += 1
+        if elapsed_ms is not None:
+            timings_ms.append(elapsed_ms)
+        if error is not None:
+            errors[error] = errors.get(error, 0) + 1
+
+    double_booked = Appointment.objects.filter(
+        slot_date__gte=date.today(), status__in=ACTIVE_STATUSES
+    ).values('slot_date', 'slot_time').annotate(total=Count('pk')).filter(total__gt=1).count()
+    summary = summarize(timings_ms) if timings_ms else {}
+    summary.update({
+        'workers': workers,
+        'attempts': len(samples),
+        'seconds': round(elapsed, 3),
+        'attempts_per_second': round(len(samples) / elapsed, 2),
+        'outcomes': outcomes,
+        'errors': errors,
+        'double_booked_slots': double_booked,
+    })
+    return summary
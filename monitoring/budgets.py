@@ -0,0 +1,72 @@
+"""
+Per-view query budgets
+
+A budget is the maximum number of database queries a single request to a
+view may run. It is declared with the ``@query_budget(n)`` decorator (or a
+``query_budget`` attribute on a class-based view), or in
+``settings.QUERY_BUDGETS`` keyed by URL name::
+
+    QUERY_BUDGETS = {'appointments:appointment_list': 6}
+
+``QueryBudgetMiddleware`` checks budgets on every request and
+``monitoring.testing.QueryBudgetTestMixin`` asserts them in tests.
+"""
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+
+class QueryBudgetExceeded(Exception):
+    """A request ran more queries than its view's budget allows"""
+
+    def __init__(self, view_name, budget, queries):
+        self.view_name = view_name
+        self.budget = budget
+        self.queries = queries
+        super().__init__(
+            f'{view_name} ran {len(queries)} queries (budget {budget})'
+        )
+
+
+def query_budget(max_queries):
+    """Declare the maximum number of queries a request to this view may run"""
+    def decorator(view_func):
+        view_func.query_budget = max_queries
+        return view_func
+    return decorator
+
+
+def get_query_budget(view_func, url_name=None):
+    """Budget for a view: its own declaration first, then settings.QUERY_BUDGETS"""
+    budget = getattr(view_func, 'query_budget', None)
+    view_class = getattr(view_func, 'view_class', None)
+    if budget is None and view_class is not None:
+        budget = getattr(view_class, 'query_budget', None)
+    if budget is None and url_name:
+        budget = getattr(settings, 'QUERY_BUDGETS', {}).get(url_name)
+    return budget
+
+
+class QueryRecorder:
+    """Database execute wrapper recording the SQL of every query"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def __len__(self):
+        return len(self.queries)
+
+
+@contextmanager
+def record_queries():
+    """Record the queries run on every database connection in this thread"""
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield recorder
@@ -0,0 +1,245 @@
+"""
+Synthetic data at production scale
+
+``LoadDataGenerator`` builds a service catalog with pricing matrices,
+customers, employees (with super employees supervising the rest) and
+appointments, using ``bulk_create`` in fixed-size batches. Every value comes
+from a ``random.Random(seed)``, so the same arguments always produce the same
+data set. Used by ``manage.py generate_load_data`` and the benchmarks.
+"""
+import random
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from accounts.models import Employee, User
+from appointments.models import Appointment
+from appointments.notifications import ACTIVE_STATUSES
+from services.catalog import invalidate_catalog
+from services.models import Service, ServiceCategory, ServicePrice
+from services.pricing import invalidate_pricing_matrix
+
+DEFAULT_BATCH_SIZE = 5000
+
+CATEGORY_NAMES = [
+    ('Performance', 'fas fa-tachometer-alt'), ('Exterior', 'fas fa-car'), ('Interior', 'fas fa-chair'),
+    ('Audio & Electronics', 'fas fa-volume-up'), ('Wheels & Tires', 'fas fa-circle'),
+    ('Lighting', 'fas fa-lightbulb'), ('Suspension', 'fas fa-sort-amount-down'), ('Detailing', 'fas fa-spray-can'),
+]
+SERVICE_ADJECTIVES = ['Custom', 'Premium', 'Sport', 'Stage 1', 'Stage 2', 'Pro', 'Signature', 'Track', 'Urban']
+SERVICE_NOUNS = [
+    'Engine Tuning', 'Exhaust Upgrade', 'Body Kit', 'Paint Job', 'Ceramic Coating', 'Seat Upgrade',
+    'Sound System', 'Alloy Wheels', 'LED Conversion', 'Coilover Install', 'Window Tint', 'Wrap',
+]
+VEHICLE_TYPES = [('Hatchback', '0.85'), ('Sedan', '1.00'), ('SUV', '1.20'), ('Sports Car', '1.45'), ('Luxury', '1.70')]
+COMPLEXITY_LEVELS = [('Basic', '0.80'), ('Standard', '1.00'), ('Premium', '1.35')]
+VEHICLES = [
+    ('Toyota', 'Camry'), ('Honda', 'Civic'), ('Ford', 'Mustang'), ('BMW', '3 Series'), ('Audi', 'A4'),
+    ('Hyundai', 'Creta'), ('Maruti', 'Swift'), ('Tata', 'Nexon'), ('Mahindra', 'Thar'), ('Kia', 'Seltos'),
+]
+FIRST_NAMES = ['Aarav', 'Priya', 'Rohan', 'Ananya', 'Vikram', 'Isha', 'Arjun', 'Meera', 'Kabir', 'Sara', 'Dev', 'Nisha']
+LAST_NAMES = ['Sharma', 'Patel', 'Singh', 'Gupta', 'Reddy', 'Iyer', 'Khan', 'Das', 'Mehta', 'Nair', 'Joshi', 'Rao']
+PRIORITY_WEIGHTS = [('low', 15), ('normal', 60), ('high', 20), ('urgent', 5)]
+
+
+class LoadDataGenerator:
+    """
+    Deterministic bulk data generator
+
+    Args:
+        seed: Random seed
+        prefix: Prefix for generated usernames and employee ids
+        batch_size: Rows per bulk_create batch
+        progress: Optional callable receiving progress messages
+    """
+
+    def __init__(self, seed=42, prefix='load', batch_size=DEFAULT_BATCH_SIZE, progress=None):
+        self.rng = random.Random(seed)
+        self.prefix = prefix
+        self.batch_size = batch_size
+        self.progress = progress or (lambda message: None)
+        self.password = make_password(None)
+
+    def prefix_in_use(self):
+        return User.objects.filter(username__startswith=f'{self.prefix}_').exists()
+
+    def generate_catalog(self, categories, services):
+        """
+        Create categories, services and their pricing matrices
+
+        Most services get a full vehicle type x complexity matrix, some only
+        vehicle-type prices, and the rest rely on their base price.
+
+        Returns:
+            {service_id: [price, ...]} of the prices an appointment can be quoted
+        """
+        category_objects = []
+        for index in range(categories):
+            name, icon = CATEGORY_NAMES[index % len(CATEGORY_NAMES)]
+            if index >= len(CATEGORY_NAMES):
+                name = f'{name} {index // len(CATEGORY_NAMES) + 1}'
+            category, _ = ServiceCategory.objects.get_or_create(
+                name=name, defaults={'description': f'{name} modifications', 'icon': icon}
+            )
+            category_objects.append(category)
+
+        service_objects = Service.objects.bulk_create([
+            Service(
+                name=f'{self.rng.choice(SERVICE_ADJECTIVES)} {self.rng.choice(SERVICE_NOUNS)}',
+                description='Generated load-test service',
+                category=category_objects[index % len(category_objects)],
+                base_price=Decimal(self.rng.randrange(199, 4999)) + Decimal('0.99'),
+                estimated_duration=timedelta(hours=self.rng.randint(1, 12)),
+            )
+            for index in range(services)
+        ], batch_size=self.batch_size)
+
+        quotable = {}
+        prices = []
+        for service in service_objects:
+            shape = self.rng.random()
+            if shape < 0.6:
+                levels = COMPLEXITY_LEVELS
+            elif shape < 0.85:
+                levels = [('', '1.00')]
+            else:
+                quotable[service.pk] = [service.base_price]
+                continue
+            for vehicle_type, vehicle_factor in VEHICLE_TYPES:
+                for complexity_level, complexity_factor in levels:
+                    price = (service.base_price * Decimal(vehicle_factor) * Decimal(complexity_factor)).quantize(Decimal('1'))
+                    prices.append(ServicePrice(
+                        service=service,
+                        vehicle_type=vehicle_type,
+                        complexity_level=complexity_level,
+                        price=price - Decimal('0.01'),
+                    ))
+                    quotable.setdefault(service.pk, []).append(price - Decimal('0.01'))
+        ServicePrice.objects.bulk_create(prices, batch_size=self.batch_size)
+        invalidate_pricing_matrix()
+        invalidate_catalog()
+        self.progress(f'Created {len(category_objects)} categories, {len(service_objects)} services, {len(prices)} prices')
+        return quotable
+
+    def generate_customers(self, count):
+        """Create ``count`` customers and return their ids"""
+        ids = []
+        for start in range(0, count, self.batch_size):
+            users = User.objects.bulk_create([
+                self._user('customer', index) for index in range(start, min(start + self.batch_size, count))
+            ])
+            ids.extend(user.pk for user in users)
+        self.progress(f'Created {count} customers')
+        return ids
+
+    def generate_employees(self, count):
+        """
+        Create ``count`` employees, one in ten a super employee supervising the others
+
+        Returns:
+            Ids of the employees' users
+        """
+        users = []
+        for start in range(0, count, self.batch_size):
+            users.extend(User.objects.bulk_create([
+                self._user('employee', index) for index in range(start, min(start + self.batch_size, count))
+            ]))
+
+        employees = [
+            Employee(
+                user=user,
+                employee_id=f'{self.prefix.upper()}{index:07d}',
+                employee_type='super' if index % 10 == 0 else 'regular',
+                specialization=self.rng.choice(CATEGORY_NAMES)[0],
+                hire_date=date.today() - timedelta(days=self.rng.randint(30, 3650)),
+                performance_rating=Decimal(self.rng.randint(300, 500)) / 100,
+            )
+            for index, user in enumerate(users)
+        ]
+        Employee.objects.bulk_create(employees, batch_size=self.batch_size)
+
+        supervisors = [employee for employee in employees if employee.employee_type == 'super']
+        for index, employee in enumerate(employees):
+            if employee.employee_type == 'regular':
+                employee.supervisor = supervisors[(index // 10) % len(supervisors)]
+        Employee.objects.bulk_update(
+            [employee for employee in employees if employee.supervisor_id],
+            ['supervisor'], batch_size=self.batch_size
+        )
+        self.progress(f'Created {count} employees ({len(supervisors)} super employees)')
+        return [user.pk for user in users]
+
+    def generate_appointments(self, count, customer_ids, employee_ids, quotable, days_back=365, days_ahead=30):
+        """
+        Create ``count`` appointments between ``days_back`` ago and ``days_ahead`` from today
+
+        Past appointments are completed or cancelled. Upcoming ones are active
+        while their slot is free and cancelled otherwise, so each slot keeps at
+        most one active appointment, as the booking rules require.
+        """
+        today = date.today()
+        slot_times = [slot for slot, _ in Appointment.TIME_SLOT_CHOICES]
+        service_ids = list(quotable)
+        priorities, priority_weights = zip(*PRIORITY_WEIGHTS)
+        occupied = set(Appointment.objects.filter(
+            slot_date__gte=today, status__in=ACTIVE_STATUSES
+        ).values_list('slot_date', 'slot_time'))
+        now = timezone.now()
+
+        created = 0
+        while created < count:
+            batch = []
+            for index in range(created, min(created + self.batch_size, count)):
+                slot_date = today + timedelta(days=self.rng.randint(-days_back, days_ahead))
+                slot_time = self.rng.choice(slot_times)
+                slot_start = timezone.make_aware(datetime.combine(slot_date, time.fromisoformat(slot_time)))
+                service_id = self.rng.choice(service_ids)
+                make, model = self.rng.choice(VEHICLES)
+                appointment = Appointment(
+                    customer_id=self.rng.choice(customer_ids),
+                    selected_service_id=service_id,
+                    slot_date=slot_date,
+                    slot_time=slot_time,
+                    priority=self.rng.choices(priorities, priority_weights)[0],
+                    vehicle_make=make,
+                    vehicle_model=model,
+                    vehicle_year=self.rng.randint(2005, today.year),
+                    vehicle_license=f'LD-{index:08d}',
+                    quoted_price=self.rng.choice(quotable[service_id]),
+                )
+
+                if slot_start < now:
+                    appointment.status = 'completed' if self.rng.random() < 0.85 else 'cancelled'
+                elif (slot_date, slot_time) in occupied:
+                    appointment.status = 'cancelled'
+                else:
+                    occupied.add((slot_date, slot_time))
+                    appointment.status = self.rng.choice(['booked', 'booked', 'assigned', 'in_progress'])
+
+                if appointment.status != 'booked' and employee_ids:
+                    appointment.assigned_employee_id = self.rng.choice(employee_ids)
+                if appointment.status == 'completed':
+                    appointment.work_started_at = slot_start
+                    appointment.work_completed_at = slot_start + timedelta(minutes=self.rng.randint(45, 480))
+                batch.append(appointment)
+
+            Appointment.objects.bulk_create(batch)
+            created += len(batch)
+            self.progress(f'Created {created}/{count} appointments')
+        return created
+
+    def _user(self, role, index):
+        first_name = self.rng.choice(FIRST_NAMES)
+        last_name = self.rng.choice(LAST_NAMES)
+        username = f'{self.prefix}_{role}_{index}'
+        return User(
+            username=username,
+            first_name=first_name,
+            last_name=last_name,
+            email=f'{username}@example.com',
+            role=role,
+            phone_number=f'+91{self.rng.randint(6000000000, 9999999999)}',
+            password=self.password,
+        )
@@ -0,0 +1,114 @@
+import json
+import platform
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from monitoring.benchmarks import (SCENARIOS, BenchmarkContext, compare_to_baseline, run_scenario,
+                                   seed_benchmark_data)
+
+BENCHMARK_DIR = settings.BASE_DIR / 'benchmarks'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark booking and dashboard hot paths on a synthetic test database and compare with a baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenarios', nargs='*', help=f'Scenarios to run (default: all of {", ".join(SCENARIOS)})')
+        parser.add_argument('--iterations', type=int, default=50, help='Timed runs per scenario (default: 50)')
+        parser.add_argument('--warmup', type=int, default=3, help='Untimed runs per scenario (default: 3)')
+        parser.add_argument('--customers', type=int, default=500, help='Synthetic customers (default: 500)')
+        parser.add_argument('--employees', type=int, default=50, help='Synthetic employees (default: 50)')
+        parser.add_argument('--appointments', type=int, default=20000, help='Synthetic appointments (default: 20000)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the synthetic data (default: 42)')
+        parser.add_argument('--output', default=str(BENCHMARK_DIR / 'latest.json'),
+                            help='Results file (default: benchmarks/latest.json)')
+        parser.add_argument('--baseline', default=str(BENCHMARK_DIR / 'baseline.json'),
+                            help='Baseline to compare with (default: benchmarks/baseline.json)')
+        parser.add_argument('--save-baseline', action='store_true', help='Store these results as the new baseline')
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='Allowed p95 slowdown as a fraction of the baseline (default: 0.25)')
+        parser.add_argument('--fail-on-regression', action='store_true',
+                            help='Exit with an error when a scenario regresses')
+        parser.add_argument('--keepdb', action='store_true', help='Keep the test database between runs')
+
+    def handle(self, *args, **options):
+        names = options['scenarios'] or list(SCENARIOS)
+        unknown = [name for name in names if name not in SCENARIOS]
+        if unknown:
+            raise CommandError(f'Unknown scenario(s): {", ".join(unknown)}')
+        if options['customers'] < 1 or options['employees'] < 2:
+            raise CommandError('Benchmarks need at least 1 customer and 2 employees')
+
+        # Run against a throwaway test database, keeping benchmark samples out of the live metrics
+        # and dashboard reads off any configured replica
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        try:
+            with tempfile.TemporaryDirectory() as metrics_dir, override_settings(
+                METRICS_DIR=Path(metrics_dir), REPORTING_DATABASE=DEFAULT_DB_ALIAS
+            ):
+                results = self.run_benchmarks(names, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        self.write_json(options['output'], results)
+        self.stdout.write(f'Results written to {options["output"]}')
+
+        baseline_path = Path(options['baseline'])
+        if options['save_baseline']:
+            self.write_json(baseline_path, results)
+            self.stdout.write(self.style.SUCCESS(f'Baseline saved to {baseline_path}'))
+            return
+        if not baseline_path.exists():
+            self.stdout.write(f'No baseline at {baseline_path}; run with --save-baseline to create one')
+            return
+
+        regressions = compare_to_baseline(results, json.loads(baseline_path.read_text()), options['tolerance'])
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
+            return
+        for name, metric, previous, current in regressions:
+            self.stdout.write(self.style.WARNING(f'Regression: {name} {metric} {previous} -> {current}'))
+        if options['fail_on_regression']:
+            raise CommandError(f'{len(regressions)} regression(s) against the baseline')
+
+    def run_benchmarks(self, names, options):
+        self.stdout.write(
+            f'Seeding {options["customers"]} customers, {options["employees"]} employees, '
+            f'{options["appointments"]} appointments...'
+        )
+        seed_benchmark_data(options['customers'], options['employees'], options['appointments'], options['seed'])
+        context = BenchmarkContext()
+
+        results = {
+            'created_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'database': connection.vendor,
+            'data': {key: options[key] for key in ('customers', 'employees', 'appointments', 'seed')},
+            'iterations': options['iterations'],
+            'scenarios': {},
+        }
+        self.stdout.write(
+            f'{"Scenario":<26} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"max ms":>8} {"queries":>8}'
+        )
+        for name in names:
+            summary = run_scenario(name, context, options['iterations'], options['warmup'])
+            results['scenarios'][name] = summary
+            self.stdout.write(
+                f'{name:<26} {summary["p50_ms"]:>8.2f} {summary["p95_ms"]:>8.2f} {summary["p99_ms"]:>8.2f} '
+                f'{summary["max_ms"]:>8.2f} {summary["queries_max"]:>8}'
+            )
+        return results
+
+    @staticmethod
+    def write_json(path, data):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, indent=2) + '\n')
@@ -0,0 +1,84 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from monitoring.benchmarks import run_booking_concurrency, seed_benchmark_data
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the booking flow under concurrent load on a synthetic test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help='Concurrent booking processes (default: 8)')
+        parser.add_argument('--attempts', type=int, default=25, help='Booking attempts per worker (default: 25)')
+        parser.add_argument('--customers', type=int, default=200, help='Synthetic customers (default: 200)')
+        parser.add_argument('--employees', type=int, default=10, help='Synthetic employees (default: 10)')
+        parser.add_argument('--appointments', type=int, default=5000, help='Synthetic appointments (default: 5000)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the synthetic data (default: 42)')
+        parser.add_argument('--no-tuning', action='store_true',
+                            help='Disable persistent connections and SQLite pragmas, for comparison')
+        parser.add_argument('--output', help='Also write the results to this JSON file')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1 or options['customers'] < options['workers']:
+            raise CommandError('Need at least one worker and one customer per worker')
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            if connection.vendor == 'sqlite':
+                # Worker processes need a real file; the default test database lives in memory
+                connection.settings_dict['TEST']['NAME'] = str(Path(temp_dir) / 'benchmark.sqlite3')
+            tuning = {}
+            if options['no_tuning']:
+                connection.settings_dict['CONN_MAX_AGE'] = 0
+                tuning['SQLITE_PRAGMAS'] = {}
+
+            setup_test_environment()
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+            try:
+                with override_settings(
+                    METRICS_DIR=Path(temp_dir) / 'metrics', REPORTING_DATABASE=DEFAULT_DB_ALIAS, **tuning
+                ):
+                    # Reconnect so the pragmas (or their absence) apply from the start
+                    connection.close()
+                    self.stdout.write(
+                        f'Seeding {options["customers"]} customers, {options["employees"]} employees, '
+                        f'{options["appointments"]} appointments...'
+                    )
+                    seed_benchmark_data(
+                        options['customers'], options['employees'], options['appointments'], options['seed']
+                    )
+                    results = run_booking_concurrency(options['workers'], options['attempts'], options['seed'])
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                teardown_test_environment()
+
+        results['database'] = connection.vendor
+        results['tuning'] = not options['no_tuning']
+        self.report(results)
+        if options['output']:
+            path = Path(options['output'])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(results, indent=2) + '\n')
+            self.stdout.write(f'Results written to {path}')
+
+    def report(self, results):
+        self.stdout.write(
+            f'{results["attempts"]} attempts from {results["workers"]} workers in {results["seconds"]}s '
+            f'({results["attempts_per_second"]}/s)'
+        )
+        if 'p50_ms' in results:
+            self.stdout.write(
+                f'Latency ms: p50 {results["p50_ms"]:.2f}  p95 {results["p95_ms"]:.2f}  '
+                f'p99 {results["p99_ms"]:.2f}  max {results["max_ms"]:.2f}'
+            )
+        self.stdout.write('Outcomes: ' + ', '.join(f'{name} {count}' for name, count in results['outcomes'].items()))
+        for message, count in results['errors'].items():
+            self.stdout.write(self.style.WARNING(f'{count} x {message}'))
+        if results['double_booked_slots']:
+            self.stdout.write(self.style.ERROR(f'{results["double_booked_slots"]} slot(s) double-booked'))
+        elif not results['errors']:
+            self.stdout.write(self.style.SUCCESS('No database errors or double bookings'))
@@ -0,0 +1,58 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from admin_panel.utils import clear_dashboard_cache
+from monitoring.loadgen import DEFAULT_BATCH_SIZE, LoadDataGenerator
+
+
+class Command(BaseCommand):
+    help = 'Generate a reproducible production-scale data set (catalog, pricing, users, appointments) with bulk_create'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--customers', type=int, default=10000, help='Customers to create (default: 10000)')
+        parser.add_argument('--employees', type=int, default=1000, help='Employees to create (default: 1000)')
+        parser.add_argument('--appointments', type=int, default=1000000,
+                            help='Appointments to create (default: 1000000)')
+        parser.add_argument('--categories', type=int, default=8, help='Service categories (default: 8)')
+        parser.add_argument('--services', type=int, default=200, help='Services, each with a pricing matrix (default: 200)')
+        parser.add_argument('--days-back', type=int, default=365, help='History spread in days (default: 365)')
+        parser.add_argument('--days-ahead', type=int, default=30, help='Upcoming spread in days (default: 30)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+        parser.add_argument('--prefix', default='load', help='Username prefix for generated users (default: load)')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help=f'Rows per bulk_create batch (default: {DEFAULT_BATCH_SIZE})')
+        parser.add_argument('--skip-search-index', action='store_true',
+                            help='Do not rebuild the search index afterwards')
+
+    def handle(self, *args, **options):
+        if options['customers'] < 1 or options['services'] < 1 or options['categories'] < 1:
+            raise CommandError('At least one customer, category and service is required')
+
+        generator = LoadDataGenerator(
+            seed=options['seed'],
+            prefix=options['prefix'],
+            batch_size=options['batch_size'],
+            progress=self.stdout.write,
+        )
+        if generator.prefix_in_use():
+            raise CommandError(f'Users prefixed "{options["prefix"]}_" already exist; choose another --prefix')
+
+        start = time.perf_counter()
+        quotable = generator.generate_catalog(options['categories'], options['services'])
+        customer_ids = generator.generate_customers(options['customers'])
+        employee_ids = generator.generate_employees(options['employees'])
+        generator.generate_appointments(
+            options['appointments'], customer_ids, employee_ids, quotable,
+            days_back=options['days_back'], days_ahead=options['days_ahead'],
+        )
+
+        # bulk_create bypasses the signals that maintain these
+        clear_dashboard_cache()
+        if not options['skip_search_index']:
+            call_command('rebuild_search_index', stdout=self.stdout)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully generated load data in {time.perf_counter() - start:.1f}s')
+        )
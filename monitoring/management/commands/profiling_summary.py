@@ -0,0 +1,85 @@
+from django.core.management.base import BaseCommand, CommandError
+from monitoring.profiling import get_log_path, read_profile_log
+
+SORT_KEYS = {
+    'sql': 'sql_ms',
+    'time': 'duration_ms',
+    'queries': 'queries',
+    'requests': 'requests',
+}
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class Command(BaseCommand):
+    help = 'Summarize the request profiling log: hottest endpoints and most duplicated queries'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--log', help='Profiling log file (default: settings.PROFILING_LOG_FILE)')
+        parser.add_argument('--sort', choices=list(SORT_KEYS), default='sql',
+                            help='Rank endpoints by total SQL time, response time, queries or request count (default: sql)')
+        parser.add_argument('--limit', type=int, default=10, help='Number of endpoints to show (default: 10)')
+        parser.add_argument('--queries', type=int, default=5,
+                            help='Number of duplicated query fingerprints to show (default: 5)')
+
+    def handle(self, *args, **options):
+        endpoints = {}
+        fingerprints = {}
+        for record in read_profile_log(options['log']):
+            key = record.get('view') or record.get('path')
+            endpoint = endpoints.setdefault(key, {
+                'requests': 0, 'duration_ms': [], 'queries': 0, 'sql_ms': 0.0, 'slow_queries': 0,
+            })
+            endpoint['requests'] += 1
+            endpoint['duration_ms'].append(record['duration_ms'])
+            endpoint['queries'] += record['queries']
+            endpoint['sql_ms'] += record['sql_ms']
+            endpoint['slow_queries'] += len(record.get('slow_queries', []))
+
+            for duplicate in record.get('duplicates', []):
+                entry = fingerprints.setdefault(duplicate['fingerprint'], {
+                    'sql': duplicate['sql'], 'views': set(), 'requests': 0, 'count': 0,
+                })
+                entry['views'].add(key)
+                entry['requests'] += 1
+                entry['count'] += duplicate['count']
+
+        if not endpoints:
+            raise CommandError(f'No profiling records found in {options["log"] or get_log_path()}')
+
+        sort_key = SORT_KEYS[options['sort']]
+
+        def rank(item):
+            value = item[1][sort_key]
+            return sum(value) if isinstance(value, list) else value
+
+        self.stdout.write(
+            f'{"Endpoint":<45} {"Reqs":>6} {"Avg ms":>8} {"p95 ms":>8} {"Avg q":>6} {"SQL ms":>10} {"Slow":>5}'
+        )
+        for key, endpoint in sorted(endpoints.items(), key=rank, reverse=True)[:options['limit']]:
+            requests = endpoint['requests']
+            self.stdout.write(
+                f'{str(key)[:45]:<45} {requests:>6} '
+                f'{sum(endpoint["duration_ms"]) / requests:>8.1f} '
+                f'{_percentile(endpoint["duration_ms"], 0.95):>8.1f} '
+                f'{endpoint["queries"] / requests:>6.1f} '
+                f'{endpoint["sql_ms"]:>10.1f} '
+                f'{endpoint["slow_queries"]:>5}'
+            )
+
+        if fingerprints and options['queries']:
+            self.stdout.write('')
+            self.stdout.write('Most duplicated queries:')
+            ranked = sorted(fingerprints.items(), key=lambda item: item[1]['count'], reverse=True)
+            for fingerprint, entry in ranked[:options['queries']]:
+                self.stdout.write(
+                    f'  [{fingerprint}] {entry["count"]} runs in {entry["requests"]} request(s) '
+                    f'({", ".join(sorted(map(str, entry["views"])))})'
+                )
+                self.stdout.write(f'    {entry["sql"][:160]}')
+
+        total = sum(endpoint['requests'] for endpoint in endpoints.values())
+        self.stdout.write(self.style.SUCCESS(f'Summarized {total} request(s) across {len(endpoints)} endpoint(s)'))
@@ -0,0 +1,42 @@
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = 'Refresh the SQLite snapshot that serves reporting queries (REPLICA_DATABASE_URL)'
+
+    def handle(self, *args, **options):
+        alias = settings.REPORTING_DATABASE
+        if alias == DEFAULT_DB_ALIAS:
+            raise CommandError('No replica configured; set REPLICA_DATABASE_URL')
+        source = connections[DEFAULT_DB_ALIAS]
+        target = connections[alias]
+        if source.vendor != 'sqlite' or target.vendor != 'sqlite':
+            raise CommandError('Snapshots need SQLite on both sides; other replicas are kept current by replication')
+
+        path = Path(target.settings_dict['NAME'])
+        temp_path = path.with_name(f'{path.name}.tmp')
+        temp_path.unlink(missing_ok=True)
+        start = time.perf_counter()
+
+        source.ensure_connection()
+        snapshot = sqlite3.connect(temp_path)
+        try:
+            # Online backup: a consistent copy while bookings keep writing
+            source.connection.backup(snapshot)
+            # The copy inherits WAL mode; readers of a file that gets replaced must not share -wal files
+            snapshot.execute('PRAGMA journal_mode = DELETE')
+        finally:
+            snapshot.close()
+        # Atomic swap: open readers keep the old file, new connections see the new one
+        os.replace(temp_path, path)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Replica {path} refreshed in {time.perf_counter() - start:.1f}s'
+        ))
@@ -0,0 +1,240 @@
+"""
+Counters and histograms in the Prometheus text exposition format
+
+Each process keeps its samples in memory and writes them to its own file in
+``settings.METRICS_DIR`` at most every ``METRICS_FLUSH_SECONDS`` (and at exit);
+``render_metrics()`` sums the files of every live process, so all gunicorn
+workers on the host are aggregated in one scrape. Files of exited processes
+are deleted: their counters drop out, which Prometheus treats as a counter
+reset.
+
+    BOOKINGS = Counter('carmodx_bookings_total', 'Appointment bookings', ['outcome'])
+    BOOKINGS.inc(outcome='booked')
+
+    LATENCY = Histogram('carmodx_booking_duration_seconds', 'Booking latency', ['method'])
+    with LATENCY.time(method='POST'):
+        ...
+"""
+import asyncio
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+
+from django.conf import settings
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REGISTRY = {}
+
+
+class MetricsStore:
+    """This process's samples, flushed to a file of its own"""
+
+    def __init__(self):
+        self.samples = {}
+        self.lock = threading.Lock()
+        self.timer = None
+        self.pid = None
+        self.filename = None
+
+    def add(self, *increments):
+        """
+        Apply ``(key, amount)`` increments
+
+        The file is written by a timer at most every
+        settings.METRICS_FLUSH_SECONDS, so a request only updates a dict,
+        and a worker that goes quiet still flushes its last samples.
+        """
+        with self.lock:
+            self._check_process()
+            for key, amount in increments:
+                self.samples[key] = self.samples.get(key, 0) + amount
+            if self.timer is None:
+                self.timer = threading.Timer(getattr(settings, 'METRICS_FLUSH_SECONDS', 1.0), self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self):
+        """Write this process's samples (atomically) if they changed since the last flush"""
+        with self.lock:
+            if self.timer is None or self.pid != os.getpid():
+                return
+            self.timer.cancel()
+            self.timer = None
+            payload = json.dumps([[list(key), value] for key, value in self.samples.items()])
+            path = get_metrics_dir() / self.filename
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix('.tmp')
+            temp_path.write_text(payload)
+            os.replace(temp_path, path)
+
+    def _check_process(self):
+        """Give a new (e.g. forked worker) process an empty store and its own file"""
+        if self.pid != os.getpid():
+            self.pid = os.getpid()
+            self.filename = f'{self.pid}-{time.time_ns()}.json'
+            self.samples = {}
+            self.timer = None  # the parent's timer thread did not survive the fork
+
+
+_store = MetricsStore()
+atexit.register(_store.flush)
+
+
+def get_metrics_dir():
+    return Path(getattr(settings, 'METRICS_DIR', settings.BASE_DIR / 'metrics'))
+
+
+class Metric:
+    """Base class: a named family of samples, one per label combination"""
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        REGISTRY[name] = self
+
+    def _labels(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} expects labels {self.labelnames}, got {tuple(labels)}')
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        _store.add(((self.name, '', self._labels(labels)), amount))
+
+
+class Histogram(Metric):
+    """Observations counted into cumulative buckets"""
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        label_values = self._labels(labels)
+        increments = [((self.name, 'sum', label_values), value), ((self.name, 'count', label_values), 1)]
+        for bound in self.buckets:
+            if value <= bound:
+                increments.append(((self.name, f'bucket:{bound}', label_values), 1))
+                break
+        _store.add(*increments)
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def timed(self, **labels):
+        """Decorator observing the duration of every call"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.time(**labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def time_view(self, view_func):
+        """View decorator (sync or async) observing response time, labelled by request method"""
+        if asyncio.iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                with self.time(method=request.method):
+                    return await view_func(request, *args, **kwargs)
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            with self.time(method=request.method):
+                return view_func(request, *args, **kwargs)
+        return wrapper
+
+
+def _collect():
+    """Sum the samples of every live process's file, deleting those of exited processes"""
+    _store.flush()
+    totals = {}
+    for path in get_metrics_dir().glob('*.json'):
+        if not _process_alive(int(path.name.split('-', 1)[0])):
+            path.unlink(missing_ok=True)
+            continue
+        try:
+            entries = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        for (name, kind, label_values), value in entries:
+            key = (name, kind, tuple(label_values))
+            totals[key] = totals.get(key, 0) + value
+    return totals
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by another user
+    return True
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_metrics():
+    """All registered metrics, aggregated across processes, in text exposition format"""
+    totals = _collect()
+    lines = []
+    for name, metric in sorted(REGISTRY.items()):
+        lines.append(f'# HELP {name} {metric.documentation}')
+        lines.append(f'# TYPE {name} {metric.type}')
+        series = sorted({label_values for (sample, _, label_values) in totals if sample == name})
+
+        for label_values in series:
+            if metric.type == 'counter':
+                value = totals.get((name, '', label_values), 0)
+                lines.append(f'{name}{_format_labels(metric.labelnames, label_values)} {_format_value(value)}')
+                continue
+
+            cumulative = 0
+            for bound in metric.buckets:
+                cumulative += totals.get((name, f'bucket:{bound}', label_values), 0)
+                labels = _format_labels(metric.labelnames, label_values, ('le', repr(float(bound))))
+                lines.append(f'{name}_bucket{labels} {cumulative}')
+            count = totals.get((name, 'count', label_values), 0)
+            labels = _format_labels(metric.labelnames, label_values, ('le', '+Inf'))
+            lines.append(f'{name}_bucket{labels} {count}')
+            labels = _format_labels(metric.labelnames, label_values)
+            lines.append(f'{name}_sum{labels} {_format_value(totals.get((name, "sum", label_values), 0.0))}')
+            lines.append(f'{name}_count{labels} {count}')
+    return '\n'.join(lines) + '\n'
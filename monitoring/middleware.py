@@ -0,0 +1,140 @@
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import timezone
+
+from .budgets import QueryBudgetExceeded, get_query_budget, record_queries
+from .profiling import get_profiling_logger, profile_queries
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def in_orm_thread(context_manager):
+    """
+    Enter a sync context manager in the thread that runs this request's async ORM queries
+
+    Query wrappers are installed per connection, and connections are per
+    thread: on the event loop thread they would never see a query.
+    """
+    value = await sync_to_async(context_manager.__enter__)()
+    try:
+        yield value
+    finally:
+        await sync_to_async(context_manager.__exit__)(None, None, None)
+
+
+class QueryBudgetMiddleware:
+    """
+    Count the queries of each request and compare them with the view's budget
+
+    Over-budget requests are logged, or raise QueryBudgetExceeded when
+    settings.QUERY_BUDGET_RAISE is set. With DEBUG on, the count is also
+    returned in an X-Query-Count header.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with record_queries() as queries:
+            response = self.get_response(request)
+        return self.check_budget(request, response, queries)
+
+    async def __acall__(self, request):
+        async with in_orm_thread(record_queries()) as queries:
+            response = await self.get_response(request)
+        return self.check_budget(request, response, queries)
+
+    def check_budget(self, request, response, queries):
+        budget = getattr(request, 'query_budget', None)
+        if budget is not None and len(queries) > budget:
+            view_name = request.resolver_match.view_name if request.resolver_match else request.path
+            if getattr(settings, 'QUERY_BUDGET_RAISE', False):
+                raise QueryBudgetExceeded(view_name, budget, queries.queries)
+            logger.warning(
+                'Query budget exceeded: %s ran %d queries (budget %d)',
+                view_name, len(queries), budget
+            )
+
+        if settings.DEBUG:
+            response['X-Query-Count'] = len(queries)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        url_name = request.resolver_match.view_name if request.resolver_match else None
+        request.query_budget = get_query_budget(view_func, url_name)
+
+
+class ProfilingMiddleware:
+    """
+    Profile the SQL of every request (opt-in with settings.PROFILING_ENABLED)
+
+    Adds a Server-Timing header (total, sql and duplicated-query metrics)
+    and writes a JSON record per request to the rotating profiling log.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.top_n = getattr(settings, 'PROFILING_TOP_QUERIES', 5)
+        self.slow_query_ms = getattr(settings, 'PROFILING_SLOW_QUERY_MS', 100)
+        self.log = get_profiling_logger()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with profile_queries() as profiler:
+            response = self.get_response(request)
+        return self.record(request, response, profiler, start)
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        async with in_orm_thread(profile_queries()) as profiler:
+            response = await self.get_response(request)
+        return self.record(request, response, profiler, start)
+
+    def record(self, request, response, profiler, start):
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        duplicates = profiler.duplicates()
+        duplicated_count = sum(group['count'] - 1 for group in duplicates)
+        response['Server-Timing'] = ', '.join([
+            f'total;dur={duration_ms:.1f}',
+            f'sql;dur={profiler.total_ms:.1f};desc="{len(profiler)} queries"',
+            f'dup;desc="{duplicated_count} duplicated"',
+        ])
+
+        self.log.info(json.dumps({
+            'time': timezone.now().isoformat(),
+            'method': request.method,
+            'path': request.path,
+            'view': request.resolver_match.view_name if request.resolver_match else None,
+            'status': response.status_code,
+            'duration_ms': round(duration_ms, 2),
+            'queries': len(profiler),
+            'sql_ms': round(profiler.total_ms, 2),
+            'duplicates': duplicates[:self.top_n],
+            'slowest': profiler.slowest(self.top_n),
+            'slow_queries': profiler.slower_than(self.slow_query_ms),
+        }))
+        return response
@@ -0,0 +1,145 @@
+"""
+Per-request SQL profiling
+
+``ProfilingMiddleware`` (enabled with ``PROFILING_ENABLED``) wraps every
+database connection with a ``QueryProfiler`` for the duration of a request
+and writes one JSON line per request to a rotating log::
+
+    {"time": "...", "method": "GET", "path": "/appointments/list/",
+     "view": "appointments:appointment_list", "status": 200,
+     "duration_ms": 41.2, "queries": 4, "sql_ms": 3.1,
+     "duplicates": [{"fingerprint": "...", "sql": "...", "count": 10, "ms": 1.2}],
+     "slowest": [{"sql": "...", "ms": 1.9}], "slow_queries": []}
+
+``slow_queries`` lists every statement slower than ``PROFILING_SLOW_QUERY_MS``.
+
+``manage.py profiling_summary`` aggregates the log by view.
+"""
+import hashlib
+import json
+import logging
+import re
+import time
+from contextlib import ExitStack, contextmanager
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+SQL_PREVIEW_LENGTH = 300
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST_RE = re.compile(r'\bIN\s*\((?:\s*(?:%s|\?)\s*,?)+\)', re.IGNORECASE)
+_SPACE_RE = re.compile(r'\s+')
+
+
+def fingerprint_sql(sql):
+    """Normalise a statement so queries differing only in literals compare equal"""
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _IN_LIST_RE.sub('IN (...)', sql)
+    return _SPACE_RE.sub(' ', sql).strip()
+
+
+class QueryProfiler:
+    """Database execute wrapper timing every statement"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, (time.perf_counter() - start) * 1000))
+
+    def __len__(self):
+        return len(self.queries)
+
+    @property
+    def total_ms(self):
+        return sum(duration for _, duration in self.queries)
+
+    def duplicates(self):
+        """Fingerprints run more than once, most frequent first"""
+        groups = {}
+        for sql, duration in self.queries:
+            fingerprint = fingerprint_sql(sql)
+            group = groups.setdefault(fingerprint, {'sql': sql, 'count': 0, 'ms': 0.0})
+            group['count'] += 1
+            group['ms'] += duration
+        duplicated = [
+            {
+                'fingerprint': hashlib.md5(fingerprint.encode()).hexdigest()[:12],
+                'sql': group['sql'][:SQL_PREVIEW_LENGTH],
+                'count': group['count'],
+                'ms': round(group['ms'], 2),
+            }
+            for fingerprint, group in groups.items() if group['count'] > 1
+        ]
+        return sorted(duplicated, key=lambda group: (-group['count'], -group['ms']))
+
+    def slower_than(self, threshold_ms):
+        """Every statement that took at least ``threshold_ms``"""
+        return [
+            {'sql': sql[:SQL_PREVIEW_LENGTH], 'ms': round(duration, 2)}
+            for sql, duration in self.queries if duration >= threshold_ms
+        ]
+
+    def slowest(self, limit):
+        """The ``limit`` slowest statements"""
+        ranked = sorted(self.queries, key=lambda query: query[1], reverse=True)[:limit]
+        return [{'sql': sql[:SQL_PREVIEW_LENGTH], 'ms': round(duration, 2)} for sql, duration in ranked]
+
+
+@contextmanager
+def profile_queries():
+    """Time the queries run on every database connection in this thread"""
+    profiler = QueryProfiler()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(profiler))
+        yield profiler
+
+
+def get_log_path():
+    return Path(getattr(settings, 'PROFILING_LOG_FILE', settings.BASE_DIR / 'logs' / 'profiling.log'))
+
+
+def get_profiling_logger():
+    """JSON-lines logger writing to the rotating profiling log"""
+    logger = logging.getLogger('monitoring.profiling')
+    if not logger.handlers:
+        path = get_log_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(
+            path,
+            maxBytes=getattr(settings, 'PROFILING_LOG_MAX_BYTES', 10 * 1024 * 1024),
+            backupCount=getattr(settings, 'PROFILING_LOG_BACKUP_COUNT', 5),
+            encoding='utf-8',
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+def read_profile_log(path=None):
+    """Yield the records of the profiling log, oldest rotated file first"""
+    path = Path(path or get_log_path())
+    backups = getattr(settings, 'PROFILING_LOG_BACKUP_COUNT', 5)
+    files = [path.with_name(f'{path.name}.{index}') for index in range(backups, 0, -1)] + [path]
+    for file in files:
+        if not file.exists():
+            continue
+        with open(file, encoding='utf-8') as handle:
+            for line in handle:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
@@ -0,0 +1,89 @@
+"""
+Test helpers for query budgets, and factories for the rows the tests share
+
+    class AppointmentListTests(QueryBudgetTestMixin, TestCase):
+        @classmethod
+        def setUpTestData(cls):
+            cls.staff = User.objects.create_user('staff', password='secret', is_staff=True)
+            create_appointments([customer], create_services(3), [None] * 12)
+
+        def test_list_within_budget(self):
+            self.client.force_login(self.staff)
+            self.assertWithinQueryBudget(reverse('appointments:appointment_list'))
+"""
+from contextlib import contextmanager
+from datetime import date, timedelta
+from itertools import cycle
+
+from django.urls import resolve
+
+from accounts.models import Employee, User
+from appointments.models import Appointment
+from services.models import Service, ServiceCategory
+
+from .budgets import get_query_budget, record_queries
+
+
+def create_services(count):
+    """``count`` services, each in a category of its own"""
+    services = []
+    for i in range(count):
+        category = ServiceCategory.objects.create(name=f'Category {i}')
+        services.append(Service.objects.create(
+            category=category, name=f'Service {i}', description='Test service',
+            base_price=100 + i, estimated_duration=timedelta(hours=2),
+        ))
+    return services
+
+
+def create_employee(username, employee_id, **fields):
+    """An employee user and their Employee profile (returned), hired today"""
+    user = User.objects.create_user(username, password='secret', role='employee')
+    return Employee.objects.create(user=user, employee_id=employee_id, hire_date=date.today(), **fields)
+
+
+def create_appointments(customers, services, assignees):
+    """
+    One future appointment per entry of ``assignees``, in consecutive slots
+    from tomorrow on
+
+    Appointments cycle through ``customers`` and ``services``; those with an
+    assignee (a user) are ``assigned``, the others (None) ``booked``.
+    """
+    slots = [slot_time for slot_time, _ in Appointment.TIME_SLOT_CHOICES]
+    appointments = []
+    for i, (customer, service, assignee) in enumerate(zip(cycle(customers), cycle(services), assignees)):
+        appointments.append(Appointment.objects.create(
+            customer=customer,
+            selected_service=service,
+            assigned_employee=assignee,
+            status='assigned' if assignee else 'booked',
+            slot_date=date.today() + timedelta(days=1 + i // len(slots)),
+            slot_time=slots[i % len(slots)],
+            vehicle_make='Make', vehicle_model=f'Model {i}', vehicle_year=2020,
+            vehicle_license=f'LIC{i}',
+        ))
+    return appointments
+
+
+class QueryBudgetTestMixin:
+    """Assertions for django.test.TestCase subclasses"""
+
+    @contextmanager
+    def assertMaxQueries(self, max_queries):
+        """Fail if the block runs more than ``max_queries`` queries"""
+        with record_queries() as queries:
+            yield queries
+        if len(queries) > max_queries:
+            listing = '\n'.join(f'{i}. {sql}' for i, sql in enumerate(queries.queries, 1))
+            self.fail(f'{len(queries)} queries run, {max_queries} allowed:\n{listing}')
+
+    def assertWithinQueryBudget(self, path, method='get', **kwargs):
+        """Request ``path`` with the test client and check its view's budget"""
+        match = resolve(path.split('?')[0])
+        budget = get_query_budget(match.func, match.view_name)
+        if budget is None:
+            self.fail(f'No query budget declared for {match.view_name}')
+        with self.assertMaxQueries(budget):
+            response = getattr(self.client, method)(path, **kwargs)
+        return response
@@ -0,0 +1,68 @@
+import multiprocessing
+import tempfile
+import time
+
+from django.test import SimpleTestCase, override_settings
+
+from .metrics import Counter, Histogram, get_metrics_dir, render_metrics
+
+TEST_COUNTER = Counter('carmodx_test_increments_total', 'Increments made by the metrics tests', ['worker'])
+TEST_HISTOGRAM = Histogram('carmodx_test_duration_seconds', 'Durations observed by the metrics tests', ['worker'])
+
+
+def _record_and_wait(recorded, scraped):
+    """Worker process: record samples, then stay alive (without exiting) until the scrape is done"""
+    TEST_COUNTER.inc(3, worker='child')
+    TEST_HISTOGRAM.observe(0.2, worker='child')
+    recorded.set()
+    scraped.wait(10)
+
+
+def _record_and_exit():
+    """Worker process: record samples, let the timer flush them, then exit"""
+    TEST_COUNTER.inc(worker='exited')
+    time.sleep(0.5)
+
+
+class MetricsAggregationTests(SimpleTestCase):
+    """A scrape in one process sums the samples of every other live process"""
+
+    def setUp(self):
+        metrics_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(metrics_dir.cleanup)
+        settings_override = override_settings(METRICS_DIR=metrics_dir.name, METRICS_FLUSH_SECONDS=0.1)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_scrape_sees_samples_of_a_quiet_worker(self):
+        context = multiprocessing.get_context('fork')
+        recorded, scraped = context.Event(), context.Event()
+        worker = context.Process(target=_record_and_wait, args=(recorded, scraped))
+        worker.start()
+        try:
+            self.assertTrue(recorded.wait(10))
+            TEST_COUNTER.inc(worker='parent')
+            # The quiet worker's timer flushes within METRICS_FLUSH_SECONDS
+            deadline = time.monotonic() + 5
+            output = render_metrics()
+            while 'worker="child"' not in output and time.monotonic() < deadline:
+                time.sleep(0.05)
+                output = render_metrics()
+        finally:
+            scraped.set()
+            worker.join(10)
+
+        self.assertIn('carmodx_test_increments_total{worker="child"} 3', output)
+        self.assertIn('carmodx_test_increments_total{worker="parent"} 1', output)
+        self.assertIn('carmodx_test_duration_seconds_bucket{worker="child",le="0.25"} 1', output)
+        self.assertIn('carmodx_test_duration_seconds_count{worker="child"} 1', output)
+
+    def test_exited_worker_files_are_dropped(self):
+        worker = multiprocessing.get_context('fork').Process(target=_record_and_exit)
+        worker.start()
+        worker.join(10)
+        worker_files = list(get_metrics_dir().glob(f'{worker.pid}-*.json'))
+        self.assertEqual(len(worker_files), 1)
+
+        self.assertNotIn('worker="exited"', render_metrics())
+        self.assertFalse(worker_files[0].exists())
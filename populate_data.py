@@ -5,7 +5,7 @@ Script to populate the database with sample data for CarModX
 import os
 import sys
 import django
-from datetime import date, time, timedelta
+from datetime import date, timedelta
 
 # Setup Django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'carmodx.settings')
@@ -13,7 +13,6 @@ django.setup()
 
 from accounts.models import User, Employee
 from services.models import ServiceCategory, Service, ServicePrice
-from appointments.models import TimeSlot, Appointment
 from django.utils import timezone
 
 def create_sample_data():
@@ -168,32 +167,12 @@ def create_sample_data():
         employees[emp_data['username']] = employee
         print(f"Created employee: {employee.user.get_full_name()}")
     
-    # Create time slots for the next 30 days
-    print("Creating time slots...")
-    start_date = date.today()
-    for i in range(30):
-        current_date = start_date + timedelta(days=i)
-        
-        # Create time slots for each day (9 AM to 5 PM, every 2 hours)
-        for hour in range(9, 17, 2):
-            start_time = time(hour, 0)
-            end_time = time(hour + 2, 0)
-            
-            TimeSlot.objects.get_or_create(
-                date=current_date,
-                start_time=start_time,
-                defaults={
-                    'end_time': end_time,
-                    'is_available': True,
-                    'max_appointments': 3
-                }
-            )
-    
     print("Sample data created successfully!")
     print(f"Created {ServiceCategory.objects.count()} categories")
     print(f"Created {Service.objects.count()} services")
     print(f"Created {Employee.objects.count()} employees")
-    print(f"Created {TimeSlot.objects.count()} time slots")
+    print("Appointment slots are fixed (Appointment.TIME_SLOT_CHOICES); for large data sets run "
+          "'python manage.py generate_load_data'")
 
 if __name__ == '__main__':
     create_sample_data()
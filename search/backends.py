@@ -0,0 +1,209 @@
+"""
+Search backends
+
+``search_queryset()`` is the single entry point used by the views. It hands
+the query to the configured backend:
+
+- ``Fts5SearchBackend`` (SQLite): matches against the FTS5 tables created by
+  the search migrations, with prefix matching and bm25 ranking.
+- ``BasicSearchBackend`` (any database): the same token semantics built from
+  ``icontains`` filters, used when FTS5 is unavailable.
+
+The backend is chosen with ``settings.SEARCH_BACKEND`` ('auto', 'fts5' or
+'basic'; default 'auto').
+"""
+import re
+import unicodedata
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.models import Q
+
+from .indexes import SEARCH_INDEXES
+
+INDEX_BATCH_SIZE = 2000
+
+# Ranked searches score only the newest N matches (of those passing the
+# caller's filters), so broad one- or two-letter prefixes stay fast on very
+# large tables
+SEARCH_RANK_CANDIDATES = 1000
+
+# Letters and digits, like FTS5's unicode61 tokenizer (underscores separate words)
+_TOKEN_RE = re.compile(r'[^\W_]+', re.UNICODE)
+
+_backend = None
+
+
+def tokenize(query):
+    """Split a user query into search terms"""
+    return _TOKEN_RE.findall(unicodedata.normalize('NFKC', query or ''))
+
+
+def fold(term):
+    """Case- and accent-insensitive form of a term, as the FTS5 index stores it"""
+    decomposed = unicodedata.normalize('NFKD', term)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def search_terms(text):
+    """Folded terms of a text, for matching outside the database the way the index does"""
+    return [fold(term) for term in tokenize(text)]
+
+
+class BasicSearchBackend:
+    """icontains fallback: every term must match at least one indexed field"""
+
+    def search(self, queryset, index, terms, ranked=True):
+        for term in terms:
+            condition = Q()
+            for lookup in index.lookups:
+                condition |= Q(**{f'{lookup}__icontains': term})
+            queryset = queryset.filter(condition)
+        return queryset
+
+    def index_objects(self, index, pks):
+        pass
+
+    def remove_objects(self, index, pks):
+        pass
+
+    def rebuild(self, index):
+        return 0
+
+
+class Fts5SearchBackend:
+    """SQLite FTS5 backend with prefix matching and bm25 ranking"""
+
+    def match_expression(self, terms):
+        """Prefix match for every term, e.g. 'ci hon' -> '"ci"* "hon"*'"""
+        return ' '.join(f'"{fold(term)}"*' for term in terms)
+
+    def search(self, queryset, index, terms, ranked=True):
+        table = index.table
+        pk_column = f'{queryset.model._meta.db_table}.{queryset.model._meta.pk.column}'
+        weights = ', '.join(str(weight) for weight in index.weights)
+
+        match = self.match_expression(terms)
+        extra = {
+            'tables': [table],
+            'where': [f'{table}.rowid = {pk_column}', f'{table} MATCH %s'],
+            'params': [match],
+        }
+        if ranked:
+            # A rowid range is cheap for FTS5, so bm25() only runs on the
+            # candidates. The caller's filters are applied to the candidates
+            # too, or rows they exclude would crowd out the ones they keep.
+            candidates = f'SELECT rowid FROM {table} WHERE {table} MATCH %s'
+            params = [match]
+            if queryset.query.where:
+                pk_query = queryset.order_by().values('pk').query
+                pk_sql, pk_params = pk_query.get_compiler(using=queryset.db).as_sql()
+                candidates += f' AND rowid IN ({pk_sql})'
+                params.extend(pk_params)
+            extra['where'].append(
+                f'{table}.rowid >= (SELECT MIN(rowid) FROM ('
+                f'{candidates} ORDER BY rowid DESC LIMIT {SEARCH_RANK_CANDIDATES}))'
+            )
+            extra['params'].extend(params)
+            # bm25() is negative, lower values are better matches
+            extra['select'] = {'search_rank': f'bm25({table}, {weights})'}
+            extra['order_by'] = ['search_rank']
+        return queryset.extra(**extra)
+
+    def index_objects(self, index, pks):
+        """(Re)index the given primary keys"""
+        pks = list(pks)
+        if not pks:
+            return
+        rows = index.model._default_manager.filter(pk__in=pks).values_list('pk', *index.lookups)
+        found = set()
+        with connection.cursor() as cursor:
+            params = []
+            for row in rows:
+                found.add(row[0])
+                params.append([row[0]] + ['' if value is None else str(value) for value in row[1:]])
+            if params:
+                cursor.executemany(self._insert_sql(index), params)
+        missing = [pk for pk in pks if pk not in found]
+        if missing:
+            self.remove_objects(index, missing)
+
+    def remove_objects(self, index, pks):
+        pks = list(pks)
+        if not pks:
+            return
+        with connection.cursor() as cursor:
+            placeholders = ', '.join(['%s'] * len(pks))
+            cursor.execute(f'DELETE FROM {index.table} WHERE rowid IN ({placeholders})', pks)
+
+    def rebuild(self, index):
+        """Repopulate an index from scratch, returning the number of rows indexed"""
+        count = 0
+        rows = index.model._default_manager.order_by().values_list('pk', *index.lookups)
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {index.table}')
+            batch = []
+            for row in rows.iterator(chunk_size=INDEX_BATCH_SIZE):
+                batch.append([row[0]] + ['' if value is None else str(value) for value in row[1:]])
+                if len(batch) >= INDEX_BATCH_SIZE:
+                    cursor.executemany(self._insert_sql(index), batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                cursor.executemany(self._insert_sql(index), batch)
+                count += len(batch)
+            cursor.execute(f"INSERT INTO {index.table}({index.table}) VALUES ('optimize')")
+        return count
+
+    def _insert_sql(self, index):
+        columns = ', '.join(['rowid'] + index.columns)
+        placeholders = ', '.join(['%s'] * (len(index.columns) + 1))
+        return f'INSERT OR REPLACE INTO {index.table} ({columns}) VALUES ({placeholders})'
+
+
+def _fts5_tables_exist():
+    tables = [index.table for index in SEARCH_INDEXES.values()]
+    try:
+        with connection.cursor() as cursor:
+            placeholders = ', '.join(['%s'] * len(tables))
+            cursor.execute(
+                f"SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN ({placeholders})",
+                tables
+            )
+            return cursor.fetchone()[0] == len(tables)
+    except DatabaseError:
+        return False
+
+
+def get_search_backend():
+    """Return the configured search backend (resolved once per process)"""
+    global _backend
+    if _backend is None:
+        choice = getattr(settings, 'SEARCH_BACKEND', 'auto')
+        use_fts5 = choice == 'fts5' or (
+            choice == 'auto' and connection.vendor == 'sqlite' and _fts5_tables_exist()
+        )
+        _backend = Fts5SearchBackend() if use_fts5 else BasicSearchBackend()
+    return _backend
+
+
+def search_queryset(queryset, index_name, query, ranked=True):
+    """
+    Filter a queryset to objects matching a search query
+
+    Every term in the query must match (as a prefix) one of the index's
+    fields. With ``ranked`` the results are ordered best match first
+    (the FTS5 backend ranks the newest SEARCH_RANK_CANDIDATES matches that
+    pass the queryset's filters);
+    use ``ranked=False`` for complete result sets such as paginated lists.
+
+    Args:
+        queryset: Queryset of the index's model to filter
+        index_name: Key in SEARCH_INDEXES ('services', 'appointments', 'employees')
+        query: Raw user query
+        ranked: Order by relevance (when the backend supports it)
+    """
+    terms = tokenize(query)
+    if not terms:
+        return queryset
+    return get_search_backend().search(queryset, SEARCH_INDEXES[index_name], terms, ranked=ranked)
@@ -0,0 +1,98 @@
+"""
+Search index definitions
+
+Each index maps one model to an FTS5 table whose rowid is the model's
+primary key. Fields are (column, values() lookup, bm25 weight) triples;
+lookups may span relations, in which case the related model is listed in
+``dependencies`` so edits to it re-index the affected rows.
+"""
+from django.apps import apps
+
+
+class SearchIndex:
+    """Full-text index over a model"""
+
+    def __init__(self, name, model, table, fields, dependencies=None):
+        self.name = name
+        self.model_label = model
+        self.table = table
+        self.fields = fields
+        # {related model label: lookup from the indexed model to it}
+        self.dependencies = dependencies or {}
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    @property
+    def columns(self):
+        return [column for column, _, _ in self.fields]
+
+    @property
+    def lookups(self):
+        return [lookup for _, lookup, _ in self.fields]
+
+    @property
+    def weights(self):
+        return [weight for _, _, weight in self.fields]
+
+    def source_fields(self, model_label):
+        """Local field names on ``model_label`` that feed this index"""
+        if model_label == self.model_label:
+            prefix = ''
+        else:
+            prefix = self.dependencies[model_label] + '__'
+        return {
+            lookup[len(prefix):].split('__')[0]
+            for lookup in self.lookups
+            if lookup.startswith(prefix)
+        }
+
+
+SEARCH_INDEXES = {
+    index.name: index
+    for index in [
+        SearchIndex(
+            name='services',
+            model='services.Service',
+            table='search_service_fts',
+            fields=[
+                ('name', 'name', 10.0),
+                ('category', 'category__name', 5.0),
+                ('description', 'description', 1.0),
+            ],
+            dependencies={'services.ServiceCategory': 'category'},
+        ),
+        SearchIndex(
+            name='appointments',
+            model='appointments.Appointment',
+            table='search_appointment_fts',
+            fields=[
+                ('customer_username', 'customer__username', 5.0),
+                ('customer_first_name', 'customer__first_name', 5.0),
+                ('customer_last_name', 'customer__last_name', 5.0),
+                ('vehicle_make', 'vehicle_make', 2.0),
+                ('vehicle_model', 'vehicle_model', 2.0),
+                ('service', 'selected_service__name', 3.0),
+            ],
+            dependencies={
+                'accounts.User': 'customer',
+                'services.Service': 'selected_service',
+            },
+        ),
+        SearchIndex(
+            name='employees',
+            model='accounts.Employee',
+            table='search_employee_fts',
+            fields=[
+                ('first_name', 'user__first_name', 5.0),
+                ('last_name', 'user__last_name', 5.0),
+                ('username', 'user__username', 5.0),
+                ('email', 'user__email', 2.0),
+                ('employee_id', 'employee_id', 10.0),
+                ('specialization', 'specialization', 1.0),
+            ],
+            dependencies={'accounts.User': 'user'},
+        ),
+    ]
+}
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from search.backends import BasicSearchBackend, get_search_backend
+from search.indexes import SEARCH_INDEXES
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search indexes (after bulk updates that bypass signals)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'indexes',
+            nargs='*',
+            help=f'Indexes to rebuild (default: all of {", ".join(SEARCH_INDEXES)})'
+        )
+
+    def handle(self, *args, **options):
+        names = options['indexes'] or list(SEARCH_INDEXES)
+        unknown = [name for name in names if name not in SEARCH_INDEXES]
+        if unknown:
+            raise CommandError(f'Unknown search index(es): {", ".join(unknown)}')
+
+        backend = get_search_backend()
+        if isinstance(backend, BasicSearchBackend):
+            self.stdout.write(
+                self.style.WARNING('The basic search backend has no index to rebuild.')
+            )
+            return
+
+        for name in names:
+            with transaction.atomic():
+                count = backend.rebuild(SEARCH_INDEXES[name])
+            self.stdout.write(self.style.SUCCESS(f'Indexed {count} {name}'))
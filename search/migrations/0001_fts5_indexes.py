@@ -0,0 +1,70 @@
+# FTS5 search tables (SQLite only; other databases use the basic backend)
+
+from django.db import migrations
+
+FTS_TABLES = {
+    'search_service_fts': {
+        'columns': ['name', 'category', 'description'],
+        'populate': (
+            'SELECT s.id, s.name, c.name, s.description '
+            'FROM services_service s '
+            'JOIN services_servicecategory c ON c.id = s.category_id'
+        ),
+    },
+    'search_appointment_fts': {
+        'columns': [
+            'customer_username', 'customer_first_name', 'customer_last_name',
+            'vehicle_make', 'vehicle_model', 'service',
+        ],
+        'populate': (
+            'SELECT a.id, u.username, u.first_name, u.last_name, '
+            'a.vehicle_make, a.vehicle_model, s.name '
+            'FROM appointments_appointment a '
+            'JOIN accounts_user u ON u.id = a.customer_id '
+            'JOIN services_service s ON s.id = a.selected_service_id'
+        ),
+    },
+    'search_employee_fts': {
+        'columns': ['first_name', 'last_name', 'username', 'email', 'employee_id', 'specialization'],
+        'populate': (
+            'SELECT e.id, u.first_name, u.last_name, u.username, u.email, '
+            'e.employee_id, e.specialization '
+            'FROM accounts_employee e '
+            'JOIN accounts_user u ON u.id = e.user_id'
+        ),
+    },
+}
+
+
+def create_fts_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table, spec in FTS_TABLES.items():
+            columns = ', '.join(spec['columns'])
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+                f"{columns}, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+            )
+            cursor.execute(f"INSERT INTO {table} (rowid, {columns}) {spec['populate']}")
+
+
+def drop_fts_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table in FTS_TABLES:
+            cursor.execute(f'DROP TABLE IF EXISTS {table}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_remove_employee_availability_and_more'),
+        ('services', '0001_initial'),
+        ('appointments', '0008_appointment_quoted_price'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_tables, drop_fts_tables),
+    ]
@@ -0,0 +1,87 @@
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .backends import get_search_backend
+from .indexes import SEARCH_INDEXES
+
+
+def _touches(index, model_label, update_fields):
+    """Whether a save with ``update_fields`` can change the indexed text"""
+    return update_fields is None or bool(index.source_fields(model_label) & set(update_fields))
+
+
+def _make_handlers(index):
+    def index_on_save(sender, instance, update_fields=None, raw=False, **kwargs):
+        """Re-index an object after it is saved"""
+        if raw or not _touches(index, index.model_label, update_fields):
+            return
+        get_search_backend().index_objects(index, [instance.pk])
+
+    def remove_on_delete(sender, instance, **kwargs):
+        """Drop a deleted object from the index"""
+        get_search_backend().remove_objects(index, [instance.pk])
+
+    return index_on_save, remove_on_delete
+
+
+def _make_stored_values_handler(attnames):
+    def remember_stored_values(sender, instance, update_fields=None, raw=False, using=None, **kwargs):
+        """Read the indexed values as stored before they are overwritten, for reindex_dependents()"""
+        instance._search_stored_values = None
+        if raw or instance._state.adding:
+            return
+        if update_fields is not None and not set(update_fields) & set(attnames):
+            return
+        instance._search_stored_values = sender._default_manager.using(using).filter(
+            pk=instance.pk
+        ).values(*attnames).first()
+
+    return remember_stored_values
+
+
+def _make_dependency_handler(index, model_label, lookup):
+    model = apps.get_model(model_label)
+    attnames = [model._meta.get_field(name).attname for name in index.source_fields(model_label)]
+
+    def reindex_dependents(sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+        """Re-index objects whose indexed text comes from a related object, when that text changed"""
+        if raw or created or not _touches(index, model_label, update_fields):
+            return
+        stored = getattr(instance, '_search_stored_values', None)
+        if stored is not None and all(stored[attname] == getattr(instance, attname) for attname in attnames):
+            return
+        pks = index.model._default_manager.filter(**{lookup: instance.pk}).values_list('pk', flat=True)
+        get_search_backend().index_objects(index, pks)
+
+    return reindex_dependents
+
+
+# Fields of related models that feed an index, by model label
+_dependency_attnames = {}
+
+for _index in SEARCH_INDEXES.values():
+    _on_save, _on_delete = _make_handlers(_index)
+    post_save.connect(_on_save, sender=_index.model, weak=False, dispatch_uid=f'search_{_index.name}_save')
+    post_delete.connect(_on_delete, sender=_index.model, weak=False, dispatch_uid=f'search_{_index.name}_delete')
+
+    for _model_label, _lookup in _index.dependencies.items():
+        _on_dependency_save = _make_dependency_handler(_index, _model_label, _lookup)
+        post_save.connect(
+            _on_dependency_save,
+            sender=apps.get_model(_model_label),
+            weak=False,
+            dispatch_uid=f'search_{_index.name}_{_model_label}_save'
+        )
+        _dependency_model = apps.get_model(_model_label)
+        _dependency_attnames.setdefault(_model_label, set()).update(
+            _dependency_model._meta.get_field(name).attname for name in _index.source_fields(_model_label)
+        )
+
+# One read of the stored values per save, shared by every index depending on the model
+for _model_label, _attnames in _dependency_attnames.items():
+    pre_save.connect(
+        _make_stored_values_handler(sorted(_attnames)),
+        sender=apps.get_model(_model_label),
+        weak=False,
+        dispatch_uid=f'search_{_model_label}_stored_values'
+    )
@@ -0,0 +1,100 @@
+"""
+Public service catalog
+
+The active catalog (categories, services by category, related services and
+their active price options) is loaded once per process, like the pricing
+matrix, and served from memory:
+
+    catalog = get_catalog()
+    catalog.category_services(category_id)
+
+Every Service, ServiceCategory or ServicePrice write bumps the catalog data
+version in the shared cache; each process reloads its copy the next time it
+sees a newer version. Pages that cache
+what they render use the same version (``data_versions.catalog`` in
+templates).
+"""
+from carmodx.versions import bump_version, get_version
+
+from .models import Service, ServiceCategory, ServicePrice
+from .pricing import PriceOption
+
+CATALOG_VERSION = 'catalog'
+
+_catalog = None
+
+
+class Catalog:
+    """Snapshot of the active categories and services"""
+
+    def __init__(self, version, categories, services, price_options):
+        self.version = version
+        # Active categories, ordered by name
+        self.categories = categories
+        # Active services (in any category), ordered by category and name
+        self.services = services
+        self._categories = {category.pk: category for category in categories}
+        self._services = {service.pk: service for service in services}
+        # Active price options of active services, by service id
+        self._price_options = price_options
+        self._by_category = {}
+        for service in services:
+            self._by_category.setdefault(service.category_id, []).append(service)
+
+    @classmethod
+    def load(cls, version):
+        """Build the catalog with three flat queries"""
+        categories = list(ServiceCategory.objects.filter(is_active=True))
+        services = list(Service.objects.filter(is_active=True).select_related('category'))
+        price_options = {}
+        rows = ServicePrice.objects.filter(is_active=True, service__is_active=True).order_by(
+            'service_id', 'vehicle_type', 'complexity_level'
+        ).values_list('service_id', 'id', 'vehicle_type', 'complexity_level', 'price', 'is_active')
+        for service_id, *row in rows:
+            price_options.setdefault(service_id, []).append(PriceOption(*row))
+        return cls(version, categories, services, price_options)
+
+    def get_category(self, category_id):
+        """Active category by id, or None"""
+        return self._categories.get(category_id)
+
+    def get_service(self, service_id):
+        """Active service by id, or None"""
+        return self._services.get(service_id)
+
+    def category_services(self, category_id):
+        """Active services of a category"""
+        return self._by_category.get(category_id, [])
+
+    def related_services(self, service, limit=4):
+        """Other active services of the service's category"""
+        related = [other for other in self.category_services(service.category_id) if other.pk != service.pk]
+        return related[:limit]
+
+    def price_options(self, service_id):
+        """Active price options of a service, ordered by vehicle type and complexity"""
+        return self._price_options.get(service_id, [])
+
+
+def get_catalog_version():
+    return get_version(CATALOG_VERSION)
+
+
+def get_catalog():
+    """Return this process's catalog, reloading it if it is stale"""
+    global _catalog
+    version = get_catalog_version()
+    if _catalog is None or _catalog.version != version:
+        _catalog = Catalog.load(version)
+    return _catalog
+
+
+def invalidate_catalog():
+    """
+    Mark every process's catalog (and everything cached for it) as stale.
+
+    Called from model signals; queryset.update() and bulk_create() bypass
+    signals, so code using them must call this explicitly. Inside a
+    transaction the bump is deferred until commit.
+    """
+    bump_version(CATALOG_VERSION)
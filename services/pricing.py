@@ -0,0 +1,127 @@
+"""
+Price resolution for services
+
+The active pricing matrix is loaded once per process into nested dicts:
+
+    {service_id: {vehicle_type: {complexity_level: price}}}
+
+so resolving the price of a (service, vehicle_type, complexity_level)
+combination is a couple of dict lookups. Writes bump the pricing data version
+(carmodx/versions.py); every process reloads its copy the next time it sees a
+newer version.
+"""
+from collections import namedtuple
+
+from carmodx.versions import bump_version, get_version
+
+from .models import Service, ServicePrice
+
+PRICING_VERSION = 'pricing'
+
+PriceOption = namedtuple('PriceOption', ['id', 'vehicle_type', 'complexity_level', 'price', 'is_active'])
+
+_matrix = None
+
+
+class PricingMatrix:
+    """Snapshot of active service prices and base prices"""
+
+    def __init__(self, version, prices, options, base_prices):
+        self.version = version
+        self.prices = prices
+        self.base_prices = base_prices
+        self._options = options
+
+    @classmethod
+    def load(cls, version):
+        """Build the matrix with two flat queries"""
+        prices = {}
+        options = {}
+        rows = ServicePrice.objects.filter(is_active=True).order_by(
+            'service_id', 'vehicle_type', 'complexity_level'
+        ).values_list('service_id', 'id', 'vehicle_type', 'complexity_level', 'price', 'is_active')
+        for service_id, *row in rows:
+            option = PriceOption(*row)
+            options.setdefault(service_id, []).append(option)
+            prices.setdefault(service_id, {}).setdefault(
+                _normalize(option.vehicle_type), {}
+            )[_normalize(option.complexity_level)] = option.price
+
+        base_prices = dict(Service.objects.values_list('id', 'base_price'))
+        return cls(version, prices, options, base_prices)
+
+    def resolve(self, service_id, vehicle_type='', complexity_level=''):
+        """
+        Price for a service, falling back from the most specific match:
+
+        (vehicle_type, complexity_level) -> (vehicle_type, any) ->
+        (any, complexity_level) -> (any, any) -> Service.base_price
+        """
+        vehicle_type = _normalize(vehicle_type)
+        complexity_level = _normalize(complexity_level)
+        by_vehicle = self.prices.get(service_id)
+
+        if by_vehicle:
+            for vehicle_key, complexity_key in (
+                (vehicle_type, complexity_level),
+                (vehicle_type, ''),
+                ('', complexity_level),
+                ('', ''),
+            ):
+                price = by_vehicle.get(vehicle_key, {}).get(complexity_key)
+                if price is not None:
+                    return price
+
+        return self.base_prices.get(service_id)
+
+    def options(self, service_id):
+        """Active price options for a service, ordered by vehicle type and complexity"""
+        return self._options.get(service_id, [])
+
+
+def _normalize(value):
+    """Lookup key for a vehicle type or complexity level"""
+    return (value or '').strip().lower()
+
+
+def get_pricing_version():
+    return get_version(PRICING_VERSION)
+
+
+def get_pricing_matrix():
+    """Return this process's pricing matrix, reloading it if it is stale"""
+    global _matrix
+    version = get_pricing_version()
+    if _matrix is None or _matrix.version != version:
+        _matrix = PricingMatrix.load(version)
+    return _matrix
+
+
+def resolve_price(service, vehicle_type='', complexity_level=''):
+    """
+    Resolve the price of a service for a vehicle type and complexity level
+
+    Args:
+        service: Service instance or primary key
+        vehicle_type: Vehicle type (case-insensitive, blank matches any)
+        complexity_level: Complexity level (case-insensitive, blank matches any)
+
+    Returns:
+        Decimal price, or None for an unknown service id
+    """
+    service_id = getattr(service, 'pk', service)
+    price = get_pricing_matrix().resolve(service_id, vehicle_type, complexity_level)
+    if price is None and isinstance(service, Service):
+        price = service.base_price
+    return price
+
+
+def invalidate_pricing_matrix():
+    """
+    Mark every process's pricing matrix as stale.
+
+    Called from model signals; queryset.update() and bulk_create() bypass
+    signals, so code using them must call this explicitly. Inside a
+    transaction the bump is deferred until commit.
+    """
+    bump_version(PRICING_VERSION)
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .catalog import invalidate_catalog
+from .models import Service, ServiceCategory, ServicePrice
+from .pricing import invalidate_pricing_matrix
+
+
+@receiver([post_save, post_delete], sender=ServicePrice)
+@receiver([post_save, post_delete], sender=Service)
+def invalidate_pricing_on_change(sender, **kwargs):
+    """Reload pricing matrices after any price or base price change"""
+    invalidate_pricing_matrix()
+
+
+@receiver([post_save, post_delete], sender=ServicePrice)
+@receiver([post_save, post_delete], sender=ServiceCategory)
+@receiver([post_save, post_delete], sender=Service)
+def invalidate_catalog_on_change(sender, **kwargs):
+    """Reload the catalog and re-render cached catalog pages after any service, category or price change"""
+    invalidate_catalog()
@@ -0,0 +1,91 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import User
+from monitoring.testing import create_services
+
+from .catalog import get_catalog, invalidate_catalog
+from .models import ServicePrice
+
+
+class CatalogTestCase(TestCase):
+    """Starts every test on a new catalog version, so no snapshot or page of an earlier test is reused"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.services = create_services(3)
+
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_catalog()
+
+    def edit(self, obj, **fields):
+        """Save ``obj`` with ``fields`` and run the on-commit version bump"""
+        for name, value in fields.items():
+            setattr(obj, name, value)
+        with self.captureOnCommitCallbacks(execute=True):
+            obj.save()
+
+
+class CatalogTests(CatalogTestCase):
+    """The in-memory catalog is loaded once per version"""
+
+    def test_loaded_once(self):
+        with self.assertNumQueries(3):
+            catalog = get_catalog()
+        with self.assertNumQueries(0):
+            self.assertIs(get_catalog(), catalog)
+        self.assertEqual([service.name for service in catalog.services], ['Service 0', 'Service 1', 'Service 2'])
+
+    def test_edits_reload_it(self):
+        service = self.services[0]
+        get_catalog()
+        self.edit(service, name='Renamed service')
+        self.assertEqual(get_catalog().get_service(service.pk).name, 'Renamed service')
+
+        self.edit(service, is_active=False)
+        catalog = get_catalog()
+        self.assertIsNone(catalog.get_service(service.pk))
+        self.assertEqual(catalog.category_services(service.category_id), [])
+
+    def test_price_options(self):
+        service = self.services[1]
+        with self.captureOnCommitCallbacks(execute=True):
+            ServicePrice.objects.create(service=service, vehicle_type='sedan', complexity_level='basic', price=150)
+            ServicePrice.objects.create(
+                service=service, vehicle_type='suv', complexity_level='basic', price=180, is_active=False
+            )
+        options = get_catalog().price_options(service.pk)
+        self.assertEqual([(option.vehicle_type, option.price) for option in options], [('sedan', 150)])
+
+
+class PublicPageCacheTests(CatalogTestCase):
+    """Anonymous visitors get public pages from the full-page cache"""
+
+    def test_repeat_visit_is_served_from_the_cache(self):
+        url = reverse('services:service_list') + '?page=1'
+        response = self.client.get(url)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=60')
+        self.assertIn('Cookie', response['Vary'])
+        with self.assertNumQueries(0):
+            cached = self.client.get(url)
+        self.assertEqual(cached.content, response.content)
+
+    def test_catalog_edit_replaces_the_page(self):
+        url = reverse('services:service_list')
+        self.assertContains(self.client.get(url), 'Service 0')
+        self.edit(self.services[0], name='Renamed service')
+        self.assertContains(self.client.get(url), 'Renamed service')
+
+    def test_other_parameters_bypass_the_cache(self):
+        url = reverse('services:service_list') + '?utm_source=newsletter'
+        self.client.get(url)
+        response = self.client.get(url)
+        self.assertNotIn('Cache-Control', response)
+        self.assertIsNotNone(response.context)  # rendered again
+
+    def test_signed_in_users_bypass_the_cache(self):
+        self.client.force_login(User.objects.create_user('customer', password='secret', role='customer'))
+        response = self.client.get(reverse('services:service_list'))
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIsNotNone(response.context)
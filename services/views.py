@@ -2,29 +2,37 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Q
-from .models import Service, ServiceCategory
+from django.http import Http404
+from .catalog import get_catalog
+from .models import Service
+from search.backends import search_queryset
 from appointments.models import Appointment
+from monitoring.budgets import query_budget
+from carmodx.page_cache import cache_public_page
 
 
+@cache_public_page
+@query_budget(8)
 def service_list_view(request):
     """Display all available services"""
-    categories = ServiceCategory.objects.filter(is_active=True).prefetch_related('services')
-    services = Service.objects.filter(is_active=True)
+    catalog = get_catalog()
+    services = catalog.services
     
     # Search functionality
     search_query = request.GET.get('search')
     if search_query:
-        services = services.filter(
-            Q(name__icontains=search_query) | 
-            Q(description__icontains=search_query) |
-            Q(category__name__icontains=search_query)
+        services = search_queryset(
+            Service.objects.filter(is_active=True).select_related('category'),
+            'services', search_query, ranked=False
         )
     
     # Category filter
     category_id = request.GET.get('category')
     if category_id:
-        services = services.filter(category_id=category_id)
+        if search_query:
+            services = services.filter(category_id=category_id) if category_id.isdigit() else services.none()
+        else:
+            services = catalog.category_services(int(category_id)) if category_id.isdigit() else []
     
     # Pagination
     paginator = Paginator(services, 12)
@@ -32,7 +40,7 @@ def service_list_view(request):
     services = paginator.get_page(page_number)
     
     context = {
-        'categories': categories,
+        'categories': catalog.categories,
         'services': services,
         'search_query': search_query,
         'selected_category': category_id,
@@ -43,21 +51,15 @@ def service_list_view(request):
 
 def service_detail_view(request, service_id):
     """Display detailed information about a specific service"""
-    service = get_object_or_404(Service, id=service_id, is_active=True)
-    
-    # Get related services from the same category
-    related_services = Service.objects.filter(
-        category=service.category,
-        is_active=True
-    ).exclude(id=service.id)[:4]
-    
-    # Get pricing options if available
-    pricing_options = service.prices.filter(is_active=True)
+    catalog = get_catalog()
+    service = catalog.get_service(service_id)
+    if service is None:
+        raise Http404('No active service matches the given query.')
     
     context = {
         'service': service,
-        'related_services': related_services,
-        'pricing_options': pricing_options,
+        'related_services': catalog.related_services(service),
+        'pricing_options': catalog.price_options(service.id),
     }
     
     return render(request, 'services/service_detail.html', context)
@@ -98,17 +100,21 @@ def book_service_view(request, service_id):
     return render(request, 'services/book_service.html', context)
 
 
+@cache_public_page
 def category_detail_view(request, category_id):
     """Display services in a specific category"""
-    category = get_object_or_404(ServiceCategory, id=category_id, is_active=True)
-    services = Service.objects.filter(category=category, is_active=True)
+    catalog = get_catalog()
+    category = catalog.get_category(category_id)
+    if category is None:
+        raise Http404('No active category matches the given query.')
+    services = catalog.category_services(category.id)
     
     # Search within category
     search_query = request.GET.get('search')
     if search_query:
-        services = services.filter(
-            Q(name__icontains=search_query) | 
-            Q(description__icontains=search_query)
+        services = search_queryset(
+            Service.objects.filter(category=category, is_active=True),
+            'services', search_query, ranked=False
         )
     
     # Pagination
@@ -122,4 +128,4 @@ def category_detail_view(request, category_id):
         'search_query': search_query,
     }
     
-    return render(request, 'services/category_detail.html', context)
\ No newline at end of file
+    return render(request, 'services/category_detail.html', context)